@@ -0,0 +1,31 @@
+import subprocess
+
+from common.logger.logger import setup_logger
+
+LOGGER = setup_logger(__file__)
+
+
+def get_changed_paths(since: str) -> list[str]:
+    """
+    :param since: git revision to diff the working tree against.
+    :return: paths (relative to the current working directory) to all files which were added, modified or removed
+        in the working tree since the given revision, including untracked files. Renamed files are reported under both
+        their old and new paths.
+    """
+
+    changed_paths = _run_git("diff", "--name-only", "--relative", "--no-renames", since, "--")
+    untracked_paths = _run_git("ls-files", "--others", "--exclude-standard")
+    return sorted(set(changed_paths) | set(untracked_paths))
+
+
+def _run_git(*args: str) -> list[str]:
+    cmd = ["git", *args]
+
+    LOGGER.debug(f"Running {' '.join(cmd)}")
+
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        LOGGER.error(f"Got a non-zero return code while trying to run `{' '.join(cmd)}`: {proc.stderr.decode()}")
+        raise RuntimeError(proc.stderr.decode())
+
+    return [line for line in proc.stdout.decode().splitlines() if line != ""]
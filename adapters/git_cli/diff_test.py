@@ -0,0 +1,26 @@
+from unittest import TestCase, mock
+
+from adapters.git_cli.diff import get_changed_paths
+
+
+class TestGetChangedPaths(TestCase):
+    @mock.patch("adapters.git_cli.diff.subprocess.run")
+    def test_includes_untracked_paths(self, mock_subprocess_run):
+        mock_subprocess_run.side_effect = [
+            mock.Mock(returncode=0, stdout=b"pkg/b.py\npkg/BUILD\n"),
+            mock.Mock(returncode=0, stdout=b"pkg/a.py\npkg/b.py\n"),
+        ]
+
+        self.assertEqual(["pkg/BUILD", "pkg/a.py", "pkg/b.py"], get_changed_paths("main"))
+        self.assertEqual(
+            ["git", "diff", "--name-only", "--relative", "--no-renames", "main", "--"],
+            mock_subprocess_run.call_args_list[0].args[0],
+        )
+        return
+
+    @mock.patch("adapters.git_cli.diff.subprocess.run")
+    def test_raises_on_unknown_revision(self, mock_subprocess_run):
+        mock_subprocess_run.return_value = mock.Mock(returncode=128, stderr=b"fatal: bad revision 'nope'")
+
+        self.assertRaises(RuntimeError, get_changed_paths, "nope")
+        return
@@ -0,0 +1,122 @@
+import os
+import time
+from typing import Callable, Collection
+
+from common.logger.logger import setup_logger
+
+
+class PollingFileWatcher:
+    """
+    Watches the files within some BUILD package directories (including their subdirectories, but not their
+    subpackages, hidden directories or plz-out), and some individual files (which need not exist yet), for changes by
+    comparing their modification times between polls.
+
+    Polling is used rather than filesystem events (e.g. inotify) so that no native or third-party dependencies are
+    needed, and so that it behaves the same on every platform. Polling a handful of BUILD package directories is cheap.
+    """
+
+    def __init__(
+        self,
+        dir_paths: Collection[str],
+        file_paths: Collection[str],
+        is_watched_file_name: Callable[[str], bool],
+        build_file_names: Collection[str],
+    ):
+        """
+        :param build_file_names: subdirectories with any of these files are subpackages, and are not watched unless
+            they are in `dir_paths` themselves.
+        """
+
+        self._logger = setup_logger(__file__)
+        self._dir_paths = dir_paths
+        self._build_file_names = build_file_names
+        self._file_paths = file_paths
+        self._is_watched_file_name = is_watched_file_name
+        self._mtimes_by_path: dict[str, int] = self._get_mtimes()
+        return
+
+    def poll(self) -> set[str]:
+        """
+        :return: paths to files which were added, modified or removed since the last poll, normalised.
+        """
+
+        mtimes_by_path = self._get_mtimes()
+        changed_paths = {
+            path
+            for path in mtimes_by_path.keys() | self._mtimes_by_path.keys()
+            if mtimes_by_path.get(path) != self._mtimes_by_path.get(path)
+        }
+        self._mtimes_by_path = mtimes_by_path
+        return changed_paths
+
+    def ignore_changes(self, paths: Collection[str]) -> None:
+        """
+        Ignores any changes to the given files up to now, e.g. because they were made by the caller.
+        """
+
+        for path in map(os.path.normpath, paths):
+            try:
+                self._mtimes_by_path[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                self._mtimes_by_path.pop(path, None)
+        return
+
+    def watch(
+        self,
+        on_changes: Callable[[set[str]], Collection[str]],
+        interval_secs: float = 0.5,
+        debounce_secs: float = 1.0,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """
+        Calls `on_changes` with the paths to all changed files once no further changes have been seen for
+        `debounce_secs`, so that a burst of changes (e.g. a branch checkout, or an editor saving many files) is
+        handled at once.
+
+        :param on_changes: returns paths to files it has modified itself, which are not reported as changes.
+        """
+
+        pending_changed_paths: set[str] = set()
+        last_change_time = time.monotonic()
+        while not should_stop():
+            if changed_paths := self.poll():
+                self._logger.debug(f"Changed: {', '.join(sorted(changed_paths))}")
+                pending_changed_paths |= changed_paths
+                last_change_time = time.monotonic()
+
+            elif pending_changed_paths and time.monotonic() - last_change_time >= debounce_secs:
+                self.ignore_changes(on_changes(pending_changed_paths))
+                pending_changed_paths = set()
+
+            time.sleep(interval_secs)
+        return
+
+    def _get_mtimes(self) -> dict[str, int]:
+        mtimes_by_path: dict[str, int] = {}
+        to_visit: list[str] = list(self._dir_paths)
+        while to_visit:
+            dir_path = to_visit.pop()
+            try:
+                with os.scandir(dir_path or os.curdir) as entries:
+                    for entry in entries:
+                        path = os.path.normpath(os.path.join(dir_path, entry.name))
+                        if entry.is_dir():
+                            if not entry.name.startswith(".") and entry.name != "plz-out" and not self._is_subpkg(path):
+                                to_visit.append(path)
+                        elif self._is_watched_file_name(entry.name) and entry.is_file():
+                            mtimes_by_path[path] = entry.stat().st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+        for file_path in map(os.path.normpath, self._file_paths):
+            try:
+                mtimes_by_path[file_path] = os.stat(file_path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+        return mtimes_by_path
+
+    def _is_subpkg(self, dir_path: str) -> bool:
+        # Subpackages are BUILD packages of their own, so are only watched if they are in `dir_paths`.
+        return any(
+            os.path.isfile(os.path.join(dir_path, build_file_name)) for build_file_name in self._build_file_names
+        )
@@ -0,0 +1,96 @@
+import os
+import shutil
+import uuid
+from unittest import TestCase
+
+from adapters.os.file_watcher import PollingFileWatcher
+
+
+class TestPollingFileWatcher(TestCase):
+    def setUp(self) -> None:
+        self.test_dir = f"test_file_watcher_{uuid.uuid4()}"
+        if os.path.exists(self.test_dir):
+            raise FileExistsError(f"cannot create {self.test_dir} for test setup: path already exists")
+        os.makedirs(self.test_dir)
+        self.module_path = os.path.join(self.test_dir, "module.py")
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        self.write(self.module_path)
+        return
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        return
+
+    @staticmethod
+    def write(path: str, contents: str = "") -> None:
+        with open(path, "w") as f:
+            f.write(contents)
+        # Ensure the modification is visible regardless of the filesystem's mtime granularity.
+        mtime_ns = (os.stat(path).st_mtime_ns // 1_000_000_000 + 1) * 1_000_000_000 + hash(contents) % 1000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return
+
+    def new_watcher(self) -> PollingFileWatcher:
+        return PollingFileWatcher(
+            [self.test_dir],
+            [self.config_path],
+            lambda file_name: file_name.endswith(".py"),
+            {"BUILD"},
+        )
+
+    def test_poll(self):
+        watcher = self.new_watcher()
+        self.assertEqual(set(), watcher.poll())
+
+        self.write(self.module_path, "import os")
+        self.write(added_module_path := os.path.join(self.test_dir, "added.py"))
+        self.write(os.path.join(self.test_dir, "not_watched.txt"))
+        self.write(self.config_path)
+        self.assertEqual({self.module_path, added_module_path, self.config_path}, watcher.poll())
+        self.assertEqual(set(), watcher.poll())
+
+        os.unlink(self.module_path)
+        self.assertEqual({self.module_path}, watcher.poll())
+        return
+
+    def test_poll_watches_subdirs_but_not_subpkgs(self):
+        os.makedirs(sub_dir := os.path.join(self.test_dir, "sub", "nested"))
+        os.makedirs(subpkg_dir := os.path.join(self.test_dir, "subpkg"))
+        self.write(os.path.join(subpkg_dir, "BUILD"))
+        watcher = self.new_watcher()
+
+        self.write(nested_module_path := os.path.join(sub_dir, "module.py"))
+        self.write(os.path.join(subpkg_dir, "module.py"))
+        self.assertEqual({nested_module_path}, watcher.poll())
+        return
+
+    def test_ignore_changes(self):
+        watcher = self.new_watcher()
+        self.write(self.module_path, "import os")
+        watcher.ignore_changes([self.module_path])
+        self.assertEqual(set(), watcher.poll())
+        return
+
+    def test_watch_debounces_changes(self):
+        watcher = self.new_watcher()
+        changes: list[set[str]] = []
+        num_polls = 0
+
+        def should_stop() -> bool:
+            nonlocal num_polls
+            num_polls += 1
+            if num_polls == 2:
+                self.write(self.module_path, "import os")
+            elif num_polls == 3:
+                self.write(self.config_path)
+            return num_polls > 5
+
+        def on_changes(changed_paths: set[str]) -> list[str]:
+            changes.append(changed_paths)
+            # Pretend to have modified a file in response, which should not be reported as a change.
+            self.write(self.module_path, "import sys")
+            return [self.module_path]
+
+        watcher.watch(on_changes, interval_secs=0, debounce_secs=0, should_stop=should_stop)
+        self.assertEqual([{self.module_path, self.config_path}], changes)
+        return
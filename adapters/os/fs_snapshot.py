@@ -0,0 +1,91 @@
+import os
+from typing import Collection, Optional
+
+from common.logger.logger import setup_logger
+
+LOGGER = setup_logger(__file__)
+
+DEFAULT_IGNORED_DIR_NAMES = frozenset({"plz-out"})
+
+
+class FileSystemSnapshot:
+    """
+    Snapshot of the directories and files within a directory tree, taken with a single walk of the tree.
+
+    Lookups are set membership checks, rather than a stat call per lookup. Paths are relative to the root of the
+    snapshot. Hidden directories and files (which cannot be imported in Python) are not included.
+    """
+
+    def __init__(self, entries_by_dir_path: dict[str, tuple[list[str], list[str]]]):
+        """
+        :param entries_by_dir_path: names of the subdirectories and files in each directory.
+        """
+
+        self._entries_by_dir_path = entries_by_dir_path
+        self._file_paths: set[str] = {
+            os.path.normpath(os.path.join(dir_path, file_name))
+            for dir_path, (_, file_names) in entries_by_dir_path.items()
+            for file_name in file_names
+        }
+        return
+
+    @classmethod
+    def build(
+        cls,
+        root: str = os.curdir,
+        ignored_dir_names: Collection[str] = DEFAULT_IGNORED_DIR_NAMES,
+    ) -> "FileSystemSnapshot":
+        entries_by_dir_path: dict[str, tuple[list[str], list[str]]] = {}
+
+        # Keep track of visited directories, since symlinks can introduce cycles.
+        visited: set[tuple[int, int]] = set()
+        to_visit: list[tuple[str, str]] = [(root, os.curdir)]
+        while to_visit:
+            abs_dir_path, rel_dir_path = to_visit.pop()
+            dir_names: list[str] = []
+            file_names: list[str] = []
+            entries_by_dir_path[rel_dir_path] = (dir_names, file_names)
+            try:
+                dir_stat = os.stat(abs_dir_path)
+                if (dir_stat.st_dev, dir_stat.st_ino) in visited:
+                    continue
+                visited.add((dir_stat.st_dev, dir_stat.st_ino))
+
+                with os.scandir(abs_dir_path) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+
+                        if entry.is_dir():
+                            if entry.name in ignored_dir_names:
+                                continue
+                            dir_names.append(entry.name)
+                            to_visit.append((entry.path, os.path.normpath(os.path.join(rel_dir_path, entry.name))))
+                        elif entry.is_file():
+                            file_names.append(entry.name)
+            except OSError as e:
+                LOGGER.warning(f"Could not read {abs_dir_path} while taking a snapshot of the filesystem: {e}")
+
+        snapshot = cls(entries_by_dir_path)
+        LOGGER.debug(f"Took a snapshot of {len(entries_by_dir_path)} dirs and {len(snapshot._file_paths)} files")
+        return snapshot
+
+    def isdir(self, path: str) -> bool:
+        return os.path.normpath(path) in self._entries_by_dir_path
+
+    def isfile(self, path: str) -> bool:
+        return os.path.normpath(path) in self._file_paths
+
+    def dir_paths(self) -> list[str]:
+        """
+        :return: paths to all directories in the snapshot, sorted; the root is `os.curdir`.
+        """
+
+        return sorted(self._entries_by_dir_path)
+
+    def listdir(self, path: str) -> Optional[tuple[list[str], list[str]]]:
+        """
+        :return: names of the subdirectories and files in the given directory, or None if it is not a directory.
+        """
+
+        return self._entries_by_dir_path.get(os.path.normpath(path))
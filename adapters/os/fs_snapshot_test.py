@@ -0,0 +1,42 @@
+import os
+
+from adapters.os.fs_snapshot import FileSystemSnapshot
+from utils.mock_python_library_test_case import MockPythonLibraryTestCase
+
+
+class TestFileSystemSnapshot(MockPythonLibraryTestCase):
+    def test_snapshot(self):
+        snapshot = FileSystemSnapshot.build(self.test_dir)
+
+        self.assertTrue(snapshot.isdir("test_subpackage"))
+        self.assertTrue(snapshot.isdir(os.path.join("test_subpackage", "")))
+        self.assertTrue(snapshot.isdir(os.curdir))
+        self.assertFalse(snapshot.isdir("test_module_0.py"))
+
+        self.assertTrue(snapshot.isfile("test_module_0.py"))
+        self.assertTrue(snapshot.isfile(os.path.join("test_subpackage", "test_module_1.py")))
+        self.assertTrue(snapshot.isfile(os.path.join("test_subpackage", "BUILD")))
+        self.assertFalse(snapshot.isfile("test_subpackage"))
+        self.assertFalse(snapshot.isfile("does_not_exist.py"))
+        return
+
+    def test_dir_paths(self):
+        self.assertEqual([os.curdir, "test_subpackage"], FileSystemSnapshot.build(self.test_dir).dir_paths())
+        return
+
+    def test_excludes_hidden_and_ignored_paths(self):
+        snapshot = FileSystemSnapshot.build(self.test_dir, ignored_dir_names={"test_subpackage"})
+
+        self.assertFalse(snapshot.isfile(".plzconfig"))
+        self.assertFalse(snapshot.isdir("test_subpackage"))
+        self.assertFalse(snapshot.isfile(os.path.join("test_subpackage", "test_module_1.py")))
+        return
+
+    def test_does_not_follow_symlink_cycles(self):
+        os.symlink(os.path.abspath(self.test_dir), cycle := os.path.join(self.subpackage_dir, "cycle"))
+        self.files_to_delete.append(cycle)
+
+        snapshot = FileSystemSnapshot.build(self.test_dir)
+        self.assertTrue(snapshot.isdir(os.path.join("test_subpackage", "cycle")))
+        self.assertFalse(snapshot.isfile(os.path.join("test_subpackage", "cycle", "test_module_0.py")))
+        return
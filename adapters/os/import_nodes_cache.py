@@ -0,0 +1,114 @@
+import ast
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+from common.logger.logger import setup_logger
+from common.version import PYLLEMI_VERSION
+from domain.python_import.common import AST_IMPORT_NODE_TYPE
+
+DEFAULT_CACHE_DIR = os.path.join("plz-out", "pyllemi", "imports")
+DEFAULT_MAX_ENTRIES = 50_000
+
+_CACHE_ENTRY_EXT = ".json"
+
+
+class ImportNodesCache:
+    """
+    Content-addressed, on-disk cache of the import nodes found in a Python src.
+
+    Each entry is keyed by the hash of the src's contents, how its imports were found, and the Pyllemi version, and is
+    stored as a separate file so that the cache can be shared by concurrent processes. An entry's mtime is bumped every
+    time it is read, and `prune` evicts the least recently used entries once there are more than `max_entries`.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._logger = setup_logger(__file__)
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        return
+
+    @staticmethod
+    def key(code: str, *, scan_imports: bool = False) -> str:
+        """
+        :param scan_imports: whether the imports are found with a scan rather than by parsing the code. A scan does not
+            report syntax errors outside of import statements, so its results must not be reused when parsing.
+        """
+
+        if scan_imports:
+            return hashlib.sha256(f"{PYLLEMI_VERSION}\0scan\0{code}".encode()).hexdigest()
+        return hashlib.sha256(f"{PYLLEMI_VERSION}\0{code}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[list[AST_IMPORT_NODE_TYPE]]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r") as entry_file:
+                raw_nodes = json.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            self._logger.warning(f"Ignoring unreadable import cache entry {path}: {e}")
+            return None
+
+        try:
+            # Mark as recently used.
+            os.utime(path)
+        except OSError:
+            pass
+        return list(map(_from_raw_node, raw_nodes))
+
+    def put(self, key: str, nodes: list[AST_IMPORT_NODE_TYPE]) -> None:
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # Write to a temporary file first so that concurrent readers never see a partially written entry.
+            with tempfile.NamedTemporaryFile("w", dir=self._cache_dir, suffix=".tmp", delete=False) as tmp_file:
+                json.dump(list(map(_to_raw_node, nodes)), tmp_file)
+            os.replace(tmp_file.name, self._entry_path(key))
+        except OSError as e:
+            self._logger.warning(f"Could not write to import cache at {self._cache_dir}: {e}")
+        return
+
+    def prune(self) -> int:
+        """
+        Evicts the least recently used entries until at most `max_entries` remain.
+
+        :return: number of evicted entries
+        """
+
+        try:
+            entries = [entry for entry in os.scandir(self._cache_dir) if entry.name.endswith(_CACHE_ENTRY_EXT)]
+        except FileNotFoundError:
+            return 0
+
+        if (num_to_evict := len(entries) - self._max_entries) <= 0:
+            return 0
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:num_to_evict]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+        self._logger.debug(f"Evicted {num_to_evict} entries from the import cache at {self._cache_dir}")
+        return num_to_evict
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}{_CACHE_ENTRY_EXT}")
+
+
+def _to_raw_node(node: AST_IMPORT_NODE_TYPE) -> dict[str, Any]:
+    raw_node: dict[str, Any] = {"names": [[alias.name, alias.asname] for alias in node.names]}
+    if isinstance(node, ast.ImportFrom):
+        raw_node["module"] = node.module
+        raw_node["level"] = node.level
+    return raw_node
+
+
+def _from_raw_node(raw_node: dict[str, Any]) -> AST_IMPORT_NODE_TYPE:
+    names = [ast.alias(name=name, asname=asname) for name, asname in raw_node["names"]]
+    if "level" in raw_node:
+        return ast.ImportFrom(module=raw_node["module"], names=names, level=raw_node["level"])
+    return ast.Import(names=names)
@@ -0,0 +1,70 @@
+import ast
+import os
+import shutil
+import uuid
+from unittest import TestCase
+
+from adapters.os.import_nodes_cache import ImportNodesCache
+
+
+class TestImportNodesCache(TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = f"test_import_nodes_cache_{uuid.uuid4()}"
+        if os.path.exists(self.cache_dir):
+            raise FileExistsError(f"cannot create {self.cache_dir} for test setup: path already exists")
+        return
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        return
+
+    def test_key_depends_on_contents(self):
+        self.assertEqual(ImportNodesCache.key("import os"), ImportNodesCache.key("import os"))
+        self.assertNotEqual(ImportNodesCache.key("import os"), ImportNodesCache.key("import sys"))
+        self.assertNotEqual(ImportNodesCache.key("import os"), ImportNodesCache.key("import os", scan_imports=True))
+        return
+
+    def test_miss(self):
+        cache = ImportNodesCache(self.cache_dir)
+        self.assertIsNone(cache.get(cache.key("import os")))
+        return
+
+    def test_round_trip(self):
+        cache = ImportNodesCache(self.cache_dir)
+        nodes = ast.parse("import numpy as np, os.path\nfrom ..pkg import a, b as c\nfrom . import d").body
+
+        cache.put(key := cache.key("does not matter"), nodes)
+        cached_nodes = cache.get(key)
+
+        self.assertEqual(list(map(ast.dump, nodes)), list(map(ast.dump, cached_nodes)))
+        return
+
+    def test_ignores_corrupt_entries(self):
+        cache = ImportNodesCache(self.cache_dir)
+        cache.put(key := cache.key("import os"), [])
+        with open(os.path.join(self.cache_dir, f"{key}.json"), "w") as entry_file:
+            entry_file.write("{not json")
+
+        self.assertIsNone(cache.get(key))
+        return
+
+    def test_prune_evicts_least_recently_used(self):
+        cache = ImportNodesCache(self.cache_dir, max_entries=2)
+        keys = [cache.key(f"import module_{i}") for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, [])
+            os.utime(os.path.join(self.cache_dir, f"{key}.json"), (i, i))
+
+        # Reading an entry marks it as recently used.
+        cache.get(keys[0])
+
+        self.assertEqual(1, cache.prune())
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertEqual(0, cache.prune())
+        return
+
+    def test_prune_without_cache_dir(self):
+        self.assertEqual(0, ImportNodesCache(self.cache_dir).prune())
+        return
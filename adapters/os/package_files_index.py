@@ -0,0 +1,112 @@
+import os
+from typing import Optional
+
+from adapters.os.fs_snapshot import FileSystemSnapshot
+from common.logger.logger import setup_logger
+
+IMPORTABLE_FILE_EXTS = (".py", ".pyi", ".proto")
+
+
+class PackageFilesIndex:
+    """
+    Memoised lookup of all importable files (Python modules, stubs and protos) within a package directory,
+    including those in its subpackages.
+
+    Indexing a package directory walks its tree once, and indexes every subdirectory within it along the way, so a
+    single instance should be shared by all resolutions in a run. Like a recursive `glob`, hidden files and
+    directories are skipped.
+    """
+
+    def __init__(self, fs_snapshot: Optional[FileSystemSnapshot] = None):
+        """
+        :param fs_snapshot: if set, the package directories are walked in the snapshot rather than the filesystem.
+        """
+
+        self._logger = setup_logger(__file__)
+        self._fs_snapshot = fs_snapshot
+        self._importable_files_by_dir_path: dict[str, list[str]] = {}
+        # Of the directories walked in the filesystem, to tell which have had files added or removed since.
+        self._mtimes_by_dir_path: dict[str, Optional[int]] = {}
+        return
+
+    def get(self, pkg_dir_path: str) -> list[str]:
+        """
+        :param pkg_dir_path: relative to reporoot
+        :return: paths (relative to reporoot) to all importable files in the package directory, sorted.
+        """
+
+        normalised_pkg_dir_path = os.path.normpath(pkg_dir_path)
+        if (importable_files := self._importable_files_by_dir_path.get(normalised_pkg_dir_path)) is None:
+            self._logger.debug(f"Indexing importable files in {pkg_dir_path}")
+            importable_files = self._index(pkg_dir_path)
+        return importable_files
+
+    def clear_stale(self) -> None:
+        """
+        For long-lived processes: forgets the importable files of directories in which files or directories have since
+        been added, removed or renamed, and of every directory above them, so that they are walked again when next
+        needed. The contents of files do not matter to the index, so changes to them are ignored.
+        """
+
+        stale_dir_paths = [
+            dir_path for dir_path, mtime in self._mtimes_by_dir_path.items() if _get_mtime(dir_path) != mtime
+        ]
+        if not stale_dir_paths:
+            return
+
+        self._logger.debug(f"Files have been added or removed in {', '.join(sorted(stale_dir_paths))}")
+        for dir_path in list(self._importable_files_by_dir_path):
+            if any(
+                dir_path == os.curdir or stale_dir_path == dir_path or stale_dir_path.startswith(dir_path + os.sep)
+                for stale_dir_path in stale_dir_paths
+            ):
+                del self._importable_files_by_dir_path[dir_path]
+                self._mtimes_by_dir_path.pop(dir_path, None)
+        return
+
+    def _index(self, dir_path: str) -> list[str]:
+        normalised_dir_path = os.path.normpath(dir_path)
+        if (importable_files := self._importable_files_by_dir_path.get(normalised_dir_path)) is not None:
+            return importable_files
+
+        importable_files = []
+        if (entries := self._listdir(dir_path)) is not None:
+            dir_names, file_names = entries
+            for file_name in file_names:
+                if not file_name.startswith(".") and file_name.endswith(IMPORTABLE_FILE_EXTS):
+                    importable_files.append(os.path.join(dir_path, file_name))
+
+            for dir_name in dir_names:
+                if not dir_name.startswith("."):
+                    importable_files.extend(self._index(os.path.join(dir_path, dir_name)))
+
+        importable_files.sort()
+        self._importable_files_by_dir_path[normalised_dir_path] = importable_files
+        return importable_files
+
+    def _listdir(self, dir_path: str) -> Optional[tuple[list[str], list[str]]]:
+        if self._fs_snapshot is not None:
+            return self._fs_snapshot.listdir(dir_path)
+
+        # Before listing, so that changes made while it is being listed are picked up by `clear_stale`.
+        self._mtimes_by_dir_path[os.path.normpath(dir_path)] = _get_mtime(dir_path)
+        dir_names: list[str] = []
+        file_names: list[str] = []
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    # Do not follow symlinked directories, which could introduce cycles.
+                    if entry.is_dir(follow_symlinks=False):
+                        dir_names.append(entry.name)
+                    elif entry.is_file():
+                        file_names.append(entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return dir_names, file_names
+
+
+def _get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
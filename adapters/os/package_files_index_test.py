@@ -0,0 +1,80 @@
+import os
+from unittest import mock
+
+from adapters.os.fs_snapshot import FileSystemSnapshot
+from adapters.os.package_files_index import PackageFilesIndex
+from utils.mock_python_library_test_case import MockPythonLibraryTestCase
+
+
+class TestPackageFilesIndex(MockPythonLibraryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.hidden_dir = os.path.join(self.subpackage_dir, ".hidden")
+        os.makedirs(self.hidden_dir)
+        self.dirs_to_delete.insert(0, self.hidden_dir)
+
+        self.stub = os.path.join(self.subpackage_dir, "test_stub.pyi")
+        self.proto = os.path.join(self.test_dir, "test.proto")
+        self.hidden_module = os.path.join(self.hidden_dir, "hidden.py")
+        for path in (self.stub, self.proto, self.hidden_module):
+            with open(path, "w") as f:
+                f.write(f"# TEST: {self.test_dir}")
+        self.files_to_delete.extend([self.stub, self.proto, self.hidden_module])
+        return
+
+    def test_finds_importable_files(self):
+        index = PackageFilesIndex()
+
+        self.assertEqual(
+            sorted([self.package_module, self.subpackage_module, self.stub, self.proto]),
+            index.get(self.test_dir),
+        )
+        self.assertEqual(sorted([self.subpackage_module, self.stub]), index.get(self.subpackage_dir))
+        self.assertEqual([], index.get(os.path.join(self.test_dir, "does_not_exist")))
+        return
+
+    def test_walks_each_package_once(self):
+        index = PackageFilesIndex()
+
+        with mock.patch("adapters.os.package_files_index.os.scandir", wraps=os.scandir) as mock_scandir:
+            index.get(self.test_dir)
+            num_scandir_calls = mock_scandir.call_count
+            # Subpackages are indexed along with their parent package.
+            index.get(self.subpackage_dir)
+            index.get(self.test_dir)
+            self.assertEqual(num_scandir_calls, mock_scandir.call_count)
+        return
+
+    def test_clear_stale_only_walks_changed_dirs_again(self):
+        index = PackageFilesIndex()
+        index.get(self.test_dir)
+        index.clear_stale()
+
+        with mock.patch("adapters.os.package_files_index.os.scandir", wraps=os.scandir) as mock_scandir:
+            new_module = os.path.join(self.subpackage_dir, "new_module.py")
+            with open(new_module, "w") as f:
+                f.write(f"# TEST: {self.test_dir}")
+            self.files_to_delete.append(new_module)
+            # Don't rely on the mtime resolution of the filesystem.
+            os.utime(self.subpackage_dir, ns=(0, 0))
+            index.clear_stale()
+
+            self.assertEqual(
+                sorted([self.package_module, self.subpackage_module, self.stub, self.proto, new_module]),
+                index.get(self.test_dir),
+            )
+            self.assertEqual(sorted([self.subpackage_module, self.stub, new_module]), index.get(self.subpackage_dir))
+            # Only the changed directory, and the one above it.
+            self.assertEqual(2, mock_scandir.call_count)
+        return
+
+    def test_with_fs_snapshot(self):
+        index = PackageFilesIndex(FileSystemSnapshot.build())
+
+        with mock.patch("adapters.os.package_files_index.os.scandir") as mock_scandir:
+            self.assertEqual(
+                sorted([self.package_module, self.subpackage_module, self.stub, self.proto]),
+                index.get(self.test_dir),
+            )
+            mock_scandir.assert_not_called()
+        return
@@ -0,0 +1,114 @@
+import os
+import re
+from typing import Collection
+
+_DOUBLE_STAR = "**"
+
+
+def glob(
+    pkg_dir_path: str,
+    include: Collection[str],
+    exclude: Collection[str] = (),
+    *,
+    build_file_names: Collection[str],
+    hidden: bool = False,
+) -> list[str]:
+    """
+    Evaluates a `glob` in a BUILD file like plz does, without running plz:
+
+    * `*`, `?` and `[...]` match within a single path component, and a `**` component matches any number of
+      directories (including none);
+    * exclude patterns without a `/` are matched against file names as well as paths, and excluding a directory
+      excludes everything in it;
+    * hidden files and directories are only matched with `hidden=True`;
+    * globs do not descend into subpackages, i.e. directories with a BUILD file, and never match BUILD files.
+
+    :param pkg_dir_path: directory of the BUILD package which the glob is in.
+    :return: paths of the matched files, relative to the BUILD package, sorted.
+    :raises FileNotFoundError: if the BUILD package does not exist.
+    """
+
+    if not os.path.isdir(pkg_dir_path):
+        raise FileNotFoundError(f"BUILD package {pkg_dir_path} does not exist")
+
+    include_patterns = [_compile(pattern) for pattern in include]
+    exclude_patterns = [_compile(pattern) for pattern in exclude]
+    exclude_name_patterns = [_compile(pattern) for pattern in exclude if "/" not in pattern]
+
+    # Globs without a `**` only match to a fixed depth, so there is no need to walk any deeper.
+    max_depth = (
+        None
+        if any(_DOUBLE_STAR in pattern for pattern in include)
+        else max((pattern.count("/") for pattern in include), default=0)
+    )
+
+    matches: list[str] = []
+    to_visit: list[tuple[str, int]] = [("", 0)]
+    while to_visit:
+        rel_dir_path, depth = to_visit.pop()
+        if rel_dir_path != "" and any(
+            excluded_pattern.fullmatch(rel_dir_path) is not None for excluded_pattern in exclude_patterns
+        ):
+            continue
+
+        with os.scandir(os.path.join(pkg_dir_path, rel_dir_path)) as entries:
+            for entry in entries:
+                if not hidden and entry.name.startswith("."):
+                    continue
+
+                rel_path = f"{rel_dir_path}/{entry.name}" if rel_dir_path != "" else entry.name
+                if entry.is_dir():
+                    if (max_depth is None or depth < max_depth) and not _is_subpackage(entry.path, build_file_names):
+                        to_visit.append((rel_path, depth + 1))
+                    continue
+
+                if not entry.is_file() or entry.name in build_file_names:
+                    # E.g. a broken symlink, or the BUILD package's own BUILD file.
+                    continue
+                if not any(include_pattern.fullmatch(rel_path) is not None for include_pattern in include_patterns):
+                    continue
+                if any(exclude_pattern.fullmatch(rel_path) is not None for exclude_pattern in exclude_patterns) or any(
+                    exclude_name_pattern.fullmatch(entry.name) is not None
+                    for exclude_name_pattern in exclude_name_patterns
+                ):
+                    continue
+                matches.append(rel_path)
+
+    return sorted(matches)
+
+
+def _is_subpackage(dir_path: str, build_file_names: Collection[str]) -> bool:
+    return any(os.path.isfile(os.path.join(dir_path, build_file_name)) for build_file_name in build_file_names)
+
+
+def _compile(pattern: str) -> re.Pattern:
+    components = pattern.strip("/").split("/")
+    regex_parts: list[str] = []
+    for i, component in enumerate(components):
+        is_last = i == len(components) - 1
+        if component == _DOUBLE_STAR:
+            regex_parts.append("(?:[^/]+/)*[^/]+" if is_last else "(?:[^/]+/)*")
+            continue
+        regex_parts.append(_translate_component(component) + ("" if is_last else "/"))
+    return re.compile("".join(regex_parts))
+
+
+def _translate_component(component: str) -> str:
+    regex_parts: list[str] = []
+    i = 0
+    while i < len(component):
+        char = component[i]
+        i += 1
+        if char == "*":
+            regex_parts.append("[^/]*")
+        elif char == "?":
+            regex_parts.append("[^/]")
+        elif char == "[" and (end := component.find("]", i + 1)) != -1:
+            char_class = component[i:end]
+            if char_class.startswith(("!", "^")):
+                char_class = "^" + char_class[1:]
+            regex_parts.append(f"[{char_class.replace(chr(92), chr(92) * 2)}]")
+            i = end + 1
+        else:
+            regex_parts.append(re.escape(char))
+    return "".join(regex_parts)
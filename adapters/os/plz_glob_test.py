@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+from typing import Collection
+from unittest import TestCase
+
+from adapters.os.plz_glob import glob
+
+
+class TestGlob(TestCase):
+    def setUp(self) -> None:
+        self.pkg_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.pkg_dir, ignore_errors=True)
+        for path in [
+            "BUILD",
+            "module.py",
+            "module_test.py",
+            ".hidden.py",
+            os.path.join("sub", "sub_module.py"),
+            os.path.join("sub", "sub_module_test.py"),
+            os.path.join("sub", "deeper", "deeper_module.py"),
+            os.path.join("subpkg", "BUILD.plz"),
+            os.path.join("subpkg", "subpkg_module.py"),
+            os.path.join(".hidden_dir", "hidden_dir_module.py"),
+        ]:
+            os.makedirs(os.path.join(self.pkg_dir, os.path.dirname(path)), exist_ok=True)
+            with open(os.path.join(self.pkg_dir, path), "w"):
+                pass
+        return
+
+    def glob(self, include: list[str], exclude: Collection[str] = (), hidden: bool = False) -> list[str]:
+        return glob(self.pkg_dir, include, exclude, build_file_names=["BUILD", "BUILD.plz"], hidden=hidden)
+
+    def test_star_matches_within_a_dir(self):
+        self.assertEqual(["module.py", "module_test.py"], self.glob(["*.py"]))
+        self.assertEqual(["sub/sub_module.py"], self.glob(["sub/*_module.py"]))
+        self.assertEqual(["module_test.py"], self.glob(["module_tes?.py"]))
+        self.assertEqual(["module.py"], self.glob(["[a-m]odule.py"]))
+        return
+
+    def test_double_star_matches_any_number_of_dirs(self):
+        self.assertEqual(
+            [
+                "module.py",
+                "module_test.py",
+                "sub/deeper/deeper_module.py",
+                "sub/sub_module.py",
+                "sub/sub_module_test.py",
+            ],
+            self.glob(["**/*.py"]),
+        )
+        self.assertEqual(["sub/deeper/deeper_module.py"], self.glob(["sub/**/deeper_*.py"]))
+        return
+
+    def test_excludes(self):
+        with self.subTest("file names"):
+            self.assertEqual(
+                ["module.py", "sub/deeper/deeper_module.py", "sub/sub_module.py"],
+                self.glob(["**/*.py"], exclude=["*_test.py"]),
+            )
+
+        with self.subTest("paths"):
+            self.assertEqual(
+                ["module.py", "module_test.py", "sub/sub_module.py", "sub/sub_module_test.py"],
+                self.glob(["**/*.py"], exclude=["sub/deeper/*.py"]),
+            )
+
+        with self.subTest("dirs"):
+            self.assertEqual(["module.py", "module_test.py"], self.glob(["**/*.py"], exclude=["sub"]))
+        return
+
+    def test_hidden(self):
+        self.assertEqual(
+            [".hidden.py", ".hidden_dir/hidden_dir_module.py", "module.py", "module_test.py"],
+            self.glob(["*.py", ".hidden_dir/*.py"], hidden=True),
+        )
+        self.assertEqual(["module.py", "module_test.py"], self.glob(["*.py", ".hidden_dir/*.py"]))
+        return
+
+    def test_does_not_match_build_files(self):
+        self.assertEqual(["module.py", "module_test.py"], self.glob(["*"]))
+        self.assertNotIn("BUILD", self.glob(["**"]))
+        return
+
+    def test_does_not_descend_into_subpkgs(self):
+        self.assertEqual([], self.glob(["subpkg/*.py"]))
+        return
+
+    def test_raises_if_pkg_does_not_exist(self):
+        self.assertRaises(FileNotFoundError, glob, os.path.join(self.pkg_dir, "missing"), ["*.py"], build_file_names=[])
+        return
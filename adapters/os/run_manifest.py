@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+from collections import namedtuple
+from typing import Optional
+
+from common.logger.logger import setup_logger
+
+DEFAULT_MANIFEST_PATH = os.path.join("plz-out", "pyllemi", "manifest.json")
+
+# Bump whenever the layout of the manifest changes, so that manifests written by other versions are discarded.
+MANIFEST_FORMAT_VERSION = 1
+
+# The inputs of a target's dependency resolution, and the dependencies they resolved to.
+ManifestEntry = namedtuple("ManifestEntry", ["run_fingerprint", "config_fingerprint", "src_hashes", "deps"])
+
+
+class RunManifest:
+    """
+    Record of the dependencies resolved for each target in previous runs, along with the inputs they were resolved
+    from. Entries for targets which were not resolved in a run are kept, so that runs on different sets of
+    BUILD packages build up a single manifest.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        self._logger = setup_logger(__file__)
+        self._path = path
+        self._entries: dict[str, ManifestEntry] = {}
+        self._modified = False
+        return
+
+    def load(self) -> "RunManifest":
+        try:
+            with open(self._path, "r") as manifest_file:
+                raw_manifest = json.load(manifest_file)
+        except FileNotFoundError:
+            return self
+        except (OSError, json.JSONDecodeError) as e:
+            self._logger.warning(f"Ignoring unreadable run manifest {self._path}: {e}")
+            return self
+
+        if not isinstance(raw_manifest, dict) or raw_manifest.get("version") != MANIFEST_FORMAT_VERSION:
+            self._logger.debug(f"Ignoring run manifest {self._path} written in a different format")
+            return self
+
+        for plz_target, raw_entry in raw_manifest.get("targets", {}).items():
+            try:
+                self._entries[plz_target] = ManifestEntry(
+                    run_fingerprint=raw_entry["run"],
+                    config_fingerprint=raw_entry["config"],
+                    src_hashes=raw_entry["srcs"],
+                    deps=raw_entry["deps"],
+                )
+            except (KeyError, TypeError):
+                self._logger.debug(f"Ignoring malformed run manifest entry for {plz_target}")
+        self._logger.debug(f"Loaded {len(self._entries)} entries from run manifest {self._path}")
+        return self
+
+    def get(self, plz_target: str) -> Optional[ManifestEntry]:
+        return self._entries.get(plz_target)
+
+    def put(self, plz_target: str, entry: ManifestEntry) -> None:
+        if self._entries.get(plz_target) == entry:
+            return
+        self._entries[plz_target] = entry
+        self._modified = True
+        return
+
+    def save(self) -> None:
+        if not self._modified:
+            return
+
+        raw_manifest = {
+            "version": MANIFEST_FORMAT_VERSION,
+            "targets": {
+                plz_target: {
+                    "run": entry.run_fingerprint,
+                    "config": entry.config_fingerprint,
+                    "srcs": entry.src_hashes,
+                    "deps": entry.deps,
+                }
+                for plz_target, entry in sorted(self._entries.items())
+            },
+        }
+        manifest_dir = os.path.dirname(self._path) or os.curdir
+        try:
+            os.makedirs(manifest_dir, exist_ok=True)
+            # Write to a temporary file first so that a concurrent run never reads a partially written manifest.
+            with tempfile.NamedTemporaryFile("w", dir=manifest_dir, suffix=".tmp", delete=False) as tmp_file:
+                json.dump(raw_manifest, tmp_file)
+            os.replace(tmp_file.name, self._path)
+        except OSError as e:
+            self._logger.warning(f"Could not write run manifest to {self._path}: {e}")
+            return
+
+        self._modified = False
+        return
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,69 @@
+import os
+import shutil
+import uuid
+from unittest import TestCase
+
+from adapters.os.run_manifest import ManifestEntry, RunManifest
+
+
+class TestRunManifest(TestCase):
+    def setUp(self) -> None:
+        self.manifest_dir = f"test_run_manifest_{uuid.uuid4()}"
+        if os.path.exists(self.manifest_dir):
+            raise FileExistsError(f"cannot create {self.manifest_dir} for test setup: path already exists")
+        self.manifest_path = os.path.join(self.manifest_dir, "manifest.json")
+        self.entry = ManifestEntry(
+            run_fingerprint="run",
+            config_fingerprint="config",
+            src_hashes={"a.py": "hash"},
+            deps=["//x:x"],
+        )
+        return
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.manifest_dir, ignore_errors=True)
+        return
+
+    def test_load_missing_manifest(self):
+        manifest = RunManifest(self.manifest_path).load()
+        self.assertEqual(0, len(manifest))
+        self.assertIsNone(manifest.get("//pkg:a"))
+        return
+
+    def test_round_trip(self):
+        manifest = RunManifest(self.manifest_path)
+        manifest.put("//pkg:a", self.entry)
+        manifest.save()
+
+        self.assertEqual(self.entry, RunManifest(self.manifest_path).load().get("//pkg:a"))
+        return
+
+    def test_save_keeps_entries_from_previous_runs(self):
+        manifest = RunManifest(self.manifest_path)
+        manifest.put("//pkg:a", self.entry)
+        manifest.save()
+
+        manifest = RunManifest(self.manifest_path).load()
+        manifest.put("//pkg:b", self.entry._replace(deps=[]))
+        manifest.save()
+
+        loaded_manifest = RunManifest(self.manifest_path).load()
+        self.assertEqual(self.entry, loaded_manifest.get("//pkg:a"))
+        self.assertEqual(self.entry._replace(deps=[]), loaded_manifest.get("//pkg:b"))
+        return
+
+    def test_ignores_unreadable_manifest(self):
+        os.makedirs(self.manifest_dir)
+        with open(self.manifest_path, "w") as manifest_file:
+            manifest_file.write("{not json")
+
+        self.assertEqual(0, len(RunManifest(self.manifest_path).load()))
+        return
+
+    def test_ignores_manifest_in_different_format(self):
+        os.makedirs(self.manifest_dir)
+        with open(self.manifest_path, "w") as manifest_file:
+            manifest_file.write('{"version": 0, "targets": {"//pkg:a": {}}}')
+
+        self.assertEqual(0, len(RunManifest(self.manifest_path).load()))
+        return
@@ -0,0 +1,94 @@
+"""
+Awaitable versions of the plz queries in `query`, so that independent queries can run concurrently.
+
+Each query runs the corresponding function from `query` in a worker thread, so results are shared with (and cached
+by) the synchronous functions, and `clear_stale_caches` applies to both.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional, TypeVar
+
+from adapters.plz_cli import query
+from adapters.plz_cli.third_party_targets_cache import ThirdPartyTargetsCache
+from common.logger.logger import setup_logger
+
+LOGGER = setup_logger(__file__)
+
+_T = TypeVar("_T")
+
+
+async def get_config(specifier: str) -> list[str]:
+    return await asyncio.to_thread(query.get_config, specifier)
+
+
+async def get_reporoot() -> str:
+    return await asyncio.to_thread(query.get_reporoot)
+
+
+async def get_python_moduledir() -> str:
+    return await asyncio.to_thread(query.get_python_moduledir)
+
+
+async def get_build_file_names() -> list[str]:
+    return await asyncio.to_thread(query.get_build_file_names)
+
+
+async def get_blacklist_dirs() -> list[str]:
+    return await asyncio.to_thread(query.get_blacklist_dirs)
+
+
+async def get_third_party_module_targets(cache: Optional[ThirdPartyTargetsCache] = None) -> list[str]:
+    """
+    :param cache: if given, plz is only queried if the targets cached on disk are stale.
+    """
+
+    if cache is None:
+        return await asyncio.to_thread(query.get_third_party_module_targets)
+    # When the cached targets are stale, so may be any targets memoised in this process.
+    return await asyncio.to_thread(cache.get_or_query, query.query_third_party_module_targets)
+
+
+async def no_query(result: _T) -> _T:
+    """
+    Stands in for a query which is not needed, e.g. to keep the results of `run_concurrently` in the same places.
+    """
+
+    return result
+
+
+def run_concurrently(*awaitables: Awaitable[Any]) -> list[Any]:
+    """
+    Blocks until all of the queries have completed.
+
+    :return: the results of the queries, in the order they were given.
+    :raises: the first exception raised by any of the queries.
+    """
+
+    async def gather() -> list[Any]:
+        return list(await asyncio.gather(*awaitables))
+
+    return asyncio.run(gather())
+
+
+def run_in_background(awaitable: Awaitable[_T]) -> "Future[_T]":
+    """
+    Starts the query in a background thread, so that the caller can carry on with other work until it needs the result.
+    """
+
+    future: "Future[_T]" = Future()
+
+    async def run() -> _T:
+        return await awaitable
+
+    def target() -> None:
+        try:
+            future.set_result(asyncio.run(run()))
+        except BaseException as e:
+            future.set_exception(e)
+        return
+
+    # A daemon thread, so that an unneeded query does not keep the process alive.
+    threading.Thread(target=target, name="plz-query", daemon=True).start()
+    return future
@@ -0,0 +1,81 @@
+import threading
+from unittest import mock, TestCase
+
+from adapters.plz_cli import async_query
+
+
+class TestAsyncQuery(TestCase):
+    @mock.patch("adapters.plz_cli.query.get_config")
+    def test_runs_queries_concurrently(self, mock_get_config: mock.MagicMock):
+        # Every query waits for the others to start, so this only completes if they run concurrently.
+        barrier = threading.Barrier(3, timeout=5)
+
+        def get_config(specifier: str) -> list[str]:
+            barrier.wait()
+            return [specifier]
+
+        mock_get_config.side_effect = get_config
+
+        self.assertEqual(
+            [["a"], ["b"], ["c"]],
+            async_query.run_concurrently(
+                async_query.get_config("a"),
+                async_query.get_config("b"),
+                async_query.get_config("c"),
+            ),
+        )
+        return
+
+    @mock.patch("adapters.plz_cli.query.get_config")
+    def test_raises_query_errors(self, mock_get_config: mock.MagicMock):
+        mock_get_config.side_effect = RuntimeError("plz failed")
+
+        with self.assertRaisesRegex(RuntimeError, "plz failed"):
+            async_query.run_concurrently(async_query.get_config("a"), async_query.no_query([]))
+        return
+
+    @mock.patch("adapters.plz_cli.query.get_third_party_module_targets")
+    def test_runs_in_background(self, mock_get_third_party_module_targets: mock.MagicMock):
+        started, finish = threading.Event(), threading.Event()
+
+        def get_third_party_module_targets() -> list[str]:
+            started.set()
+            finish.wait(timeout=5)
+            return ["//third_party/python3:colorama"]
+
+        mock_get_third_party_module_targets.side_effect = get_third_party_module_targets
+
+        future = async_query.run_in_background(async_query.get_third_party_module_targets())
+        self.assertTrue(started.wait(timeout=5))
+        self.assertFalse(future.done())
+
+        finish.set()
+        self.assertEqual(["//third_party/python3:colorama"], future.result(timeout=5))
+        return
+
+    @mock.patch("adapters.plz_cli.query.get_reporoot")
+    def test_background_errors_are_raised_by_result(self, mock_get_reporoot: mock.MagicMock):
+        mock_get_reporoot.side_effect = RuntimeError("plz failed")
+
+        with self.assertRaisesRegex(RuntimeError, "plz failed"):
+            async_query.run_in_background(async_query.get_reporoot()).result(timeout=5)
+        return
+
+    @mock.patch("adapters.plz_cli.query.get_third_party_module_targets")
+    @mock.patch("adapters.plz_cli.query.query_third_party_module_targets")
+    def test_stale_cached_third_party_targets_are_queried_again(
+        self,
+        mock_query_third_party_module_targets: mock.MagicMock,
+        mock_get_third_party_module_targets: mock.MagicMock,
+    ):
+        mock_query_third_party_module_targets.return_value = ["//third_party/python3:colorama"]
+        mock_cache = mock.MagicMock()
+        mock_cache.get_or_query.side_effect = lambda query_fn: query_fn()
+
+        self.assertEqual(
+            [["//third_party/python3:colorama"]],
+            async_query.run_concurrently(async_query.get_third_party_module_targets(mock_cache)),
+        )
+        # Not the memoised query, which may still hold the stale targets.
+        mock_get_third_party_module_targets.assert_not_called()
+        return
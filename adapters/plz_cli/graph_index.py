@@ -0,0 +1,115 @@
+from collections import defaultdict
+from typing import Any, Callable, Collection
+
+from adapters.plz_cli.query import (
+    get_whatinputs,
+    get_whatinputs_by_path,
+    WhatInputsByPathResult,
+    WhatInputsResult,
+)
+from common.logger.logger import setup_logger
+
+LOGGER = setup_logger(__file__)
+
+
+class SrcToTargetIndex:
+    """
+    In-memory lookup of source paths to the plz targets they are inputs to.
+
+    Built by inverting the output of a single `plz query graph` call, so that `plz query whatinputs`
+    lookups can be answered from memory. Paths which cannot be found in the index are passed on to
+    the fallback (which, by default, is the plz CLI).
+    """
+
+    def __init__(
+        self,
+        plz_targets_by_src: dict[str, set[str]],
+        fallback: Callable[[list[str]], WhatInputsResult] = get_whatinputs,
+        fallback_by_path: Callable[[list[str]], WhatInputsByPathResult] = get_whatinputs_by_path,
+    ):
+        self._plz_targets_by_src = plz_targets_by_src
+        self._fallback = fallback
+        self._fallback_by_path = fallback_by_path
+        return
+
+    @classmethod
+    def from_build_graph(
+        cls,
+        build_graph: dict[str, Any],
+        fallback: Callable[[list[str]], WhatInputsResult] = get_whatinputs,
+        fallback_by_path: Callable[[list[str]], WhatInputsByPathResult] = get_whatinputs_by_path,
+    ) -> "SrcToTargetIndex":
+        """
+        :param build_graph: JSON output of `plz query graph`.
+        :param fallback: used to answer queries for paths which are not in the build graph.
+        :param fallback_by_path: as above, for queries which need to keep track of the targets of each path.
+        """
+
+        plz_targets_by_src: defaultdict[str, set[str]] = defaultdict(set)
+        for pkg_dir, pkg in build_graph.get("packages", {}).items():
+            for target_name, target in pkg.get("targets", {}).items():
+                plz_target = _to_whatinputs_label(pkg_dir, target_name)
+                for src in target.get("srcs", []):
+                    plz_targets_by_src[src].add(plz_target)
+
+        LOGGER.debug(f"Indexed {len(plz_targets_by_src)} srcs from the plz build graph")
+        return cls(dict(plz_targets_by_src), fallback, fallback_by_path)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._plz_targets_by_src
+
+    def __len__(self) -> int:
+        return len(self._plz_targets_by_src)
+
+    def get(self, path: str) -> set[str]:
+        return self._plz_targets_by_src.get(path, set())
+
+    def whatinputs(self, paths: Collection[str]) -> WhatInputsResult:
+        """
+        Drop-in replacement for `get_whatinputs`.
+        """
+
+        plz_targets: set[str] = set()
+        unindexed_paths: list[str] = []
+        for path in paths:
+            if (plz_targets_for_path := self._plz_targets_by_src.get(path)) is None:
+                unindexed_paths.append(path)
+                continue
+            plz_targets |= plz_targets_for_path
+
+        if len(unindexed_paths) == 0:
+            return WhatInputsResult(plz_targets, set())
+
+        LOGGER.debug(f"Could not find {unindexed_paths} in the build graph; falling back to plz whatinputs")
+        fallback_result = self._fallback(unindexed_paths)
+        return WhatInputsResult(plz_targets | fallback_result.plz_targets, fallback_result.targetless_paths)
+
+    def whatinputs_by_path(self, paths: Collection[str]) -> WhatInputsByPathResult:
+        """
+        Drop-in replacement for `get_whatinputs_by_path`.
+        """
+
+        plz_targets_by_path: dict[str, set[str]] = {}
+        unindexed_paths: list[str] = []
+        for path in paths:
+            if (plz_targets_for_path := self._plz_targets_by_src.get(path)) is None:
+                unindexed_paths.append(path)
+                continue
+            plz_targets_by_path[path] = set(plz_targets_for_path)
+
+        if len(unindexed_paths) == 0:
+            return WhatInputsByPathResult(plz_targets_by_path, set())
+
+        LOGGER.debug(f"Could not find {unindexed_paths} in the build graph; falling back to plz whatinputs")
+        fallback_result = self._fallback_by_path(unindexed_paths)
+        return WhatInputsByPathResult(
+            plz_targets_by_path | fallback_result.plz_targets_by_path,
+            fallback_result.targetless_paths,
+        )
+
+
+def _to_whatinputs_label(pkg_dir: str, target_name: str) -> str:
+    # Like `plz query whatinputs`, report hidden targets (e.g. `_name#lib`) as their parent target.
+    if target_name.startswith("_") and "#" in target_name:
+        target_name = target_name.removeprefix("_").split("#", maxsplit=1)[0]
+    return f"//{pkg_dir}:{target_name}"
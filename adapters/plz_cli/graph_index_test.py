@@ -0,0 +1,88 @@
+from unittest import TestCase, mock
+
+from adapters.plz_cli.graph_index import SrcToTargetIndex
+from adapters.plz_cli.query import WhatInputsByPathResult, WhatInputsResult
+
+
+class TestSrcToTargetIndex(TestCase):
+    def setUp(self) -> None:
+        self.build_graph = {
+            "packages": {
+                "path/to/pkg": {
+                    "targets": {
+                        "pkg": {"srcs": ["path/to/pkg/module.py", "path/to/pkg/stub.pyi"]},
+                        "_pkg_test#lib": {"srcs": ["path/to/pkg/module_test.py"]},
+                        "pkg_test": {"deps": ["//path/to/pkg:_pkg_test#lib"]},
+                    },
+                },
+                "path/to/other_pkg": {
+                    "targets": {
+                        "other_pkg": {"srcs": ["path/to/other_pkg/module.py"]},
+                        "also_other_pkg": {"srcs": ["path/to/other_pkg/module.py"]},
+                    },
+                },
+            },
+        }
+        return
+
+    def test_inverts_build_graph(self):
+        index = SrcToTargetIndex.from_build_graph(self.build_graph)
+
+        self.assertEqual(4, len(index))
+        self.assertEqual({"//path/to/pkg:pkg"}, index.get("path/to/pkg/module.py"))
+        self.assertEqual({"//path/to/pkg:pkg"}, index.get("path/to/pkg/stub.pyi"))
+        self.assertEqual(
+            {"//path/to/other_pkg:other_pkg", "//path/to/other_pkg:also_other_pkg"},
+            index.get("path/to/other_pkg/module.py"),
+        )
+        self.assertNotIn("path/to/pkg/does_not_exist.py", index)
+        return
+
+    def test_reports_hidden_targets_as_parent(self):
+        index = SrcToTargetIndex.from_build_graph(self.build_graph)
+        self.assertEqual({"//path/to/pkg:pkg_test"}, index.get("path/to/pkg/module_test.py"))
+        return
+
+    def test_whatinputs_from_memory(self):
+        mock_fallback = mock.MagicMock()
+        index = SrcToTargetIndex.from_build_graph(self.build_graph, fallback=mock_fallback)
+
+        self.assertEqual(
+            WhatInputsResult({"//path/to/pkg:pkg", "//path/to/pkg:pkg_test"}, set()),
+            index.whatinputs(["path/to/pkg/module.py", "path/to/pkg/module_test.py"]),
+        )
+        mock_fallback.assert_not_called()
+        return
+
+    def test_whatinputs_falls_back_for_unindexed_paths(self):
+        mock_fallback = mock.MagicMock()
+        mock_fallback.return_value = WhatInputsResult({"//generated:target"}, {"path/to/nowhere.py"})
+        index = SrcToTargetIndex.from_build_graph(self.build_graph, fallback=mock_fallback)
+
+        self.assertEqual(
+            WhatInputsResult({"//path/to/pkg:pkg", "//generated:target"}, {"path/to/nowhere.py"}),
+            index.whatinputs(["path/to/pkg/module.py", "generated/module.py", "path/to/nowhere.py"]),
+        )
+        mock_fallback.assert_called_once_with(["generated/module.py", "path/to/nowhere.py"])
+        return
+
+    def test_whatinputs_by_path(self):
+        mock_fallback_by_path = mock.MagicMock()
+        mock_fallback_by_path.return_value = WhatInputsByPathResult(
+            {"generated/module.py": {"//generated:target"}},
+            {"path/to/nowhere.py"},
+        )
+        index = SrcToTargetIndex.from_build_graph(self.build_graph, fallback_by_path=mock_fallback_by_path)
+
+        self.assertEqual(
+            WhatInputsByPathResult(
+                {
+                    "path/to/pkg/module.py": {"//path/to/pkg:pkg"},
+                    "generated/module.py": {"//generated:target"},
+                },
+                {"path/to/nowhere.py"},
+            ),
+            index.whatinputs_by_path(["path/to/pkg/module.py", "generated/module.py", "path/to/nowhere.py"]),
+        )
+        mock_fallback_by_path.assert_called_once_with(["generated/module.py", "path/to/nowhere.py"])
+        return
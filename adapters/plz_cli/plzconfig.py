@@ -0,0 +1,155 @@
+import os
+import platform
+import sys
+from typing import Optional
+
+PLZCONFIG_FILE_NAME = ".plzconfig"
+
+# Config files which apply to every repo, in ascending order of precedence.
+_MACHINE_PLZCONFIG_PATHS = (
+    os.path.join(os.sep, "etc", "please", "plzconfig"),
+    os.path.join("~", ".config", "please", "plzconfig"),
+)
+
+_ARCHS_BY_MACHINE = {"x86_64": "amd64", "amd64": "amd64", "aarch64": "arm64", "arm64": "arm64"}
+
+
+class AmbiguousPlzConfigError(ValueError):
+    pass
+
+
+def find_reporoot(dir_path: str = os.curdir) -> Optional[str]:
+    """
+    :return: absolute path to the closest directory at or above the given directory with a .plzconfig file, as plz
+        finds the reporoot, or None if there is none.
+    """
+
+    dir_path = os.path.abspath(dir_path)
+    while True:
+        if os.path.isfile(os.path.join(dir_path, PLZCONFIG_FILE_NAME)):
+            return dir_path
+        if (parent_dir_path := os.path.dirname(dir_path)) == dir_path:
+            return None
+        dir_path = parent_dir_path
+
+
+def get_config_file_paths(reporoot: str) -> list[str]:
+    """
+    :return: paths to the config files plz reads for the repo, in ascending order of precedence: machine-wide and
+        user configs, then the repo's .plzconfig, its OS and architecture specific config, and finally
+        .plzconfig.local. As in plz, each of these is immediately followed by its profile configs (e.g.
+        `.plzconfig.<profile>`) for the profiles selected with $PLZ_CONFIG_PROFILE.
+    :raises AmbiguousPlzConfigError: if the configs plz reads cannot be determined without plz.
+    """
+
+    if (arch := _ARCHS_BY_MACHINE.get(platform.machine().lower())) is None:
+        raise AmbiguousPlzConfigError(f"unknown architecture {platform.machine()}")
+
+    profiles = [profile for profile in os.environ.get("PLZ_CONFIG_PROFILE", "").split(",") if profile != ""]
+    repo_config_file_names = [
+        PLZCONFIG_FILE_NAME,
+        f"{PLZCONFIG_FILE_NAME}_{sys.platform.rstrip('0123456789')}_{arch}",
+        f"{PLZCONFIG_FILE_NAME}.local",
+    ]
+    base_config_file_paths = [
+        *map(os.path.expanduser, _MACHINE_PLZCONFIG_PATHS),
+        *(os.path.join(reporoot, file_name) for file_name in repo_config_file_names),
+    ]
+    return [
+        config_file_path
+        for base_config_file_path in base_config_file_paths
+        for config_file_path in [base_config_file_path, *(f"{base_config_file_path}.{profile}" for profile in profiles)]
+    ]
+
+
+def get_config_values(specifier: str, reporoot: str) -> list[str]:
+    """
+    Reads a config value from the repo's config files like plz does, without running plz.
+
+    :param specifier: `section.key`, e.g. `python.moduledir`.
+    :return: all values of the key in the config file with the highest precedence which sets it.
+    :raises AmbiguousPlzConfigError: if the value cannot be determined without plz, e.g. because it is not set in any
+        config file (so would be plz's default), is set in more than 1 config file (plz may combine multi-valued keys),
+        or plz has been told to override config values.
+    """
+
+    if os.environ.get("PLZ_OVERRIDES"):
+        raise AmbiguousPlzConfigError("$PLZ_OVERRIDES is set")
+
+    section, sep, key = specifier.lower().partition(".")
+    if sep == "" or "." in key:
+        raise AmbiguousPlzConfigError(f"unsupported specifier {specifier}")
+
+    values: Optional[list[str]] = None
+    for config_file_path in get_config_file_paths(reporoot):
+        try:
+            with open(config_file_path, "r") as config_file:
+                raw_values_in_file = _parse(config_file.read(), config_file_path).get((section, key))
+        except FileNotFoundError:
+            continue
+        if raw_values_in_file is None:
+            continue
+
+        values_in_file = [_parse_value(raw_value, config_file_path) for raw_value in raw_values_in_file]
+        if len(values_in_file) > 1 and "" in values_in_file:
+            # A blank value resets a multi-valued key.
+            raise AmbiguousPlzConfigError(f"{specifier} is reset in {config_file_path}")
+        if values is not None and (len(values) > 1 or len(values_in_file) > 1):
+            raise AmbiguousPlzConfigError(f"{specifier} is set to multiple values in more than 1 config file")
+        values = values_in_file
+
+    if values is None:
+        raise AmbiguousPlzConfigError(f"{specifier} is not set in any config file")
+    return values
+
+
+def _parse(contents: str, path: str) -> dict[tuple[str, str], list[str]]:
+    """
+    Parses the subset of the git-config-like format of plz config files which is needed for plain values.
+
+    :return: unparsed values keyed by (section, key), lower-cased. Keys in subsections (e.g. `[alias "x"]`) are
+        skipped.
+    """
+
+    values_by_key: dict[tuple[str, str], list[str]] = {}
+    section: Optional[str] = None
+    for line_num, line in enumerate(contents.splitlines(), start=1):
+        line = line.strip()
+        if line == "" or line.startswith((";", "#")):
+            continue
+
+        if line.startswith("["):
+            header, _, rest = line[1:].partition("]")
+            if rest.strip() != "" and not rest.lstrip().startswith((";", "#")):
+                raise AmbiguousPlzConfigError(f"could not parse section header at {path}:{line_num}")
+            # Subsections hold named entries, such as aliases, rather than plain values.
+            section = None if " " in header.strip() else header.strip().lower()
+            continue
+
+        if section is None:
+            continue
+
+        key, sep, value = line.partition("=")
+        if sep == "":
+            # A key on its own is a boolean set to true.
+            value = "true"
+        values_by_key.setdefault((section, key.strip().lower()), []).append(value)
+    return values_by_key
+
+
+def _parse_value(value: str, path: str) -> str:
+    parsed_value: list[str] = []
+    in_quotes = False
+    for char in value.strip():
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == "\\":
+            # Escape sequences and line continuations are rare enough in the values needed to leave to plz.
+            raise AmbiguousPlzConfigError(f"found a backslash in a value in {path}")
+        elif char in ";#" and not in_quotes:
+            break
+        else:
+            parsed_value.append(char)
+    if in_quotes:
+        raise AmbiguousPlzConfigError(f"found an unterminated quote in a value in {path}")
+    return "".join(parsed_value).strip()
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+from unittest import mock, TestCase
+
+from adapters.plz_cli.plzconfig import AmbiguousPlzConfigError, find_reporoot, get_config_values
+
+
+@mock.patch("adapters.plz_cli.plzconfig._MACHINE_PLZCONFIG_PATHS", ())
+@mock.patch("adapters.plz_cli.plzconfig.platform.machine", mock.MagicMock(return_value="x86_64"))
+@mock.patch("adapters.plz_cli.plzconfig.sys.platform", "linux")
+@mock.patch.dict(os.environ, {"PLZ_CONFIG_PROFILE": "", "PLZ_OVERRIDES": ""})
+class TestGetConfigValues(TestCase):
+    def setUp(self) -> None:
+        self.reporoot = tempfile.mkdtemp()
+        self.write(
+            ".plzconfig",
+            """
+; Please config file
+[Parse]
+BuildFileName = BUILD.plz
+BuildFileName = BUILD  ; trailing comment
+
+[python]
+ModuleDir = "third_party.python"
+
+[alias "update"]
+cmd = run //tools:pyllemi -- \\
+""",
+        )
+        return
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.reporoot, ignore_errors=True)
+        return
+
+    def write(self, file_name: str, contents: str) -> None:
+        with open(os.path.join(self.reporoot, file_name), "w") as config_file:
+            config_file.write(contents)
+        return
+
+    def test_reads_values(self):
+        self.assertEqual(["BUILD.plz", "BUILD"], get_config_values("parse.buildfilename", self.reporoot))
+        self.assertEqual(["third_party.python"], get_config_values("Python.ModuleDir", self.reporoot))
+        return
+
+    def test_later_configs_take_precedence(self):
+        self.write(".plzconfig_linux_amd64", "[python]\nmoduledir = third_party.arch\n")
+        self.assertEqual(["third_party.arch"], get_config_values("python.moduledir", self.reporoot))
+
+        self.write(".plzconfig.local", "[python]\nmoduledir = third_party.local\n")
+        self.assertEqual(["third_party.local"], get_config_values("python.moduledir", self.reporoot))
+        return
+
+    @mock.patch.dict(os.environ, {"PLZ_CONFIG_PROFILE": "ci"})
+    def test_profile_configs_follow_each_config(self):
+        self.write(".plzconfig.ci", "[python]\nmoduledir = third_party.ci\n")
+        self.assertEqual(["third_party.ci"], get_config_values("python.moduledir", self.reporoot))
+
+        # Arch configs take precedence over profiles of the repo's .plzconfig.
+        self.write(".plzconfig_linux_amd64", "[python]\nmoduledir = third_party.arch\n")
+        self.assertEqual(["third_party.arch"], get_config_values("python.moduledir", self.reporoot))
+
+        self.write(".plzconfig.local", "[python]\nmoduledir = third_party.local\n")
+        self.write(".plzconfig.local.ci", "[python]\nmoduledir = third_party.local_ci\n")
+        self.assertEqual(["third_party.local_ci"], get_config_values("python.moduledir", self.reporoot))
+        return
+
+    def test_raises_when_ambiguous(self):
+        with self.subTest("not set"):
+            self.assertRaises(AmbiguousPlzConfigError, get_config_values, "python.interpreter", self.reporoot)
+
+        with self.subTest("overridden"), mock.patch.dict(os.environ, {"PLZ_OVERRIDES": "python.moduledir:x"}):
+            self.assertRaises(AmbiguousPlzConfigError, get_config_values, "python.moduledir", self.reporoot)
+
+        with self.subTest("multiple values in multiple configs"):
+            self.write(".plzconfig.local", "[parse]\nbuildfilename = BUILD.local\n")
+            self.assertRaises(AmbiguousPlzConfigError, get_config_values, "parse.buildfilename", self.reporoot)
+        return
+
+
+class TestFindReporoot(TestCase):
+    def test_finds_closest_dir_with_plzconfig(self):
+        reporoot = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, reporoot, ignore_errors=True)
+        os.makedirs(subdir_path := os.path.join(reporoot, "path", "to"))
+        with open(os.path.join(reporoot, ".plzconfig"), "w"):
+            pass
+
+        self.assertEqual(os.path.realpath(reporoot), os.path.realpath(find_reporoot(subdir_path)))
+        self.assertEqual(os.path.realpath(reporoot), os.path.realpath(find_reporoot(reporoot)))
+        return
@@ -1,20 +1,39 @@
+import ast
 import json
 import os
 import re
 import subprocess
 from collections import namedtuple
 from functools import cache, lru_cache
-from typing import Any, AnyStr, IO, Optional
+from typing import Any, AnyStr, IO, Iterable, Optional
 
+from adapters.plz_cli.plzconfig import AmbiguousPlzConfigError, find_reporoot, get_config_values
 from common.logger.logger import setup_logger
 
 LOGGER = setup_logger(__file__)
 
 WhatInputsResult = namedtuple("WhatInputsResult", ["plz_targets", "targetless_paths"])
+WhatInputsByPathResult = namedtuple("WhatInputsByPathResult", ["plz_targets_by_path", "targetless_paths"])
+
+_TARGETLESS_PATH_MSG_PATTERN = re.compile(r"Error: '(.+)' is not a source to any current target")
+
+# `plz query print` precedes each target with this header when printing multiple targets in full.
+_PRINT_HEADER_PATTERN = re.compile(r"# (//\S+):")
+
+# Modification times of the plz config files, and of the BUILD files under the python moduledir, as of the last
+# `clear_stale_caches` call.
+_config_files_stamp: Optional[tuple[tuple[tuple[str, int], ...], tuple[tuple[str, int], ...]]] = None
 
 
 @cache
 def get_config(specifier: str) -> list[str]:
+    # Read the config files directly where possible, rather than starting plz.
+    if (reporoot := find_reporoot()) is not None:
+        try:
+            return get_config_values(specifier, reporoot)
+        except AmbiguousPlzConfigError as e:
+            LOGGER.debug(f"Querying plz for {specifier} as it cannot be read from config files: {e}")
+
     cmd = ["plz", "query", "config", specifier]
 
     LOGGER.debug(f"Getting plz config for {specifier}")
@@ -41,6 +60,52 @@ def get_print(target: str, field) -> list[str]:
     return _convert_list_of_bytes_to_list_of_strs(proc.stdout)
 
 
+def get_print_by_target(targets: list[str], field: str) -> dict[str, list[str]]:
+    """
+    Like `get_print`, but for many targets with a single plz process.
+
+    `plz query print -f` does not say which target each value belongs to, so the targets are printed in full, and the
+    field is read from each printed build rule. Fields which cannot be read this way (i.e. whose values are not a list
+    of literals) are left out, for the caller to fall back to `get_print` for.
+
+    :return: the field's values, keyed by the targets as given.
+    """
+
+    if len(targets) == 0:
+        return {}
+
+    # plz prints targets with their names in full, e.g. //path/to:to for //path/to.
+    targets_by_printed_target = {
+        target if ":" in target else f"{target}:{target.rsplit('/', 1)[-1]}": target for target in targets
+    }
+
+    cmd = ["plz", "query", "print", *targets_by_printed_target]
+
+    LOGGER.debug(f"Getting field '{field}' for {len(targets)} targets")
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    if not _is_success_return_code(proc.returncode):
+        LOGGER.error(f"Got a non-zero return code while trying to print {len(targets)} targets")
+        raise RuntimeError(proc.stderr)
+
+    printed_rules_by_target: dict[str, list[str]] = {}
+    lines: Optional[list[str]] = None
+    for line in _convert_list_of_bytes_to_list_of_strs(proc.stdout):
+        if (header_match := _PRINT_HEADER_PATTERN.fullmatch(line)) is not None:
+            lines = printed_rules_by_target.setdefault(header_match.group(1), [])
+        elif lines is not None:
+            lines.append(line)
+
+    values_by_target: dict[str, list[str]] = {}
+    for printed_target, lines in printed_rules_by_target.items():
+        if (target := targets_by_printed_target.get(printed_target)) is None:
+            LOGGER.warning(f"plz query print got unexpected target in stdout: {printed_target}")
+            continue
+        if (values := _get_printed_rule_field("\n".join(lines), field)) is not None:
+            values_by_target[target] = values
+    return values_by_target
+
+
 @lru_cache(1)
 def get_python_moduledir() -> str:
     get_config_output = get_config("python.moduledir")
@@ -57,6 +122,15 @@ def get_build_file_names() -> list[str]:
     return get_config_output
 
 
+@lru_cache(1)
+def get_blacklist_dirs() -> list[str]:
+    """
+    :return: names of directories which plz ignores, wherever they are in the repo.
+    """
+
+    return get_config("parse.blacklistdirs")
+
+
 @cache
 def get_plz_build_graph(
     pkg_dir: Optional[str] = None,
@@ -105,13 +179,10 @@ def get_whatinputs(paths: list[str]) -> WhatInputsResult:
 
     stdout = _convert_list_of_bytes_to_list_of_strs(proc.stdout)
 
-    targetless_path_msg_pattern = re.compile(
-        r"Error: '(.+)' is not a source to any current target",
-    )
     plz_targets: set[str] = set()
     targetless_paths: set[str] = set()
     for line in stdout:
-        if (targetless_path_match := targetless_path_msg_pattern.match(line)) is not None:
+        if (targetless_path_match := _TARGETLESS_PATH_MSG_PATTERN.match(line)) is not None:
             targetless_paths.add(targetless_path_match.group(1))
 
         elif line.startswith("//"):
@@ -123,8 +194,51 @@ def get_whatinputs(paths: list[str]) -> WhatInputsResult:
     return WhatInputsResult(plz_targets, targetless_paths)
 
 
+def get_whatinputs_by_path(paths: list[str]) -> WhatInputsByPathResult:
+    """
+    Like `get_whatinputs`, but keeps track of which plz targets each of the given paths is an input to.
+
+    :param paths: a Collection of OS paths to python modules.
+    :return: plz targets keyed by the input path
+    """
+
+    if len(paths) == 0:
+        return WhatInputsByPathResult({}, set())
+
+    cmd = ["plz", "query", "whatinputs", "--echo_files", *paths]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    if not _is_success_return_code(proc.returncode):
+        LOGGER.error(
+            "Got a non-zero return code while trying to execute `plz whatinputs`",
+            exc_info=proc.stderr,
+        )
+        raise RuntimeError(proc.stderr)
+
+    stdout = _convert_list_of_bytes_to_list_of_strs(proc.stdout)
+
+    plz_targets_by_path: dict[str, set[str]] = {}
+    targetless_paths: set[str] = set()
+    for line in stdout:
+        if (targetless_path_match := _TARGETLESS_PATH_MSG_PATTERN.match(line)) is not None:
+            targetless_paths.add(targetless_path_match.group(1))
+            continue
+
+        # With --echo_files, each line takes the form `<path> <plz target>`.
+        path, _, plz_target = line.rpartition(" ")
+        if path == "" or not plz_target.startswith("//"):
+            LOGGER.warning(f"plz whatinputs got unexpected output in stdout: {line}")
+            continue
+
+        plz_targets_by_path.setdefault(path, set()).add(plz_target)
+
+    return WhatInputsByPathResult(plz_targets_by_path, targetless_paths)
+
+
 @cache
 def get_reporoot() -> str:
+    if (reporoot := find_reporoot()) is not None:
+        return reporoot
+
     cmd = ["plz", "query", "reporoot"]
     proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
     if not _is_success_return_code(proc.returncode):
@@ -144,6 +258,14 @@ def get_reporoot() -> str:
 
 @lru_cache(1)
 def get_third_party_module_targets() -> list[str]:
+    return query_third_party_module_targets()
+
+
+def query_third_party_module_targets() -> list[str]:
+    """
+    Like `get_third_party_module_targets`, but always queries plz rather than reusing a previous result.
+    """
+
     return get_all_targets(
         [
             os.path.join(
@@ -195,6 +317,80 @@ def run_plz_fmt(*paths: str):
     return
 
 
+def clear_stale_caches() -> None:
+    """
+    For long-lived processes which run many resolutions: clears the cached results of queries which depend on the
+    contents of BUILD packages, and of the queries whose results depend on plz config files or third-party BUILD
+    files if those have changed since the last call.
+
+    Must be called from the reporoot.
+    """
+
+    global _config_files_stamp
+
+    get_print.cache_clear()
+    get_plz_build_graph.cache_clear()
+
+    plzconfig_stamp = _get_mtimes(
+        file_name for file_name in os.listdir(os.curdir) if file_name.startswith(".plzconfig")
+    )
+    if _config_files_stamp is None or plzconfig_stamp != _config_files_stamp[0]:
+        get_config.cache_clear()
+        get_python_moduledir.cache_clear()
+        get_build_file_names.cache_clear()
+        get_blacklist_dirs.cache_clear()
+        get_third_party_module_targets.cache_clear()
+
+    # Third-party targets are queried from every BUILD package under the moduledir.
+    build_file_names = set(get_build_file_names())
+    third_party_stamp = _get_mtimes(
+        os.path.join(dir_path, file_name)
+        for dir_path, _, file_names in os.walk(get_python_moduledir().replace(".", os.path.sep))
+        for file_name in file_names
+        if file_name in build_file_names
+    )
+    if _config_files_stamp is not None and third_party_stamp != _config_files_stamp[1]:
+        LOGGER.info("Third-party BUILD files have changed; querying third-party targets again")
+        get_third_party_module_targets.cache_clear()
+
+    _config_files_stamp = (plzconfig_stamp, third_party_stamp)
+    return
+
+
+def _get_mtimes(paths: Iterable[str]) -> tuple[tuple[str, int], ...]:
+    mtimes: list[tuple[str, int]] = []
+    for path in sorted(paths):
+        try:
+            mtimes.append((path, os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            continue
+    return tuple(mtimes)
+
+
+def _get_printed_rule_field(printed_rule: str, field: str) -> Optional[list[str]]:
+    try:
+        module = ast.parse(printed_rule)
+    except SyntaxError:
+        return None
+
+    for statement in module.body:
+        if not isinstance(statement, ast.Expr) or not isinstance(statement.value, ast.Call):
+            continue
+        for keyword in statement.value.keywords:
+            if keyword.arg != field:
+                continue
+            try:
+                values = ast.literal_eval(keyword.value)
+            except ValueError:
+                return None
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                return None
+            return values
+        # A field which is not printed is empty.
+        return []
+    return None
+
+
 def _convert_list_of_bytes_to_list_of_strs(input_: Optional[IO[AnyStr]]) -> list[str]:
     if input_ is None:
         return []
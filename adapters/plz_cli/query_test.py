@@ -1,19 +1,25 @@
 import functools
 import gc
 import os
+import shutil
 import subprocess
+import tempfile
 from unittest import TestCase, mock
 
 from adapters.plz_cli.query import (
+    clear_stale_caches,
     get_all_targets,
     get_build_file_names,
     get_config,
     get_third_party_module_targets,
     get_plz_build_graph,
     get_print,
+    get_print_by_target,
     get_reporoot,
     get_whatinputs,
+    get_whatinputs_by_path,
     run_plz_fmt,
+    WhatInputsByPathResult,
     WhatInputsResult,
 )
 
@@ -72,6 +78,7 @@ class TestGetThirdPartyModules(TestCase):
 
 
 class TestGetProjectRoot(TestCase):
+    @mock.patch("adapters.plz_cli.query.find_reporoot", mock.MagicMock(return_value=None))
     @mock.patch("adapters.plz_cli.query.subprocess.Popen")
     def test_gets_reporoot(self, mock_subprocess_popen):
         process_mock = mock.Mock()
@@ -155,6 +162,52 @@ class TestGetWhatInputs(TestCase):
         return
 
 
+class TestGetWhatInputsByPath(TestCase):
+    @mock.patch("adapters.plz_cli.query.subprocess.Popen")
+    def test_gets_targets_by_path(self, mock_subprocess_popen):
+        process_mock = mock.Mock()
+        stdout_mock_return_value = [
+            b"path/to/pkg/module.py //path/to/pkg:target",
+            b"path/to/pkg/module.py //path/to/pkg:other_target",
+            b"path/to/other_pkg/module.py //path/to/other_pkg:target",
+            b"Error: 'path/to/nowhere/module.py' is not a source to any current target",
+        ]
+        process_mock.configure_mock(**{"stdout": stdout_mock_return_value, "returncode": 0})
+        mock_subprocess_popen.return_value = process_mock
+
+        self.assertEqual(
+            WhatInputsByPathResult(
+                plz_targets_by_path={
+                    "path/to/pkg/module.py": {"//path/to/pkg:target", "//path/to/pkg:other_target"},
+                    "path/to/other_pkg/module.py": {"//path/to/other_pkg:target"},
+                },
+                targetless_paths={"path/to/nowhere/module.py"},
+            ),
+            get_whatinputs_by_path(
+                ["path/to/pkg/module.py", "path/to/other_pkg/module.py", "path/to/nowhere/module.py"],
+            ),
+        )
+        mock_subprocess_popen.assert_called_once_with(
+            [
+                "plz",
+                "query",
+                "whatinputs",
+                "--echo_files",
+                "path/to/pkg/module.py",
+                "path/to/other_pkg/module.py",
+                "path/to/nowhere/module.py",
+            ],
+            stdout=subprocess.PIPE,
+        )
+        return
+
+    @mock.patch("adapters.plz_cli.query.subprocess.Popen")
+    def test_no_paths(self, mock_subprocess_popen):
+        self.assertEqual(WhatInputsByPathResult({}, set()), get_whatinputs_by_path([]))
+        mock_subprocess_popen.assert_not_called()
+        return
+
+
 class TestGetAllTargets(TestCase):
     @mock.patch("adapters.plz_cli.query.subprocess.Popen")
     def test_gets_all_targets(self, mock_subprocess_popen):
@@ -270,6 +323,66 @@ class TestPrint(TestCase):
         return
 
 
+class TestPrintByTarget(TestCase):
+    @mock.patch("adapters.plz_cli.query.subprocess.Popen")
+    def test_print_by_target(self, mock_subprocess_popen):
+        process_mock = mock.Mock()
+        stdout_mock_return_value = [
+            b"# //path/to:to:",
+            b"build_rule(",
+            b"    name = 'to',",
+            b"    srcs = [",
+            b"        '__init__.py',",
+            b"        'module.py',",
+            b"    ],",
+            b"    labels = ['py'],",
+            b")",
+            b"",
+            b"# //path/to:_test#lib:",
+            b"build_rule(",
+            b"    name = '_test#lib',",
+            b"    srcs = ['module_test.py'],",
+            b")",
+            b"# //path/to:named:",
+            b"build_rule(",
+            b"    name = 'named',",
+            b"    srcs = {'a': ['a.py']},",
+            b")",
+            b"# //path/to:empty:",
+            b"build_rule(name = 'empty')",
+        ]
+        process_mock.configure_mock(**{"stdout": stdout_mock_return_value, "returncode": None})
+        mock_subprocess_popen.return_value = process_mock
+
+        self.assertEqual(
+            {
+                "//path/to": ["__init__.py", "module.py"],
+                "//path/to:_test#lib": ["module_test.py"],
+                "//path/to:empty": [],
+            },
+            get_print_by_target(["//path/to", "//path/to:_test#lib", "//path/to:named", "//path/to:empty"], "srcs"),
+        )
+        mock_subprocess_popen.assert_called_once_with(
+            [
+                "plz",
+                "query",
+                "print",
+                "//path/to:to",
+                "//path/to:_test#lib",
+                "//path/to:named",
+                "//path/to:empty",
+            ],
+            stdout=subprocess.PIPE,
+        )
+        return
+
+    @mock.patch("adapters.plz_cli.query.subprocess.Popen")
+    def test_print_no_targets(self, mock_subprocess_popen):
+        self.assertEqual({}, get_print_by_target([], "srcs"))
+        mock_subprocess_popen.assert_not_called()
+        return
+
+
 class TestFmt(TestCase):
     @mock.patch("adapters.plz_cli.query.subprocess.Popen")
     def test_fmt(self, mock_subprocess_popen):
@@ -293,3 +406,65 @@ class TestFmt(TestCase):
             run_plz_fmt,
         )
         return
+
+
+@mock.patch("adapters.plz_cli.query._config_files_stamp", None)
+@mock.patch("adapters.plz_cli.query.get_third_party_module_targets")
+@mock.patch("adapters.plz_cli.query.get_build_file_names")
+@mock.patch("adapters.plz_cli.query.get_python_moduledir")
+@mock.patch("adapters.plz_cli.query.get_config")
+class TestClearStaleCaches(TestCase):
+    def setUp(self) -> None:
+        self.test_wd = os.getcwd()
+        self.reporoot = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.reporoot, "third_party", "python3", "sub"))
+        self.plzconfig_path = os.path.join(self.reporoot, ".plzconfig")
+        self.third_party_build_file_path = os.path.join(self.reporoot, "third_party", "python3", "BUILD")
+        self.third_party_sub_build_file_path = os.path.join(self.reporoot, "third_party", "python3", "sub", "BUILD")
+        for path in (self.plzconfig_path, self.third_party_build_file_path, self.third_party_sub_build_file_path):
+            with open(path, "w") as f:
+                f.write("")
+        os.chdir(self.reporoot)
+        return
+
+    def tearDown(self) -> None:
+        os.chdir(self.test_wd)
+        shutil.rmtree(self.reporoot, ignore_errors=True)
+        return
+
+    @staticmethod
+    def bump_mtime(path: str) -> None:
+        mtime_ns = os.stat(path).st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+        return
+
+    def test_only_clears_config_caches_when_files_change(
+        self,
+        mock_get_config: mock.MagicMock,
+        mock_get_python_moduledir: mock.MagicMock,
+        mock_get_build_file_names: mock.MagicMock,
+        mock_get_third_party_module_targets: mock.MagicMock,
+    ):
+        mock_get_python_moduledir.return_value = "third_party.python3"
+        mock_get_build_file_names.return_value = ["BUILD"]
+
+        clear_stale_caches()
+        clear_stale_caches()
+        self.assertEqual(1, mock_get_config.cache_clear.call_count)
+        self.assertEqual(1, mock_get_third_party_module_targets.cache_clear.call_count)
+
+        self.bump_mtime(self.third_party_build_file_path)
+        clear_stale_caches()
+        self.assertEqual(1, mock_get_config.cache_clear.call_count)
+        self.assertEqual(2, mock_get_third_party_module_targets.cache_clear.call_count)
+
+        self.bump_mtime(self.third_party_sub_build_file_path)
+        clear_stale_caches()
+        self.assertEqual(1, mock_get_config.cache_clear.call_count)
+        self.assertEqual(3, mock_get_third_party_module_targets.cache_clear.call_count)
+
+        self.bump_mtime(self.plzconfig_path)
+        clear_stale_caches()
+        self.assertEqual(2, mock_get_config.cache_clear.call_count)
+        self.assertEqual(4, mock_get_third_party_module_targets.cache_clear.call_count)
+        return
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Collection, Optional
+
+from adapters.plz_cli.plzconfig import AmbiguousPlzConfigError, get_config_file_paths
+from common.logger.logger import setup_logger
+
+DEFAULT_CACHE_PATH = os.path.join("plz-out", "pyllemi", "third_party_targets.json")
+
+# Bump whenever the layout of the cache changes, so that caches written by other versions are discarded.
+CACHE_FORMAT_VERSION = 2
+
+# Environment variables which change the config plz reads, and so which third-party targets it finds.
+_CONFIG_ENV_VAR_NAMES = ("PLZ_CONFIG_PROFILE", "PLZ_OVERRIDES")
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+class ThirdPartyTargetsCache:
+    """
+    On-disk cache of the third-party module targets, i.e. the output of `plz query alltargets` on the python moduledir.
+
+    The targets are keyed by the hash of the config files plz reads (including machine-wide, user and profile configs),
+    of the BUILD files under the python moduledir, and by $PLZ_CONFIG_PROFILE and $PLZ_OVERRIDES. They are reused
+    until any of those files are added, removed or changed, or either environment variable changes. Files are only
+    hashed if their mtimes or sizes have changed since the targets were cached.
+
+    Must be used from the reporoot.
+    """
+
+    def __init__(
+        self,
+        python_moduledir: str,
+        build_file_names: Collection[str],
+        path: str = DEFAULT_CACHE_PATH,
+    ):
+        self._logger = setup_logger(__file__)
+        self._python_moduledir = python_moduledir
+        self._build_file_names = frozenset(build_file_names)
+        self._path = path
+        return
+
+    def get_or_query(self, query_fn: Callable[[], list[str]]) -> list[str]:
+        """
+        :param query_fn: queries plz for the third-party module targets, if they are not cached.
+        """
+
+        try:
+            stats = self._stat_input_files()
+        except AmbiguousPlzConfigError as e:
+            self._logger.debug(f"Not caching third-party targets, as the config files plz reads are unknown: {e}")
+            return query_fn()
+
+        env = {name: os.environ.get(name, "") for name in _CONFIG_ENV_VAR_NAMES}
+        raw_cache = self._load()
+        if raw_cache is not None and raw_cache["env"] == env and raw_cache["stats"] == stats:
+            self._logger.debug(f"Reusing third-party targets cached in {self._path}")
+            return raw_cache["targets"]
+
+        # Hash the files before querying plz, so that any changes made during the query are picked up next time.
+        hashes = {path: _hash_file(path) for path in stats}
+        key = self._key(env, hashes)
+        if raw_cache is not None and raw_cache["key"] == key:
+            # E.g. the files have been touched, or checked out again, without their contents changing.
+            self._logger.debug(f"Reusing third-party targets cached in {self._path}")
+            self._save(key, env, stats, raw_cache["targets"])
+            return raw_cache["targets"]
+
+        targets = query_fn()
+        self._save(key, env, stats, targets)
+        return targets
+
+    def _stat_input_files(self) -> dict[str, list[int]]:
+        """
+        :return: mtime (in ns) and size of each of the files which the third-party targets depend on.
+        :raises AmbiguousPlzConfigError: if the config files plz reads cannot be determined without plz.
+        """
+
+        paths = get_config_file_paths(os.path.abspath(os.curdir))
+        for dir_path, _, file_names in os.walk(self._python_moduledir.replace(".", os.path.sep)):
+            paths.extend(
+                os.path.join(dir_path, file_name) for file_name in file_names if file_name in self._build_file_names
+            )
+
+        stats: dict[str, list[int]] = {}
+        for path in sorted(paths):
+            try:
+                stat_result = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stats[path] = [stat_result.st_mtime_ns, stat_result.st_size]
+        return stats
+
+    def _key(self, env: dict[str, str], hashes: dict[str, str]) -> str:
+        key = hashlib.sha256(self._python_moduledir.encode())
+        for name, value in sorted(env.items()):
+            key.update(f"\0{name}={value}".encode())
+        for path, file_hash in sorted(hashes.items()):
+            key.update(f"\0{path}\0{file_hash}".encode())
+        return key.hexdigest()
+
+    def _load(self) -> Optional[dict]:
+        try:
+            with open(self._path, "r") as cache_file:
+                raw_cache = json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            self._logger.warning(f"Ignoring unreadable third-party targets cache {self._path}: {e}")
+            return None
+
+        if (
+            not isinstance(raw_cache, dict)
+            or raw_cache.get("version") != CACHE_FORMAT_VERSION
+            or not {"key", "env", "stats", "targets"} <= raw_cache.keys()
+        ):
+            self._logger.debug(f"Ignoring third-party targets cache {self._path} written in a different format")
+            return None
+        return raw_cache
+
+    def _save(self, key: str, env: dict[str, str], stats: dict[str, list[int]], targets: list[str]) -> None:
+        raw_cache = {"version": CACHE_FORMAT_VERSION, "key": key, "env": env, "stats": stats, "targets": targets}
+        cache_dir = os.path.dirname(self._path) or os.curdir
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file first so that a concurrent run never reads a partially written cache.
+            with tempfile.NamedTemporaryFile("w", dir=cache_dir, suffix=".tmp", delete=False) as tmp_file:
+                json.dump(raw_cache, tmp_file)
+            os.replace(tmp_file.name, self._path)
+        except OSError as e:
+            self._logger.warning(f"Could not write third-party targets cache to {self._path}: {e}")
+        return
+
+
+def _hash_file(path: str) -> str:
+    file_hash = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                file_hash.update(chunk)
+    except FileNotFoundError:
+        return ""
+    return file_hash.hexdigest()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+from unittest import mock, TestCase
+
+from adapters.plz_cli.third_party_targets_cache import ThirdPartyTargetsCache
+
+
+class TestThirdPartyTargetsCache(TestCase):
+    def setUp(self) -> None:
+        reporoot = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, reporoot, ignore_errors=True)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(reporoot)
+
+        # Keep the machine's own configs and environment out of the tests.
+        self.home_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home_dir, ignore_errors=True)
+        env_patcher = mock.patch.dict(os.environ, {"HOME": self.home_dir})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        for name in ("PLZ_CONFIG_PROFILE", "PLZ_OVERRIDES"):
+            os.environ.pop(name, None)
+
+        os.makedirs(os.path.join("third_party", "python3", "sub"))
+        self.write(".plzconfig", "[python]\nmoduledir = third_party.python3\n")
+        self.write(os.path.join("third_party", "python3", "BUILD"), "pip_library(name = 'a')\n")
+        self.write(os.path.join("third_party", "python3", "sub", "BUILD"), "pip_library(name = 'b')\n")
+
+        self.query_fn = mock.MagicMock(return_value=["//third_party/python3:a", "//third_party/python3/sub:b"])
+        return
+
+    @staticmethod
+    def write(path: str, contents: str) -> None:
+        with open(path, "w") as f:
+            f.write(contents)
+        return
+
+    @staticmethod
+    def new_cache() -> ThirdPartyTargetsCache:
+        return ThirdPartyTargetsCache("third_party.python3", ["BUILD"])
+
+    def test_reuses_targets_until_files_change(self):
+        self.assertEqual(self.query_fn.return_value, self.new_cache().get_or_query(self.query_fn))
+        self.assertEqual(self.query_fn.return_value, self.new_cache().get_or_query(self.query_fn))
+        self.query_fn.assert_called_once()
+
+        for path, contents in [
+            (os.path.join("third_party", "python3", "sub", "BUILD"), "pip_library(name = 'changed')\n"),
+            (".plzconfig.local", "[python]\n"),
+            (os.path.join(self.home_dir, ".config", "please", "plzconfig"), "[python]\n"),
+            (os.path.join("third_party", "python3", "new", "BUILD"), ""),
+        ]:
+            with self.subTest(path):
+                self.query_fn.reset_mock()
+                os.makedirs(os.path.dirname(path) or os.curdir, exist_ok=True)
+                self.write(path, contents)
+
+                self.new_cache().get_or_query(self.query_fn)
+                self.new_cache().get_or_query(self.query_fn)
+                self.query_fn.assert_called_once()
+        return
+
+    def test_requeries_when_config_env_vars_change(self):
+        self.write(".plzconfig.ci", "[python]\n")
+        self.new_cache().get_or_query(self.query_fn)
+
+        for name, value in [("PLZ_CONFIG_PROFILE", "ci"), ("PLZ_OVERRIDES", "python.moduledir:third_party.other")]:
+            with self.subTest(name):
+                self.query_fn.reset_mock()
+                os.environ[name] = value
+
+                self.new_cache().get_or_query(self.query_fn)
+                self.new_cache().get_or_query(self.query_fn)
+                self.query_fn.assert_called_once()
+        return
+
+    @mock.patch("adapters.plz_cli.plzconfig.platform.machine", return_value="sparc")
+    def test_does_not_cache_if_config_files_are_unknown(self, _: mock.MagicMock):
+        self.new_cache().get_or_query(self.query_fn)
+        self.new_cache().get_or_query(self.query_fn)
+        self.assertEqual(2, self.query_fn.call_count)
+        return
+
+    @mock.patch("adapters.plz_cli.third_party_targets_cache._hash_file")
+    def test_only_hashes_files_when_stats_change(self, mock_hash_file: mock.MagicMock):
+        mock_hash_file.side_effect = lambda path: path
+        self.new_cache().get_or_query(self.query_fn)
+        mock_hash_file.reset_mock()
+
+        self.new_cache().get_or_query(self.query_fn)
+        mock_hash_file.assert_not_called()
+
+        # Touched without changing its contents.
+        os.utime(".plzconfig", ns=(0, 0))
+        self.assertEqual(self.query_fn.return_value, self.new_cache().get_or_query(self.query_fn))
+        self.query_fn.assert_called_once()
+        mock_hash_file.assert_called()
+        return
@@ -0,0 +1,29 @@
+import json
+import socket
+from typing import Any, Optional
+
+from adapters.server.server import DEFAULT_SOCKET_PATH
+from common.logger.logger import setup_logger
+
+LOGGER = setup_logger(__file__)
+
+
+def send_request(request: dict[str, Any], socket_path: str = DEFAULT_SOCKET_PATH) -> Optional[dict[str, Any]]:
+    """
+    :return: the server's response, or None if no server is listening on the socket.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            LOGGER.debug(f"No server listening on {socket_path}")
+            return None
+
+        sock.sendall(f"{json.dumps(request)}\n".encode())
+        with sock.makefile("rb") as response_file:
+            response_line = response_file.readline()
+
+    if not response_line:
+        raise RuntimeError(f"server on {socket_path} closed the connection without responding")
+    return json.loads(response_line)
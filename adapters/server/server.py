@@ -0,0 +1,79 @@
+import json
+import os
+import socket
+import socketserver
+from typing import Any, Callable
+
+from common.logger.logger import setup_logger
+
+LOGGER = setup_logger(__file__)
+
+DEFAULT_SOCKET_PATH = os.path.join("plz-out", "pyllemi", "server.sock")
+
+
+class PyllemiServer(socketserver.UnixStreamServer):
+    """
+    Long-lived server which handles requests sent over a Unix socket, one at a time and in the order they arrive,
+    so that no 2 requests write to the same BUILD files concurrently.
+
+    Each connection carries a single request and its response, each encoded as a line of JSON.
+    """
+
+    def __init__(self, socket_path: str, handle_request_fn: Callable[[dict[str, Any]], dict[str, Any]]):
+        self.handle_request_fn = handle_request_fn
+        super().__init__(socket_path, _RequestHandler)
+        return
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: PyllemiServer
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.handle_request_fn(request)
+        except Exception as e:
+            # Keep serving subsequent requests; the client reports the error.
+            LOGGER.error(f"Failed to handle request: {e}", exc_info=e)
+            response = {"error": f"{type(e).__name__}: {e}"}
+
+        self.wfile.write(f"{json.dumps(response)}\n".encode())
+        return
+
+
+def serve(
+    handle_request_fn: Callable[[dict[str, Any]], dict[str, Any]],
+    socket_path: str = DEFAULT_SOCKET_PATH,
+) -> None:
+    """
+    Serves requests until interrupted.
+
+    :raises RuntimeError: if another server is already listening on the socket.
+    """
+
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            raise RuntimeError(f"a server is already listening on {socket_path}")
+        # Left behind by a server which did not shut down cleanly.
+        os.unlink(socket_path)
+
+    os.makedirs(os.path.dirname(socket_path) or os.curdir, exist_ok=True)
+    with PyllemiServer(socket_path, handle_request_fn) as server:
+        # noinspection PyUnresolvedReferences
+        LOGGER.notice(f"Listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            LOGGER.info("Shutting down")
+        finally:
+            os.unlink(socket_path)
+    return
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
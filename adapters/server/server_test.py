@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+from adapters.server.client import send_request
+from adapters.server.server import PyllemiServer, serve
+
+
+class TestServer(TestCase):
+    def setUp(self) -> None:
+        # Unix socket paths are limited to ~100 chars, so keep the path short.
+        self.socket_dir = tempfile.mkdtemp(prefix="pyllemi")
+        self.socket_path = os.path.join(self.socket_dir, "server.sock")
+        return
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.socket_dir, ignore_errors=True)
+        return
+
+    def start_server(self, handle_request_fn) -> PyllemiServer:
+        server = PyllemiServer(self.socket_path, handle_request_fn)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_round_trip(self):
+        self.start_server(lambda request: {"echo": request["build_pkg_dirs"]})
+        self.assertEqual({"echo": ["a", "b"]}, send_request({"build_pkg_dirs": ["a", "b"]}, self.socket_path))
+        return
+
+    def test_reports_errors_and_keeps_serving(self):
+        def handle_request_fn(request):
+            if request.get("fail"):
+                raise ValueError("oops")
+            return {}
+
+        self.start_server(handle_request_fn)
+        self.assertEqual({"error": "ValueError: oops"}, send_request({"fail": True}, self.socket_path))
+        self.assertEqual({}, send_request({}, self.socket_path))
+        return
+
+    def test_no_server(self):
+        self.assertIsNone(send_request({}, self.socket_path))
+        return
+
+    def test_serve_refuses_to_start_when_already_serving(self):
+        self.start_server(lambda request: {})
+        self.assertRaises(RuntimeError, serve, lambda request: {}, self.socket_path)
+        return
@@ -20,3 +20,31 @@ def existing_dir_arg_type(path: str) -> str:
         raise argparse.ArgumentTypeError(f"expected {path} to be a dir, but is a file instead")
 
     raise argparse.ArgumentTypeError(f"could not find {path}")
+
+
+def positive_int_arg_type(value: str) -> int:
+    try:
+        as_int = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected {value} to be an integer")
+
+    if as_int < 1:
+        raise argparse.ArgumentTypeError(f"expected {value} to be a positive integer")
+    return as_int
+
+
+def shard_arg_type(value: str) -> tuple[int, int]:
+    """
+    :param value: `i/N`, where 1 <= i <= N
+    :return: (i, N)
+    """
+
+    shard_index, _, num_shards = value.partition("/")
+    try:
+        as_shard = int(shard_index), int(num_shards)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected {value} to be of the form i/N")
+
+    if not 1 <= as_shard[0] <= as_shard[1]:
+        raise argparse.ArgumentTypeError(f"expected {value} to be of the form i/N, where 1 <= i <= N")
+    return as_shard
@@ -3,7 +3,12 @@ import os
 import uuid
 from unittest import TestCase
 
-from common.custom_arg_types import existing_file_arg_type, existing_dir_arg_type
+from common.custom_arg_types import (
+    existing_dir_arg_type,
+    existing_file_arg_type,
+    positive_int_arg_type,
+    shard_arg_type,
+)
 
 
 class TestExistingFileArgType(TestCase):
@@ -93,3 +98,46 @@ class TestExistingDirArgType(TestCase):
             test_path,
         )
         return
+
+
+class TestPositiveIntArgType(TestCase):
+    def test_positive_int(self):
+        self.assertEqual(4, positive_int_arg_type("4"))
+        return
+
+    def test_when_not_an_int(self):
+        self.assertRaisesRegex(
+            argparse.ArgumentTypeError,
+            "expected four to be an integer",
+            positive_int_arg_type,
+            "four",
+        )
+        return
+
+    def test_when_not_positive(self):
+        self.assertRaisesRegex(
+            argparse.ArgumentTypeError,
+            "expected 0 to be a positive integer",
+            positive_int_arg_type,
+            "0",
+        )
+        return
+
+
+class TestShardArgType(TestCase):
+    def test_shard(self):
+        self.assertEqual((2, 3), shard_arg_type("2/3"))
+        self.assertEqual((1, 1), shard_arg_type("1/1"))
+        return
+
+    def test_when_malformed(self):
+        for value in ("2", "a/b", "2/"):
+            with self.subTest(value):
+                self.assertRaisesRegex(argparse.ArgumentTypeError, "of the form i/N", shard_arg_type, value)
+        return
+
+    def test_when_out_of_range(self):
+        for value in ("0/3", "4/3", "-1/3"):
+            with self.subTest(value):
+                self.assertRaisesRegex(argparse.ArgumentTypeError, "1 <= i <= N", shard_arg_type, value)
+        return
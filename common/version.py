@@ -0,0 +1,2 @@
+# Keep in sync with the release tag.
+PYLLEMI_VERSION = "v0.9.4"
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 from dataclasses import dataclass, field
@@ -7,7 +8,7 @@ import jsonschema
 
 from config import known_dependencies, known_namespace_packages
 from config.common import LOGGER
-from config.schema import SCHEMA, USE_GLOBS_AS_SRCS_KEY
+from config.schema import IMPORT_COLLECTION_KEY, SCHEMA, USE_GLOBS_AS_SRCS_KEY
 from domain.plz.target.target import Target
 
 CONFIG_FILE_NAME = ".pyllemi.json"
@@ -18,16 +19,36 @@ class Config:
     known_deps: dict[str, Collection[Target]] = field(default_factory=dict)
     known_namespaces: dict[str, Target] = field(default_factory=dict)
     use_glob_as_srcs: Optional[bool] = None
+    import_collection: Optional[str] = None
 
     def __repr__(self) -> str:
         return (
             f"Config("
             f"known_deps={self.known_deps}, "
             f"known_namespaces={self.known_namespaces}, "
-            f"use_glob_as_srcs={self.use_glob_as_srcs})"
+            f"use_glob_as_srcs={self.use_glob_as_srcs}, "
+            f"import_collection={self.import_collection})"
             ")"
         )
 
+    def fingerprint(self) -> str:
+        """
+        :return: hash of the contents of this config, which is stable across runs. How imports are collected does
+            not affect which imports are found, so is not included.
+        """
+
+        contents = {
+            "known_deps": {
+                module: sorted(target.canonicalise() for target in targets)
+                for module, targets in self.known_deps.items()
+            },
+            "known_namespaces": {
+                namespace: target.canonicalise() for namespace, target in self.known_namespaces.items()
+            },
+            "use_glob_as_srcs": self.use_glob_as_srcs,
+        }
+        return hashlib.sha256(json.dumps(contents, sort_keys=True).encode()).hexdigest()
+
 
 def find_files_in_dir_hierarchy(path: str) -> list[str]:
     if not os.path.isdir(path):
@@ -64,6 +85,7 @@ def unmarshal(path: str) -> Config:
         known_deps=known_dependencies.get_from_config(raw_config),
         known_namespaces=known_namespace_packages.get_from_config(raw_config),
         use_glob_as_srcs=raw_config.get(USE_GLOBS_AS_SRCS_KEY, False),
+        import_collection=raw_config.get(IMPORT_COLLECTION_KEY),
     )
 
 
@@ -3,7 +3,8 @@ from unittest import TestCase
 
 import jsonschema
 
-from config.config import _validate
+from config.config import _validate, Config
+from domain.plz.target.target import Target
 
 
 class TestConfigValidation(TestCase):
@@ -88,3 +89,34 @@ class TestConfigValidation(TestCase):
                 {"knownNamespaces": testcase.known_namespaces},
             )
         return
+
+    def test_validates_import_collection(self):
+        _validate({"importCollection": "statements"})
+        _validate({"importCollection": "allNodes"})
+        self.assertRaises(jsonschema.exceptions.ValidationError, _validate, {"importCollection": "everything"})
+        return
+
+
+class TestConfigFingerprint(TestCase):
+    def test_is_independent_of_order_and_target_format(self):
+        config = Config(
+            known_deps={"x": [Target("//x:x"), Target("//y:y")]},
+            known_namespaces={"ns": Target("//ns")},
+            use_glob_as_srcs=True,
+        )
+        equivalent_config = Config(
+            known_deps={"x": [Target("//y"), Target("//x")]},
+            known_namespaces={"ns": Target("//ns:ns")},
+            use_glob_as_srcs=True,
+        )
+        self.assertEqual(config.fingerprint(), equivalent_config.fingerprint())
+        return
+
+    def test_differs_when_contents_differ(self):
+        config = Config(known_deps={"x": [Target("//x")]})
+        self.assertNotEqual(config.fingerprint(), Config(known_deps={"x": [Target("//y")]}).fingerprint())
+        self.assertNotEqual(
+            config.fingerprint(),
+            Config(known_deps={"x": [Target("//x")]}, use_glob_as_srcs=True).fingerprint(),
+        )
+        return
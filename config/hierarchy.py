@@ -0,0 +1,111 @@
+import os
+from typing import Callable, Optional
+
+from config.common import LOGGER
+from config.config import Config, CONFIG_FILE_NAME, unmarshal
+from config.merge import merge
+
+
+class ConfigHierarchy:
+    """
+    Merged configs of directories, for which every config file is read at most once, however many directories it
+    applies to. A config file applies to the directory it is in, and every directory beneath it.
+    """
+
+    def __init__(self, is_file: Callable[[str], bool] = os.path.isfile):
+        """
+        :param is_file: checks whether a config file exists at a path relative to reporoot, e.g. in a snapshot of the
+            filesystem.
+        """
+
+        self._is_file = is_file
+        self._configs_by_path: dict[str, Config] = {}
+        self._merged_configs_by_dir_path: dict[str, Config] = {}
+        # What each config file path looked like when it was last checked, to tell which configs have gone stale.
+        self._is_file_by_path: dict[str, bool] = {}
+        self._mtimes_by_path: dict[str, Optional[int]] = {}
+        return
+
+    def get(self, dir_path: str) -> Config:
+        """
+        :param dir_path: relative to reporoot
+        """
+
+        dir_path = os.path.normpath(dir_path)
+        if (merged_config := self._merged_configs_by_dir_path.get(dir_path)) is not None:
+            return merged_config
+
+        merged_config = merge(list(map(self._load, self.find_files(dir_path))))
+        LOGGER.debug(f"Merged config for {dir_path}: {merged_config}")
+        self._merged_configs_by_dir_path[dir_path] = merged_config
+        return merged_config
+
+    def find_files(self, dir_path: str) -> list[str]:
+        """
+        :return: paths to the config files which apply to the directory, in order of descending precedence.
+        """
+
+        config_file_paths: list[str] = []
+        dir_path = os.path.normpath(dir_path)
+        while True:
+            config_file_path = os.path.normpath(os.path.join(dir_path, CONFIG_FILE_NAME))
+            if is_file := self._is_file(config_file_path):
+                config_file_paths.append(config_file_path)
+            self._is_file_by_path[config_file_path] = is_file
+            if dir_path == os.curdir:
+                break
+            dir_path = os.path.dirname(dir_path) or os.curdir
+        return config_file_paths
+
+    def clear_stale(self) -> None:
+        """
+        For long-lived processes: forgets the configs of directories for which config files have been added, removed
+        or changed since they were read, so that they are read again when next needed.
+        """
+
+        stale_config_file_paths = {
+            config_file_path
+            for config_file_path, is_file in self._is_file_by_path.items()
+            if self._is_file(config_file_path) != is_file
+        } | {
+            config_file_path
+            for config_file_path, mtime in self._mtimes_by_path.items()
+            if _get_mtime(config_file_path) != mtime
+        }
+        if not stale_config_file_paths:
+            return
+
+        stale_dir_paths = {os.path.dirname(path) or os.curdir for path in stale_config_file_paths}
+        LOGGER.debug(f"Config files have changed in {', '.join(sorted(stale_dir_paths))}")
+        for config_file_path in stale_config_file_paths:
+            self._configs_by_path.pop(config_file_path, None)
+            self._is_file_by_path.pop(config_file_path, None)
+            self._mtimes_by_path.pop(config_file_path, None)
+        # Configs apply to every directory beneath them.
+        for dir_path in list(self._merged_configs_by_dir_path):
+            if any(_is_at_or_beneath(dir_path, stale_dir_path) for stale_dir_path in stale_dir_paths):
+                del self._merged_configs_by_dir_path[dir_path]
+        return
+
+    def _load(self, config_file_path: str) -> Config:
+        if (config := self._configs_by_path.get(config_file_path)) is None:
+            # Before reading, so that changes made while it is being read are picked up by `clear_stale`.
+            self._mtimes_by_path[config_file_path] = _get_mtime(config_file_path)
+            config = unmarshal(config_file_path)
+            self._configs_by_path[config_file_path] = config
+        return config
+
+
+def _is_at_or_beneath(dir_path: str, ancestor_dir_path: str) -> bool:
+    return (
+        ancestor_dir_path == os.curdir
+        or dir_path == ancestor_dir_path
+        or dir_path.startswith(ancestor_dir_path + os.sep)
+    )
+
+
+def _get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
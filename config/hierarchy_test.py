@@ -0,0 +1,99 @@
+import json
+import os
+import shutil
+import uuid
+from unittest import mock, TestCase
+
+from config.config import CONFIG_FILE_NAME, unmarshal
+from config.hierarchy import ConfigHierarchy
+from domain.plz.target.target import Target
+
+
+class TestConfigHierarchy(TestCase):
+    def setUp(self) -> None:
+        self.test_dir = f"test_config_hierarchy_{uuid.uuid4()}"
+        if os.path.exists(self.test_dir):
+            raise FileExistsError(f"cannot create {self.test_dir} for test setup: path already exists")
+        self.nested_dir = os.path.join(self.test_dir, "a", "b")
+        os.makedirs(self.nested_dir)
+        self.write_config(self.test_dir, {"knownDependencies": [{"module": "x", "plzTarget": "//x"}]})
+        self.write_config(self.nested_dir, {"knownDependencies": [{"module": "y", "plzTarget": "//y"}]})
+        return
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        return
+
+    def new_config_hierarchy(self) -> ConfigHierarchy:
+        # Ignore config files outside the test dir, e.g. at the reporoot.
+        return ConfigHierarchy(lambda path: path.startswith(self.test_dir) and os.path.isfile(path))
+
+    @staticmethod
+    def write_config(dir_path: str, raw_config: dict) -> None:
+        with open(os.path.join(dir_path, CONFIG_FILE_NAME), "w") as config_file:
+            json.dump(raw_config, config_file)
+        return
+
+    def test_find_files(self):
+        self.assertEqual(
+            [os.path.join(self.nested_dir, CONFIG_FILE_NAME), os.path.join(self.test_dir, CONFIG_FILE_NAME)],
+            self.new_config_hierarchy().find_files(self.nested_dir),
+        )
+        self.assertEqual(
+            [os.path.join(self.test_dir, CONFIG_FILE_NAME)],
+            self.new_config_hierarchy().find_files(os.path.join(self.test_dir, "a")),
+        )
+        return
+
+    def test_merges_configs(self):
+        self.assertEqual(
+            {"x": [Target("//x")], "y": [Target("//y")]},
+            self.new_config_hierarchy().get(self.nested_dir).known_deps,
+        )
+        return
+
+    @mock.patch("config.hierarchy.unmarshal", wraps=unmarshal)
+    def test_loads_each_config_file_once(self, mock_unmarshal: mock.MagicMock):
+        hierarchy = self.new_config_hierarchy()
+        hierarchy.get(self.nested_dir)
+        hierarchy.get(os.path.join(self.test_dir, "a"))
+        hierarchy.get(os.path.join(self.test_dir, "a", "b", ""))
+
+        self.assertEqual(2, mock_unmarshal.call_count)
+        return
+
+    @mock.patch("config.hierarchy.unmarshal", wraps=unmarshal)
+    def test_clear_stale_only_forgets_changed_configs(self, mock_unmarshal: mock.MagicMock):
+        hierarchy = self.new_config_hierarchy()
+        sibling_dir = os.path.join(self.test_dir, "c")
+        os.makedirs(sibling_dir)
+        hierarchy.get(self.nested_dir)
+        hierarchy.get(sibling_dir)
+        hierarchy.clear_stale()
+        self.assertEqual(2, mock_unmarshal.call_count)
+
+        with self.subTest("changed config"):
+            mock_unmarshal.reset_mock()
+            self.write_config(self.nested_dir, {"knownDependencies": [{"module": "z", "plzTarget": "//z"}]})
+            os.utime(os.path.join(self.nested_dir, CONFIG_FILE_NAME), ns=(0, 0))
+            hierarchy.clear_stale()
+
+            self.assertEqual({"x": [Target("//x")], "z": [Target("//z")]}, hierarchy.get(self.nested_dir).known_deps)
+            self.assertEqual({"x": [Target("//x")]}, hierarchy.get(sibling_dir).known_deps)
+            mock_unmarshal.assert_called_once_with(os.path.join(self.nested_dir, CONFIG_FILE_NAME))
+
+        with self.subTest("added config"):
+            mock_unmarshal.reset_mock()
+            self.write_config(sibling_dir, {"knownDependencies": [{"module": "w", "plzTarget": "//w"}]})
+            hierarchy.clear_stale()
+
+            self.assertEqual({"x": [Target("//x")], "w": [Target("//w")]}, hierarchy.get(sibling_dir).known_deps)
+            self.assertEqual({"x": [Target("//x")], "z": [Target("//z")]}, hierarchy.get(self.nested_dir).known_deps)
+            mock_unmarshal.assert_called_once_with(os.path.join(sibling_dir, CONFIG_FILE_NAME))
+
+        with self.subTest("removed config"):
+            os.remove(os.path.join(self.nested_dir, CONFIG_FILE_NAME))
+            hierarchy.clear_stale()
+
+            self.assertEqual({"x": [Target("//x")]}, hierarchy.get(self.nested_dir).known_deps)
+        return
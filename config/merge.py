@@ -21,10 +21,12 @@ def merge(configs: list[Config]) -> Config:
     merged_use_globs_as_srcs = _merge_bool_property([c.use_glob_as_srcs for c in configs])
     merged_known_namespaces = _merge_dict_property([c.known_namespaces for c in configs])
     merged_known_dependencies = _merge_dict_property([c.known_deps for c in configs])
+    merged_import_collection = _merge_str_property([c.import_collection for c in configs])
     return Config(
         known_deps=merged_known_dependencies,
         known_namespaces=merged_known_namespaces,
         use_glob_as_srcs=merged_use_globs_as_srcs,
+        import_collection=merged_import_collection,
     )
 
 
@@ -35,6 +37,13 @@ def _merge_bool_property(vals: list[Optional[bool]], default: bool = False) -> b
     return default
 
 
+def _merge_str_property(vals: list[Optional[str]], default: Optional[str] = None) -> Optional[str]:
+    for val in vals:
+        if val is not None:
+            return val
+    return default
+
+
 def _merge_dict_property(configs: list[MARSHALLED_CONFIG_VALUE_TYPE]) -> MARSHALLED_CONFIG_VALUE_TYPE:
     merged_property = {}
     for config in reversed(configs):
@@ -2,7 +2,7 @@ from collections import namedtuple
 from unittest import TestCase
 
 from config.config import Config
-from config.merge import _merge_bool_property, _merge_dict_property, merge
+from config.merge import _merge_bool_property, _merge_dict_property, _merge_str_property, merge
 from config.schema import KNOWN_NAMESPACES_KEY
 from domain.plz.target.target import Target
 
@@ -42,6 +42,11 @@ class TestMerge(TestCase):
             )
         return
 
+    def test__merge_str_property(self):
+        self.assertEqual("statements", _merge_str_property([None, "statements", "allNodes"]))
+        self.assertIsNone(_merge_str_property([None, None]))
+        return
+
     def test__merge_dict_property_with(self):
         SubTest = namedtuple("SubTest", ["name", "key", "input", "expected_output"])
         testcases = [
@@ -4,8 +4,14 @@ from typing import Union
 KNOWN_DEPENDENCIES_KEY: str = "knownDependencies"
 KNOWN_NAMESPACES_KEY: str = "knownNamespaces"
 USE_GLOBS_AS_SRCS_KEY: str = "useGlobAsSrcs"
+IMPORT_COLLECTION_KEY: str = "importCollection"
 
-UNMARSHALLED_CONFIG_TYPE = dict[str, Union[bool, list[dict[str, str]]]]
+# Find imports by visiting every node of a module's AST. The default.
+IMPORT_COLLECTION_ALL_NODES: str = "allNodes"
+# Find imports by only visiting statements, and never entering expressions.
+IMPORT_COLLECTION_STATEMENTS: str = "statements"
+
+UNMARSHALLED_CONFIG_TYPE = dict[str, Union[bool, str, list[dict[str, str]]]]
 
 SCHEMA = {
     "type": "object",
@@ -13,6 +19,7 @@ SCHEMA = {
         KNOWN_DEPENDENCIES_KEY: {"type": "array", "items": {"$ref": "#/defs/knownDep"}},
         KNOWN_NAMESPACES_KEY: {"type": "array", "items": {"$ref": "#/defs/knownNamespacePkg"}},
         USE_GLOBS_AS_SRCS_KEY: {"type": "boolean"},
+        IMPORT_COLLECTION_KEY: {"enum": [IMPORT_COLLECTION_ALL_NODES, IMPORT_COLLECTION_STATEMENTS]},
     },
     "defs": {
         "knownDep": {
@@ -1,8 +1,10 @@
 import ast
 import os.path
-from typing import Callable, Collection, Optional
+from collections import namedtuple
+from typing import Callable, Collection, Iterable, Mapping, Optional
 
 import service.ast.converters.to_python_rule
+from adapters.os.fs_snapshot import FileSystemSnapshot
 from adapters.os.new_build_pkg_creator import NewBuildPkgCreator
 from common.logger.logger import setup_logger
 from config.config import Config
@@ -10,6 +12,8 @@ from domain.build_files.build_file import BUILDFile
 from domain.plz.rule.python import Library, Test
 from domain.plz.target.target import Target
 
+TargetToResolve = namedtuple("TargetToResolve", ["node", "python_target", "plz_target", "srcs"])
+
 
 class BUILDPkg:
     """
@@ -24,7 +28,20 @@ class BUILDPkg:
 
     """
 
-    def __init__(self, dir_path_relative_to_reporoot: str, build_file_names: Collection[str], config: Config):
+    def __init__(
+        self,
+        dir_path_relative_to_reporoot: str,
+        build_file_names: Collection[str],
+        config: Config,
+        srcs_to_resolve: Optional[Collection[str]] = None,
+        fs_snapshot: Optional[FileSystemSnapshot] = None,
+    ):
+        """
+        :param srcs_to_resolve: if set, only targets with at least 1 of these srcs (relative to the BUILD package)
+            have their dependencies resolved.
+        :param fs_snapshot: if set, existing BUILD files are looked up in the snapshot rather than the filesystem.
+        """
+
         self._logger = setup_logger(__file__)
         self._uncommitted_changes: bool = False
         self._dir_path: str = dir_path_relative_to_reporoot
@@ -39,6 +56,10 @@ class BUILDPkg:
             config.use_glob_as_srcs or False,
         )
         self._config = config
+        self._fs_snapshot = fs_snapshot
+        self._srcs_to_resolve: Optional[set[str]] = (
+            None if srcs_to_resolve is None else set(map(os.path.normpath, srcs_to_resolve))
+        )
         self._this_pkg_build_file_path: str = ""
 
         self._has_been_modified = False
@@ -70,42 +91,103 @@ class BUILDPkg:
                 self.write_to_build_file()
         return
 
-    def resolve_deps_for_targets(self, deps_resolver_fn: Callable[[Target, set[str]], set[Target]]) -> None:
+    def resolve_deps_for_targets(
+        self,
+        deps_resolver_fn: Callable[[Target, set[str]], set[Target]],
+        srcs_by_srcs_query_target: Optional[Mapping[str, list[str]]] = None,
+    ) -> None:
+        for target_to_resolve in self.get_targets_to_resolve(srcs_by_srcs_query_target):
+            self.update_deps_for_target(
+                target_to_resolve,
+                deps_resolver_fn(target_to_resolve.plz_target, target_to_resolve.srcs),
+            )
+        return
+
+    def get_srcs_query_targets(self) -> list[str]:
+        """
+        :return: the targets to query plz for the srcs of, for the Python targets whose srcs are not literal lists.
+        """
+
         if not self._build_file.has_modifiable_nodes:
-            return
+            return []
+
+        return [
+            srcs_query_target
+            for node in self._build_file.get_existing_ast_python_build_rules()
+            if (srcs_query_target := service.ast.converters.to_python_rule.get_srcs_query_target(node, self._dir_path))
+            is not None
+        ]
+
+    def get_targets_to_resolve(
+        self,
+        srcs_by_srcs_query_target: Optional[Mapping[str, list[str]]] = None,
+    ) -> list[TargetToResolve]:
+        """
+        Splits dependency resolution from updating the BUILD file, so that the caller can resolve dependencies for
+        targets across many BUILD packages at once, before updating each of them with `update_deps_for_target`.
+
+        :param srcs_by_srcs_query_target: from `query_non_literal_srcs`
+        """
+
+        if not self._build_file.has_modifiable_nodes:
+            return []
 
+        targets_to_resolve: list[TargetToResolve] = []
         for node in self._build_file.get_existing_ast_python_build_rules():
-            as_python_target = service.ast.converters.to_python_rule.convert(node, self._dir_path)
+            as_python_target = service.ast.converters.to_python_rule.convert(
+                node,
+                self._dir_path,
+                srcs_by_srcs_query_target,
+            )
             self._logger.debug(f"Found target in {self._this_pkg_build_file_path}: {as_python_target}")
 
-            resolved_deps = deps_resolver_fn(
-                Target(f"//{self._dir_path}:{as_python_target['name']}"),
-                # Only a python_binary target has the main attribute; all other Python targets will have srcs.
-                # The occurrence of the 2 different attributes are mutually exclusive.
-                as_python_target["srcs"] or [as_python_target["main"]],
+            # Only a python_binary target has the main attribute; all other Python targets will have srcs.
+            # The occurrence of the 2 different attributes are mutually exclusive.
+            srcs = as_python_target["srcs"] or [as_python_target["main"]]
+            if self._srcs_to_resolve is not None and self._srcs_to_resolve.isdisjoint(
+                os.path.normpath(src) for src in srcs if isinstance(src, str)
+            ):
+                self._logger.debug(f"Skipping {as_python_target['name']}: none of its srcs are to be resolved")
+                continue
+
+            targets_to_resolve.append(
+                TargetToResolve(
+                    node=node,
+                    python_target=as_python_target,
+                    plz_target=Target(f"//{self._dir_path}:{as_python_target['name']}"),
+                    srcs=srcs,
+                )
             )
+        return targets_to_resolve
 
-            if (
-                new_deps := set(map(lambda plz_target: plz_target.simplify(self._dir_path), resolved_deps))
-            ) == as_python_target["deps"]:
-                # No need to update dependencies if there is no change
-                continue
+    def update_deps_for_target(self, target_to_resolve: TargetToResolve, resolved_deps: set[Target]) -> None:
+        if (
+            new_deps := set(map(lambda plz_target: plz_target.simplify(self._dir_path), resolved_deps))
+        ) == target_to_resolve.python_target["deps"]:
+            # No need to update dependencies if there is no change
+            return
 
-            as_python_target["deps"] = new_deps
-            self._build_file.register_modified_build_rule_to_python_target(node, as_python_target)
-            self._uncommitted_changes = True
+        target_to_resolve.python_target["deps"] = new_deps
+        self._build_file.register_modified_build_rule_to_python_target(
+            target_to_resolve.node,
+            target_to_resolve.python_target,
+        )
+        self._uncommitted_changes = True
         return
 
     def _is_new_pkg(self) -> bool:
+        isfile = os.path.isfile if self._fs_snapshot is None else self._fs_snapshot.isfile
+        isdir = os.path.isdir if self._fs_snapshot is None else self._fs_snapshot.isdir
+
         for build_file_name in self._build_file_names:
-            if os.path.isfile(path := os.path.join(self._dir_path, build_file_name)):
+            if isfile(path := os.path.join(self._dir_path, build_file_name)):
                 self._this_pkg_build_file_path = path
                 self._logger.debug(f"Found existing BUILD file: {path}")
                 return False
 
         for build_file_name in self._build_file_names_sorted_by_len:
             # Preference to shorter BUILD file names.
-            if not os.path.isdir(path := os.path.join(self._dir_path, build_file_name)):
+            if not isdir(path := os.path.join(self._dir_path, build_file_name)):
                 self._this_pkg_build_file_path = path
                 break
         return True
@@ -168,3 +250,20 @@ class BUILDPkg:
     @property
     def config(self):
         return self._config
+
+
+def query_non_literal_srcs(build_pkgs: Iterable[BUILDPkg]) -> dict[str, list[str]]:
+    """
+    Queries plz for the srcs of every Python target in the BUILD packages whose srcs are not literal lists (e.g.
+    `glob`s), with a single plz process rather than 1 per target.
+
+    :return: srcs keyed by the target they were queried for, to pass to `BUILDPkg.get_targets_to_resolve`.
+    """
+
+    srcs_query_targets = [
+        srcs_query_target for build_pkg in build_pkgs for srcs_query_target in build_pkg.get_srcs_query_targets()
+    ]
+    if len(srcs_query_targets) < 2:
+        # Nothing to gain over querying for the target's srcs when they are needed.
+        return {}
+    return service.ast.converters.to_python_rule.query_srcs(srcs_query_targets)
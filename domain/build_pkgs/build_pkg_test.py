@@ -3,7 +3,7 @@ import os
 from unittest import mock
 
 from config.config import Config
-from domain.build_pkgs.build_pkg import BUILDPkg
+from domain.build_pkgs.build_pkg import BUILDPkg, query_non_literal_srcs
 from domain.plz.rule.python import Library, Test
 from domain.plz.target.target import Target
 from utils.mock_python_library_with_new_build_pkg_test_case import (
@@ -154,3 +154,62 @@ class TestBuildPkgWithExistingBuildFile(MockPythonLibraryTestCase):
         )
         self.assertTrue(build_pkg._uncommitted_changes)
         return
+
+    @mock.patch("domain.build_pkgs.build_pkg.NewBuildPkgCreator", autospec=True)
+    @mock.patch("domain.build_pkgs.build_pkg.BUILDFile", autospec=True)
+    def test_only_resolves_targets_with_srcs_to_resolve(
+        self,
+        mock_build_file: mock.MagicMock,
+        _: mock.MagicMock,
+    ):
+        mock_build_file_instance: mock.MagicMock = mock_build_file.return_value
+        mock_build_file_instance.get_existing_ast_python_build_rules.return_value = [
+            ast.parse("""python_library(name="lib", srcs=["lib.py"], deps=[])""").body[0].value,
+            ast.parse("""python_test(name="lib_test", srcs=["lib_test.py"], deps=[])""").body[0].value,
+        ]
+
+        build_pkg = BUILDPkg(self.subpackage_dir, frozenset({"BUILD"}), config=Config(), srcs_to_resolve={"./lib.py"})
+
+        self.assertEqual(
+            [Target(f"//{self.subpackage_dir}:lib")],
+            [target_to_resolve.plz_target for target_to_resolve in build_pkg.get_targets_to_resolve()],
+        )
+        return
+
+    @mock.patch("service.ast.converters.to_python_rule.get_print_by_target")
+    @mock.patch("domain.build_pkgs.build_pkg.NewBuildPkgCreator", autospec=True)
+    @mock.patch("domain.build_pkgs.build_pkg.BUILDFile", autospec=True)
+    def test_queries_non_literal_srcs_at_once(
+        self,
+        mock_build_file: mock.MagicMock,
+        _: mock.MagicMock,
+        mock_get_print_by_target: mock.MagicMock,
+    ):
+        mock_build_file_instance: mock.MagicMock = mock_build_file.return_value
+        mock_build_file_instance.get_existing_ast_python_build_rules.side_effect = lambda: iter(
+            [
+                ast.parse("""python_library(name="lib", srcs=glob(SRCS))""").body[0].value,
+                ast.parse("""python_test(name="lib_test", srcs=glob(TEST_SRCS))""").body[0].value,
+                ast.parse("""python_binary(name="bin", main="main.py")""").body[0].value,
+            ]
+        )
+        mock_get_print_by_target.return_value = {
+            f"//{self.subpackage_dir}:lib": ["lib.py"],
+            f"//{self.subpackage_dir}:_lib_test#lib": ["lib_test.py"],
+        }
+
+        build_pkg = BUILDPkg(self.subpackage_dir, frozenset({"BUILD"}), config=Config())
+        srcs_by_srcs_query_target = query_non_literal_srcs([build_pkg])
+
+        mock_get_print_by_target.assert_called_once_with(
+            [f"//{self.subpackage_dir}:lib", f"//{self.subpackage_dir}:_lib_test#lib"],
+            "srcs",
+        )
+        self.assertEqual(
+            [{"lib.py"}, {"lib_test.py"}, ["main.py"]],
+            [
+                target_to_resolve.srcs
+                for target_to_resolve in build_pkg.get_targets_to_resolve(srcs_by_srcs_query_target)
+            ],
+        )
+        return
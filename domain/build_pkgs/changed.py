@@ -0,0 +1,82 @@
+import os
+from typing import Collection, Optional
+
+from config.config import CONFIG_FILE_NAME
+from domain.build_pkgs.discovery import find_owning_build_pkg_dir
+
+PYTHON_SRC_EXTS = (".py", ".pyi")
+PROTO_SRC_EXT = ".proto"
+
+
+def find_changed_build_pkgs(
+    changed_paths: Collection[str],
+    build_file_names: Collection[str],
+) -> dict[str, Optional[set[str]]]:
+    """
+    Maps changed files to the BUILD packages, and the srcs within them, whose dependencies need to be resolved again.
+
+    Python modules and stubs belong to the closest BUILD package at or above the directory they are in (or, if there
+    is none, to a new BUILD package in their directory); only targets with those srcs need to be resolved. A change to
+    a BUILD file or a proto resolves every target in its BUILD package. Files which no longer exist in a directory that
+    also no longer exists (e.g. a deleted package) are skipped, as are all other file types.
+
+    :param changed_paths: relative to reporoot
+    :return: srcs (relative to the BUILD package) to resolve, keyed by BUILD package dir (relative to reporoot).
+        None in place of srcs means all targets in the BUILD package are to be resolved.
+    """
+
+    srcs_to_resolve_by_build_pkg_dir: dict[str, Optional[set[str]]] = {}
+    for changed_path in changed_paths:
+        changed_path = os.path.normpath(changed_path)
+        dir_path, file_name = os.path.split(changed_path)
+        if dir_path.split(os.path.sep)[0] == "plz-out" or not os.path.isdir(dir_path or os.curdir):
+            continue
+
+        if file_name in build_file_names:
+            srcs_to_resolve_by_build_pkg_dir[dir_path] = None
+            continue
+
+        if not file_name.endswith((*PYTHON_SRC_EXTS, PROTO_SRC_EXT)):
+            continue
+
+        if (build_pkg_dir := find_owning_build_pkg_dir(dir_path, build_file_names)) is None:
+            build_pkg_dir = dir_path
+
+        if file_name.endswith(PROTO_SRC_EXT):
+            srcs_to_resolve_by_build_pkg_dir[build_pkg_dir] = None
+
+        else:
+            if build_pkg_dir not in srcs_to_resolve_by_build_pkg_dir:
+                srcs_to_resolve_by_build_pkg_dir[build_pkg_dir] = set()
+            if (srcs_to_resolve := srcs_to_resolve_by_build_pkg_dir[build_pkg_dir]) is not None:
+                srcs_to_resolve.add(os.path.relpath(changed_path, build_pkg_dir or os.curdir))
+
+    return srcs_to_resolve_by_build_pkg_dir
+
+
+def find_watched_build_pkgs_to_resolve(
+    changed_paths: Collection[str],
+    build_file_names: Collection[str],
+    watched_build_pkg_dirs: Collection[str],
+) -> dict[str, Optional[set[str]]]:
+    """
+    Like `find_changed_build_pkgs`, but only for the watched BUILD packages. A change to a config file also resolves
+    every target in the watched BUILD packages it applies to.
+    """
+
+    srcs_to_resolve_by_build_pkg_dir = {
+        build_pkg_dir: srcs_to_resolve
+        for build_pkg_dir, srcs_to_resolve in find_changed_build_pkgs(changed_paths, build_file_names).items()
+        if build_pkg_dir in watched_build_pkg_dirs
+    }
+
+    for changed_path in changed_paths:
+        config_dir, file_name = os.path.split(os.path.normpath(changed_path))
+        if file_name != CONFIG_FILE_NAME:
+            continue
+
+        for build_pkg_dir in watched_build_pkg_dirs:
+            if config_dir == "" or build_pkg_dir == config_dir or build_pkg_dir.startswith(config_dir + os.path.sep):
+                srcs_to_resolve_by_build_pkg_dir[build_pkg_dir] = None
+
+    return srcs_to_resolve_by_build_pkg_dir
@@ -0,0 +1,87 @@
+import os
+
+from domain.build_pkgs.changed import find_changed_build_pkgs, find_watched_build_pkgs_to_resolve
+from utils.mock_python_library_test_case import MockPythonLibraryTestCase
+
+
+class TestFindChangedBuildPkgs(MockPythonLibraryTestCase):
+    def test_maps_python_srcs_to_build_pkgs(self):
+        self.assertEqual(
+            {
+                self.test_dir: {"test_module_0.py"},
+                self.subpackage_dir: {"test_module_1.py", "stub.pyi"},
+            },
+            find_changed_build_pkgs(
+                [
+                    self.package_module,
+                    self.subpackage_module,
+                    os.path.join(self.subpackage_dir, "stub.pyi"),
+                    os.path.join(self.subpackage_dir, "README.md"),
+                ],
+                {"BUILD"},
+            ),
+        )
+        return
+
+    def test_maps_python_srcs_in_subdirs_to_owning_build_pkg(self):
+        nested_dir = os.path.join(self.subpackage_dir, "sub")
+        os.makedirs(nested_dir)
+        self.dirs_to_delete.insert(0, nested_dir)
+
+        self.assertEqual(
+            {self.subpackage_dir: {os.path.join("sub", "module.py")}},
+            find_changed_build_pkgs([os.path.join(nested_dir, "module.py")], {"BUILD"}),
+        )
+        return
+
+    def test_build_file_and_proto_changes_resolve_whole_build_pkg(self):
+        self.assertEqual(
+            {self.test_dir: None, self.subpackage_dir: None},
+            find_changed_build_pkgs(
+                [
+                    self.package_module,
+                    self.package_build_file,
+                    os.path.join(self.subpackage_dir, "schema.proto"),
+                    self.subpackage_module,
+                ],
+                {"BUILD"},
+            ),
+        )
+        return
+
+    def test_skips_removed_and_generated_build_pkgs(self):
+        self.assertEqual(
+            {},
+            find_changed_build_pkgs(
+                [
+                    os.path.join(self.test_dir, "removed_pkg", "module.py"),
+                    os.path.join("plz-out", "gen", self.test_dir, "module.py"),
+                ],
+                {"BUILD"},
+            ),
+        )
+        return
+
+
+class TestFindWatchedBuildPkgsToResolve(MockPythonLibraryTestCase):
+    def test_only_resolves_watched_build_pkgs(self):
+        self.assertEqual(
+            {self.subpackage_dir: {"test_module_1.py"}},
+            find_watched_build_pkgs_to_resolve(
+                [self.package_module, self.subpackage_module],
+                {"BUILD"},
+                [self.subpackage_dir],
+            ),
+        )
+        return
+
+    def test_config_changes_resolve_watched_build_pkgs_beneath(self):
+        self.assertEqual(
+            {self.test_dir: None, self.subpackage_dir: None},
+            find_watched_build_pkgs_to_resolve(
+                [self.package_module, os.path.join(self.test_dir, ".pyllemi.json")],
+                {"BUILD"},
+                [self.test_dir, self.subpackage_dir, "some/other/pkg"],
+            ),
+        )
+        return
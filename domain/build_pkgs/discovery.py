@@ -0,0 +1,63 @@
+import os
+from typing import Callable, Collection, Optional
+
+from adapters.os.fs_snapshot import FileSystemSnapshot
+
+
+def find_all_build_pkg_dirs(
+    fs_snapshot: FileSystemSnapshot,
+    build_file_names: Collection[str],
+    excluded_dir_paths: Collection[str] = (),
+) -> list[str]:
+    """
+    Finds every BUILD package with Python modules in it -- both existing BUILD packages, and directories with Python
+    modules which are not in any BUILD package, which Pyllemi would create a new BUILD package in. Python modules in
+    a subdirectory of a BUILD package (without a BUILD file of its own) belong to that BUILD package.
+
+    :param excluded_dir_paths: directories (relative to reporoot) to skip, along with everything beneath them,
+        e.g. the third-party Python moduledir.
+    :return: paths to the directories relative to reporoot, sorted.
+    """
+
+    excluded_dir_paths = {os.path.normpath(excluded_dir_path) for excluded_dir_path in excluded_dir_paths}
+
+    build_pkg_dirs: set[str] = set()
+    for dir_path in fs_snapshot.dir_paths():
+        if _is_excluded(dir_path, excluded_dir_paths):
+            continue
+
+        _, file_names = fs_snapshot.listdir(dir_path)
+        if any(file_name.endswith(".py") for file_name in file_names):
+            dir_path = "" if dir_path == os.curdir else dir_path
+            build_pkg_dir = find_owning_build_pkg_dir(dir_path, build_file_names, fs_snapshot.isfile)
+            build_pkg_dirs.add(dir_path if build_pkg_dir is None else build_pkg_dir)
+    return sorted(build_pkg_dirs)
+
+
+def find_owning_build_pkg_dir(
+    dir_path: str,
+    build_file_names: Collection[str],
+    isfile: Callable[[str], bool] = os.path.isfile,
+) -> Optional[str]:
+    """
+    :param dir_path: relative to reporoot
+    :return: the closest directory at or above the given directory with a BUILD file, i.e. the BUILD package which
+        files in the directory belong to, relative to reporoot; or None if there is none.
+    """
+
+    dir_path = os.path.normpath(dir_path)
+    dir_path = "" if dir_path == os.curdir else dir_path
+    while True:
+        if any(isfile(os.path.join(dir_path, build_file_name)) for build_file_name in build_file_names):
+            return dir_path
+        if dir_path == "":
+            return None
+        dir_path = os.path.dirname(dir_path)
+
+
+def _is_excluded(dir_path: str, excluded_dir_paths: set[str]) -> bool:
+    while dir_path not in ("", os.curdir):
+        if dir_path in excluded_dir_paths:
+            return True
+        dir_path = os.path.dirname(dir_path)
+    return os.curdir in excluded_dir_paths
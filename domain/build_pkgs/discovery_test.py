@@ -0,0 +1,61 @@
+import os
+from unittest import TestCase
+
+from adapters.os.fs_snapshot import FileSystemSnapshot
+from domain.build_pkgs.discovery import find_all_build_pkg_dirs, find_owning_build_pkg_dir
+
+
+class TestFindAllBuildPkgDirs(TestCase):
+    def setUp(self) -> None:
+        self.fs_snapshot = FileSystemSnapshot(
+            {
+                os.curdir: (["pkg", "third_party", "docs", "new"], ["main.py"]),
+                "pkg": (["subpkg", "subdir"], ["BUILD", "module.py"]),
+                os.path.join("pkg", "subpkg"): ([], ["BUILD", "module.py"]),
+                os.path.join("pkg", "subdir"): (["nested"], ["module.py"]),
+                os.path.join("pkg", "subdir", "nested"): ([], ["module.py"]),
+                "new": (["sub"], ["module.py"]),
+                os.path.join("new", "sub"): ([], ["module.py"]),
+                "third_party": (["python3"], []),
+                os.path.join("third_party", "python3"): ([], ["BUILD", "vendored.py"]),
+                "docs": ([], ["BUILD", "index.md"]),
+            }
+        )
+        return
+
+    def test_finds_build_pkgs_with_python_modules(self):
+        # Modules in pkg/subdir belong to pkg, rather than to a new BUILD package of their own.
+        self.assertEqual(
+            [
+                "",
+                "new",
+                os.path.join("new", "sub"),
+                "pkg",
+                os.path.join("pkg", "subpkg"),
+                os.path.join("third_party", "python3"),
+            ],
+            find_all_build_pkg_dirs(self.fs_snapshot, {"BUILD"}),
+        )
+        return
+
+    def test_skips_excluded_dirs(self):
+        self.assertEqual(
+            ["", "new", os.path.join("new", "sub"), "pkg"],
+            find_all_build_pkg_dirs(self.fs_snapshot, {"BUILD"}, [os.path.join("pkg", "subpkg"), "third_party"]),
+        )
+        return
+
+    def test_find_owning_build_pkg_dir(self):
+        for dir_path, expected_build_pkg_dir in [
+            ("pkg", "pkg"),
+            (os.path.join("pkg", "subdir", "nested"), "pkg"),
+            (os.path.join("pkg", "subpkg"), os.path.join("pkg", "subpkg")),
+            (os.path.join("new", "sub"), None),
+            (os.curdir, None),
+        ]:
+            with self.subTest(dir_path):
+                self.assertEqual(
+                    expected_build_pkg_dir,
+                    find_owning_build_pkg_dir(dir_path, {"BUILD"}, self.fs_snapshot.isfile),
+                )
+        return
@@ -0,0 +1,72 @@
+import heapq
+import os
+from typing import Callable, Collection
+
+from domain.build_pkgs.changed import PYTHON_SRC_EXTS
+
+
+def get_shard(
+    build_pkg_dir_paths: Collection[str],
+    shard_index: int,
+    num_shards: int,
+    cost_fn: Callable[[str], int],
+) -> list[str]:
+    """
+    Partitions BUILD packages into shards of roughly equal cost, and returns 1 of them. The partitioning only depends
+    on the BUILD packages and their costs, so every shard of the same set of BUILD packages can be computed
+    independently (e.g. on different CI nodes), and together the shards contain every BUILD package exactly once.
+
+    BUILD packages are assigned from most to least costly, each to the shard with the lowest total cost so far.
+
+    :param shard_index: 1-based
+    :return: paths to the BUILD packages in the shard, sorted.
+    """
+
+    if not 1 <= shard_index <= num_shards:
+        raise ValueError(f"expected shard {shard_index} to be between 1 and {num_shards}")
+
+    costs_by_build_pkg_dir_path = {
+        build_pkg_dir_path: cost_fn(build_pkg_dir_path) for build_pkg_dir_path in build_pkg_dir_paths
+    }
+
+    # (total cost, shard index); ties are broken by shard index, so that the partitioning is deterministic.
+    shard_costs: list[tuple[int, int]] = [(0, i) for i in range(1, num_shards + 1)]
+    shard: list[str] = []
+    for build_pkg_dir_path, cost in sorted(costs_by_build_pkg_dir_path.items(), key=lambda item: (-item[1], item[0])):
+        total_cost, i = heapq.heappop(shard_costs)
+        if i == shard_index:
+            shard.append(build_pkg_dir_path)
+        heapq.heappush(shard_costs, (total_cost + cost, i))
+
+    return sorted(shard)
+
+
+def get_src_bytes(dir_path: str, build_file_names: Collection[str]) -> int:
+    """
+    :return: total size of the Python modules and stubs within the directory and its subdirectories, as an estimate of
+        the cost of resolving its BUILD package. Subdirectories which are BUILD packages of their own, hidden
+        directories and `plz-out` are not counted.
+    """
+
+    src_bytes = 0
+    to_visit = [dir_path or os.curdir]
+    while to_visit:
+        try:
+            with os.scandir(to_visit.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not _is_skipped_dir(entry, build_file_names):
+                            to_visit.append(entry.path)
+                    elif entry.name.endswith(PYTHON_SRC_EXTS) and entry.is_file():
+                        src_bytes += entry.stat().st_size
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+    return src_bytes
+
+
+def _is_skipped_dir(entry: os.DirEntry, build_file_names: Collection[str]) -> bool:
+    return (
+        entry.name.startswith(".")
+        or entry.name == "plz-out"
+        or any(os.path.isfile(os.path.join(entry.path, build_file_name)) for build_file_name in build_file_names)
+    )
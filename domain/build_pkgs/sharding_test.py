@@ -0,0 +1,62 @@
+import os
+from unittest import TestCase
+
+from domain.build_pkgs.sharding import get_shard, get_src_bytes
+from utils.mock_python_library_test_case import MockPythonLibraryTestCase
+
+
+class TestGetShard(TestCase):
+    def setUp(self) -> None:
+        self.costs_by_build_pkg_dir_path = {"a": 10, "b": 7, "c": 5, "d": 3, "e": 3, "f": 0}
+        return
+
+    def get_shards(self, num_shards: int) -> list[list[str]]:
+        return [
+            get_shard(self.costs_by_build_pkg_dir_path, i, num_shards, self.costs_by_build_pkg_dir_path.get)
+            for i in range(1, num_shards + 1)
+        ]
+
+    def test_shards_cover_all_build_pkgs_exactly_once(self):
+        for num_shards in range(1, 8):
+            with self.subTest(num_shards):
+                build_pkg_dir_paths = [path for shard in self.get_shards(num_shards) for path in shard]
+                self.assertEqual(sorted(self.costs_by_build_pkg_dir_path), sorted(build_pkg_dir_paths))
+        return
+
+    def test_balances_cost(self):
+        self.assertEqual([["a"], ["b", "e"], ["c", "d", "f"]], self.get_shards(3))
+        return
+
+    def test_is_independent_of_input_order(self):
+        self.assertEqual(
+            get_shard(["a", "b", "c", "d", "e", "f"], 2, 3, self.costs_by_build_pkg_dir_path.get),
+            get_shard(["f", "e", "d", "c", "b", "a"], 2, 3, self.costs_by_build_pkg_dir_path.get),
+        )
+        return
+
+    def test_raises_when_shard_out_of_range(self):
+        self.assertRaises(ValueError, get_shard, ["a"], 0, 2, self.costs_by_build_pkg_dir_path.get)
+        self.assertRaises(ValueError, get_shard, ["a"], 3, 2, self.costs_by_build_pkg_dir_path.get)
+        return
+
+
+class TestGetSrcBytes(MockPythonLibraryTestCase):
+    def test_sums_sizes_of_python_srcs(self):
+        self.assertEqual(len("x = 5"), get_src_bytes(self.test_dir, {"BUILD"}))
+        self.assertEqual(0, get_src_bytes(os.path.join(self.test_dir, "does_not_exist"), {"BUILD"}))
+        return
+
+    def test_counts_srcs_in_nested_dirs_but_not_in_subpackages(self):
+        nested_dir_path = os.path.join(self.test_dir, "nested")
+        nested_nested_dir_path = os.path.join(nested_dir_path, "nested")
+        os.makedirs(nested_nested_dir_path)
+        self.dirs_to_delete[:0] = [nested_nested_dir_path, nested_dir_path]
+        for dir_path, code in [(nested_dir_path, "y = 10"), (nested_nested_dir_path, "z = 100")]:
+            module_path = os.path.join(dir_path, "module.py")
+            with open(module_path, "w") as f:
+                f.write(code)
+            self.files_to_delete.insert(0, module_path)
+
+        # test_subpackage has a BUILD file, so is not counted.
+        self.assertEqual(len("x = 5") + len("y = 10") + len("z = 100"), get_src_bytes(self.test_dir, {"BUILD"}))
+        return
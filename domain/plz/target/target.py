@@ -1,4 +1,3 @@
-import re
 from typing import Optional
 
 
@@ -7,43 +6,53 @@ class InvalidPlzTargetError(ValueError):
 
 
 class Target:
-    __absolute_target_path_pattern__ = re.compile(r"^//([\w/\-]*):([\w\-]+)$")
-    __simple_absolute_target_path_pattern__ = re.compile(r"^//([\w/\-]+)$")
-    __relative_target_path_pattern__ = re.compile(r"^:([\w\-]+)$")
-
-    def __init__(self, target: str):
-        absolute_target_match = re.match(self.__absolute_target_path_pattern__, target)
-        if absolute_target_match is not None:
-            self.build_pkg_dir: str = absolute_target_match.group(1)
-            self.target_name: str = (
-                absolute_target_match.group(2)
-                if absolute_target_match.group(2) != ""
-                else self.build_pkg_dir.split("/")[-1]
+    """
+    A BUILD target path. Targets are interned, so constructing a Target for a path which has been seen before returns
+    the same object.
+    """
+
+    __slots__ = ("build_pkg_dir", "target_name", "_canonical", "_simplified", "_hash")
+
+    # Keyed by both the target paths Targets have been constructed from, and their canonical forms.
+    __interned__: dict[str, "Target"] = {}
+
+    def __new__(cls, target: str) -> "Target":
+        if (interned := cls.__interned__.get(target)) is not None:
+            return interned
+
+        build_pkg_dir, target_name = _parse(target)
+        canonical = f"//{build_pkg_dir}:{target_name}"
+        if (interned := cls.__interned__.get(canonical)) is None:
+            interned = super().__new__(cls)
+            interned.build_pkg_dir = build_pkg_dir
+            interned.target_name = target_name
+            interned._canonical = canonical
+            interned._simplified = (
+                f"//{build_pkg_dir}" if build_pkg_dir.rsplit("/", maxsplit=1)[-1] == target_name else canonical
             )
-            return
+            interned._hash = hash(canonical)
+            cls.__interned__[canonical] = interned
+        cls.__interned__[target] = interned
+        return interned
 
-        simple_absolute_target_match = re.match(
-            self.__simple_absolute_target_path_pattern__,
-            target,
-        )
-        if simple_absolute_target_match is not None:
-            self.build_pkg_dir: str = simple_absolute_target_match.group(1)
-            self.target_name: str = self.build_pkg_dir.split("/")[-1]
-            return
+    @classmethod
+    def clear_interned(cls) -> None:
+        """
+        Releases every interned Target, so that long-lived processes (e.g. `pyllemi serve`) do not hold on to the
+        Targets of every resolution they have run. Targets constructed before and after still compare equal.
+        """
 
-        relative_target_match = re.match(self.__relative_target_path_pattern__, target)
-        if relative_target_match is not None:
-            self.build_pkg_dir: str = ""
-            self.target_name: str = relative_target_match.group(1)
+        cls.__interned__.clear()
+        return
 
-        else:
-            raise InvalidPlzTargetError(f"{target} does not match the format of a BUILD target path")
+    def __reduce__(self):
+        return Target, (self._canonical,)
 
     def __eq__(self, other: "Target") -> bool:
-        return self.canonicalise() == other.canonicalise()
+        return self is other or self._canonical == other._canonical
 
     def __hash__(self):
-        return hash(self.canonicalise())
+        return self._hash
 
     def __str__(self):
         return self.simplify()
@@ -52,7 +61,7 @@ class Target:
         return f"//{self.build_pkg_dir}:_{self.target_name}#{tag}"
 
     def canonicalise(self) -> str:
-        return f"//{self.build_pkg_dir}:{self.target_name}"
+        return self._canonical
 
     def simplify(self, relative_path_from_reporoot: Optional[str] = None) -> str:
         """
@@ -62,13 +71,37 @@ class Target:
 
         if relative_path_from_reporoot is not None and self.build_pkg_dir == relative_path_from_reporoot:
             return f":{self.target_name}"
+        return self._simplified
+
+
+def _parse(target: str) -> tuple[str, str]:
+    """
+    :return: the BUILD package dir and name of the target.
+    :raises InvalidPlzTargetError: if the target path is not of the form `//path/to:name`, `//path/to` or `:name`.
+    """
+
+    if target.startswith("//"):
+        build_pkg_dir, sep, target_name = target[2:].partition(":")
+        if sep == "":
+            # I.e. //path/to ≡ //path/to:to
+            target_name = build_pkg_dir.rsplit("/", maxsplit=1)[-1]
+            if build_pkg_dir != "" and _is_valid_name(build_pkg_dir, "/"):
+                return build_pkg_dir, target_name
+        elif target_name != "" and _is_valid_name(build_pkg_dir, "/") and _is_valid_name(target_name):
+            return build_pkg_dir, target_name
+
+    elif target.startswith(":"):
+        if (target_name := target[1:]) != "" and _is_valid_name(target_name):
+            return "", target_name
+
+    raise InvalidPlzTargetError(f"{target} does not match the format of a BUILD target path")
 
-        build_pkg_dir_split = self.build_pkg_dir.split("/")
-        build_pkg_dir_basename: str = ""
-        if len(build_pkg_dir_split) > 0:
-            build_pkg_dir_basename = build_pkg_dir_split[-1]
 
-        if build_pkg_dir_basename == self.target_name:
-            return f"//{self.build_pkg_dir}"
+def _is_valid_name(name: str, extra_chars: str = "") -> bool:
+    """
+    :return: whether the name only consists of word characters, hyphens, and any of the extra characters.
+    """
 
-        return f"//{self.build_pkg_dir}:{self.target_name}"
+    for char in extra_chars + "-_":
+        name = name.replace(char, "")
+    return name == "" or name.isalnum()
@@ -1,3 +1,4 @@
+import pickle
 from unittest import TestCase
 
 from domain.plz.target.target import Target, InvalidPlzTargetError
@@ -72,3 +73,31 @@ class TestPlzTarget(TestCase):
         plz_target = Target("//path/to/lib:lib")
         self.assertEqual(":lib", plz_target.simplify("path/to/lib"))
         return
+
+    def test_invalid_target_paths_raise_err(self):
+        for target in ["", "//", "//path/to:", ":", "//path:to:target", "//path/to:tar/get", ":path/to", "//pa th"]:
+            with self.subTest(target):
+                self.assertRaises(InvalidPlzTargetError, Target, target)
+        return
+
+    def test_targets_are_interned(self):
+        self.assertIs(Target("//path/to/lib:lib"), Target("//path/to/lib:lib"))
+        self.assertIs(Target("//path/to/lib"), Target("//path/to/lib:lib"))
+        self.assertIsNot(Target("//path/to/lib:lib"), Target("//path/to/lib:other"))
+        self.assertEqual(hash(Target("//path/to/lib")), hash(Target("//path/to/lib:lib")))
+        return
+
+    def test_pickling_preserves_interning(self):
+        plz_target = Target("//path/to/lib")
+        self.assertIs(plz_target, pickle.loads(pickle.dumps(plz_target)))
+        return
+
+    def test_clear_interned_releases_targets(self):
+        plz_target = Target("//path/to/lib")
+        Target.clear_interned()
+        self.assertEqual({}, Target.__interned__)
+
+        self.assertIsNot(plz_target, Target("//path/to/lib"))
+        self.assertEqual(plz_target, Target("//path/to/lib:lib"))
+        self.assertEqual(hash(plz_target), hash(Target("//path/to/lib:lib")))
+        return
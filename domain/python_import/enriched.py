@@ -1,5 +1,5 @@
-from dataclasses import dataclass
 from enum import unique, IntEnum
+from typing import NamedTuple
 
 from common.logger.logger import setup_logger
 
@@ -16,14 +16,10 @@ class Type(IntEnum):
     PROTOBUF_GEN = 5
 
 
-@dataclass
-class Import:
+class Import(NamedTuple):
     import_: str
     type_: Type
 
-    def __eq__(self, other: "Import") -> bool:
-        return self.import_ == other.import_ and self.type_ == other.type_
-
     @property
     def type(self):
         return self.type_
@@ -1,68 +1,296 @@
+import functools
 import os
 import sys
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
+from typing import Any, Callable, Optional
 
+from adapters.git_cli.diff import get_changed_paths
+from adapters.os.file_watcher import PollingFileWatcher
+from adapters.os.fs_snapshot import DEFAULT_IGNORED_DIR_NAMES, FileSystemSnapshot
+from adapters.os.import_nodes_cache import ImportNodesCache
+from adapters.os.run_manifest import RunManifest
+from adapters.plz_cli import async_query
+from adapters.plz_cli.graph_index import SrcToTargetIndex
 from adapters.plz_cli.query import (
+    clear_stale_caches,
     get_build_file_names,
-    get_third_party_module_targets,
+    get_plz_build_graph,
     get_python_moduledir,
     get_reporoot,
+    get_third_party_module_targets,
+    get_whatinputs,
+    get_whatinputs_by_path,
     run_plz_fmt,
+    WhatInputsResult,
 )
+from adapters.plz_cli.third_party_targets_cache import ThirdPartyTargetsCache
+from adapters.server.client import send_request
+from adapters.server.server import serve
 from colorama import Fore
-from common.custom_arg_types import existing_dir_arg_type
-from config import config, merge
-from domain.build_pkgs.build_pkg import BUILDPkg
-from domain.python_import.stdlib.stdlib_modules import get_stdlib_module_names
+from common.custom_arg_types import existing_dir_arg_type, positive_int_arg_type, shard_arg_type
+from config import config
+from config.schema import IMPORT_COLLECTION_STATEMENTS
+from domain.build_pkgs.build_pkg import BUILDPkg, query_non_literal_srcs
+from domain.build_pkgs.changed import (
+    find_changed_build_pkgs,
+    find_watched_build_pkgs_to_resolve,
+    PROTO_SRC_EXT,
+    PYTHON_SRC_EXTS,
+)
+from domain.build_pkgs.discovery import find_all_build_pkg_dirs
+from domain.build_pkgs.sharding import get_shard, get_src_bytes
+from domain.plz.target.target import Target
 from service.ast.converters.to_enriched_imports import ToEnrichedImports
+from service.dependency.incremental import IncrementalResolution, new_run_fingerprint
+from service.dependency.phased import resolve_deps_in_phases
+from service.dependency.resolution_cache import ImportResolutionCache
+from service.dependency.resolution_state import ResolutionState
 from service.dependency.resolver import DependencyResolver
-from service.python_import.node_collector import NodeCollector
+from service.python_import.node_collector import CachingNodeCollector, NodeCollector
 
 
 # noinspection PyShadowingNames
-def run(build_pkg_dir_paths: list[str]):
+def run(
+    build_pkg_dir_paths: list[str],
+    *,
+    use_build_graph: bool = False,
+    batch_whatinputs: bool = False,
+    jobs: int = 1,
+    use_import_cache: bool = True,
+    use_third_party_targets_cache: bool = True,
+    scan_imports: bool = False,
+    use_fs_snapshot: bool = False,
+    guess_targets_from_build_files: bool = False,
+    incremental: bool = False,
+    srcs_to_resolve_by_build_pkg_dir_path: Optional[dict[str, Optional[set[str]]]] = None,
+    all_build_pkgs: bool = False,
+    shard: Optional[tuple[int, int]] = None,
+    state: Optional[ResolutionState] = None,
+):
     """
 
     :param build_pkg_dir_paths: Relative to reporoot
-    :return:
+    :param use_build_graph: Resolve custom module targets from a single `plz query graph` call
+        instead of running `plz query whatinputs` for every target.
+    :param batch_whatinputs: Collect the custom module imports of every target in every BUILD package first,
+        and resolve all of them with a single `plz query whatinputs` call.
+    :param jobs: Number of worker processes to parse srcs and resolve dependencies with.
+    :param use_import_cache: Reuse the imports found in srcs whose contents have not changed since a previous run.
+    :param use_third_party_targets_cache: Reuse the third-party module targets queried in a previous run, until the
+        plz config files or the BUILD files in the python moduledir change.
+    :param scan_imports: Find import statements in srcs with a scan of the code, and only parse all of it when the
+        scan is ambiguous.
+    :param use_fs_snapshot: Walk the reporoot once up-front, and determine import types from the snapshot rather than
+        with stat calls per import.
+    :param guess_targets_from_build_files: Find the targets of custom module imports from the literal srcs of Python
+        targets in BUILD files, and only query plz for the rest.
+    :param incremental: Skip dependency resolution for targets whose inputs have not changed since the previous run,
+        as recorded in the run manifest.
+    :param srcs_to_resolve_by_build_pkg_dir_path: If set, only targets with these srcs are resolved in each
+        BUILD package. None in place of srcs means all targets in that BUILD package are resolved.
+    :param all_build_pkgs: Ignore `build_pkg_dir_paths`, and resolve every directory with Python modules in the repo
+        instead, with a single walk of the reporoot and a single `plz query whatinputs` call.
+    :param shard: (i, N) to only resolve the i-th (1-based) of N shards of the BUILD packages, balanced by the size of
+        their srcs.
+    :param state: shared between runs in long-lived processes, which must have brought it up to date first; a new one
+        is built for this run if not given.
+    :return: paths to the modified BUILD files
     """
 
-    # Get 3rd Party libs and builtins, stdlibs and known imports.
-    third_party_modules_targets: set[str] = set(get_third_party_module_targets())
-    std_lib_modules: set[str] = get_stdlib_module_names()
-    build_file_names: list[str] = get_build_file_names()
+    # Independent plz config queries run concurrently, and the third-party targets (the slowest query) are queried in
+    # the background while BUILD packages are parsed.
+    use_fs_snapshot = use_fs_snapshot or all_build_pkgs
+    python_moduledir, build_file_names, blacklist_dirs = async_query.run_concurrently(
+        async_query.get_python_moduledir(),
+        async_query.get_build_file_names(),
+        async_query.get_blacklist_dirs() if use_fs_snapshot else async_query.no_query([]),
+    )
+    third_party_modules_targets_future = async_query.run_in_background(
+        async_query.get_third_party_module_targets(
+            ThirdPartyTargetsCache(python_moduledir, build_file_names) if use_third_party_targets_cache else None
+        )
+    )
+
+    fs_snapshot: Optional[FileSystemSnapshot] = None
+    if use_fs_snapshot:
+        fs_snapshot = FileSystemSnapshot.build(ignored_dir_names=DEFAULT_IGNORED_DIR_NAMES | set(blacklist_dirs))
+    if state is None:
+        state = ResolutionState(build_file_names, fs_snapshot)
+
+    if all_build_pkgs:
+        build_pkg_dir_paths = find_all_build_pkg_dirs(
+            fs_snapshot,
+            build_file_names,
+            excluded_dir_paths=[python_moduledir.replace(".", os.path.sep)],
+        )
+        LOGGER.info(f"Found {len(build_pkg_dir_paths)} BUILD packages")
+
+    if shard is not None:
+        shard_index, num_shards = shard
+        build_pkg_dir_paths = get_shard(
+            build_pkg_dir_paths,
+            shard_index,
+            num_shards,
+            lambda build_pkg_dir_path: get_src_bytes(build_pkg_dir_path, build_file_names),
+        )
+        LOGGER.info(f"Resolving {len(build_pkg_dir_paths)} BUILD packages in shard {shard_index}/{num_shards}")
 
     build_pkgs: list[BUILDPkg] = []
     for build_pkg_dir_path in build_pkg_dir_paths:
-        merged_config = merge.merge(
-            list(
-                map(
-                    config.unmarshal,
-                    config.find_files_in_dir_hierarchy(build_pkg_dir_path),
+        build_pkgs.append(
+            BUILDPkg(
+                build_pkg_dir_path,
+                set(build_file_names),
+                state.config_hierarchy.get(build_pkg_dir_path),
+                srcs_to_resolve=(
+                    None
+                    if srcs_to_resolve_by_build_pkg_dir_path is None
+                    else srcs_to_resolve_by_build_pkg_dir_path.get(build_pkg_dir_path)
                 ),
-            ),
+                fs_snapshot=fs_snapshot,
+            )
         )
-        LOGGER.debug(f"Merged config for {build_pkg_dir_path}: {merged_config}")
-        build_pkgs.append(BUILDPkg(build_pkg_dir_path, set(build_file_names), merged_config))
 
     if len(build_pkgs) == 0:
         print(f"\n{Fore.GREEN}No BUILD package provided; no files modified.", file=sys.stdout)
-        return
+        return []
 
-    python_moduledir = get_python_moduledir()
+    # Each of these falls back to the previous one for any paths it cannot find targets for.
+    whatinputs_fn, whatinputs_by_path_fn = get_whatinputs, get_whatinputs_by_path
+    if use_build_graph:
+        src_to_target_index = SrcToTargetIndex.from_build_graph(
+            get_plz_build_graph(),
+            fallback=whatinputs_fn,
+            fallback_by_path=whatinputs_by_path_fn,
+        )
+        whatinputs_fn, whatinputs_by_path_fn = src_to_target_index.whatinputs, src_to_target_index.whatinputs_by_path
+    if guess_targets_from_build_files:
+        build_file_srcs_index = state.build_file_srcs_index.with_fallback(whatinputs_fn, whatinputs_by_path_fn)
+        whatinputs_fn = build_file_srcs_index.whatinputs
+        whatinputs_by_path_fn = build_file_srcs_index.whatinputs_by_path
 
-    modified_build_file_paths: list[str] = []
-    for build_pkg in build_pkgs:
-        dependency_resolver = DependencyResolver(
+    # Get 3rd Party libs.
+    third_party_modules_targets: set[str] = set(third_party_modules_targets_future.result())
+
+    import_nodes_cache = ImportNodesCache() if use_import_cache else None
+    nodes_collators = new_nodes_collators(import_nodes_cache, scan_imports)
+
+    incremental_resolution = (
+        IncrementalResolution(RunManifest().load(), new_run_fingerprint(python_moduledir, third_party_modules_targets))
+        if incremental
+        else None
+    )
+
+    import_resolution_cache = ImportResolutionCache()
+    dependency_resolvers = [
+        new_dependency_resolver(
+            build_pkg,
+            state,
             python_moduledir=python_moduledir,
-            enricher=ToEnrichedImports(get_reporoot(), python_moduledir),
-            std_lib_modules=std_lib_modules,
-            available_third_party_module_targets=third_party_modules_targets,
-            known_dependencies=build_pkg.config.known_deps,
-            namespace_to_target=build_pkg.config.known_namespaces,
-            nodes_collator=NodeCollector(),
+            third_party_modules_targets=third_party_modules_targets,
+            nodes_collators=nodes_collators,
+            whatinputs_fn=whatinputs_fn,
+            import_resolution_cache=import_resolution_cache,
+            fs_snapshot=fs_snapshot,
+        )
+        for build_pkg in build_pkgs
+    ]
+
+    if batch_whatinputs or all_build_pkgs or jobs > 1:
+        resolve_deps_in_phases(
+            build_pkgs,
+            dependency_resolvers,
+            jobs=jobs,
+            batch_whatinputs=batch_whatinputs or all_build_pkgs,
+            whatinputs_by_path_fn=whatinputs_by_path_fn,
+            incremental_resolution=incremental_resolution,
+        )
+    else:
+        srcs_by_srcs_query_target = query_non_literal_srcs(build_pkgs)
+        for build_pkg, dependency_resolver in zip(build_pkgs, dependency_resolvers):
+            deps_resolver_fn = dependency_resolver.resolve_deps_for_srcs
+            if incremental_resolution is not None:
+                deps_resolver_fn = incremental_resolution.wrap(deps_resolver_fn, build_pkg.config.fingerprint())
+            build_pkg.resolve_deps_for_targets(deps_resolver_fn, srcs_by_srcs_query_target)
+
+    # Worker processes have their own copies of the cache, so this only counts imports resolved in this process.
+    LOGGER.debug(
+        f"Import resolution cache: {import_resolution_cache.hits} hits, {import_resolution_cache.misses} misses"
+    )
+    if import_nodes_cache is not None:
+        import_nodes_cache.prune()
+
+    if incremental_resolution is not None:
+        incremental_resolution.save()
+
+    return write_build_files(build_pkgs)
+
+
+def new_nodes_collators(
+    import_nodes_cache: Optional[ImportNodesCache],
+    scan_imports: bool,
+) -> dict[bool, NodeCollector]:
+    """
+    :return: node collectors keyed by whether only statements are visited, which is configured per BUILD package.
+    """
+
+    return {
+        statements_only: (
+            NodeCollector(scan_imports=scan_imports, statements_only=statements_only)
+            if import_nodes_cache is None
+            else CachingNodeCollector(import_nodes_cache, scan_imports=scan_imports, statements_only=statements_only)
         )
-        build_pkg.resolve_deps_for_targets(dependency_resolver.resolve_deps_for_srcs)
+        for statements_only in (False, True)
+    }
+
+
+def new_dependency_resolver(
+    build_pkg: BUILDPkg,
+    state: ResolutionState,
+    *,
+    python_moduledir: str,
+    third_party_modules_targets: set[str],
+    nodes_collators: dict[bool, NodeCollector],
+    whatinputs_fn: Callable[[list[str]], WhatInputsResult],
+    import_resolution_cache: ImportResolutionCache,
+    fs_snapshot: Optional[FileSystemSnapshot] = None,
+) -> DependencyResolver:
+    """
+    :param nodes_collators: from `new_nodes_collators`
+    """
+
+    config_fingerprint = build_pkg.config.fingerprint()
+    return DependencyResolver(
+        python_moduledir=python_moduledir,
+        enricher=ToEnrichedImports(get_reporoot(), python_moduledir, fs_snapshot),
+        std_lib_modules=state.std_lib_modules,
+        available_third_party_module_targets=third_party_modules_targets,
+        known_dependencies=build_pkg.config.known_deps,
+        namespace_to_target=build_pkg.config.known_namespaces,
+        nodes_collator=nodes_collators[build_pkg.config.import_collection == IMPORT_COLLECTION_STATEMENTS],
+        whatinputs_fn=whatinputs_fn,
+        package_files_index=state.package_files_index,
+        # BUILD packages usually share their config with many others, so only classify imports once per config.
+        import_classification_table=state.get_import_classification_table(
+            config_fingerprint,
+            build_pkg.config.known_namespaces,
+            python_moduledir,
+            third_party_modules_targets,
+        ),
+        import_resolution_cache=import_resolution_cache,
+        config_fingerprint=config_fingerprint,
+    )
+
+
+def write_build_files(build_pkgs: list[BUILDPkg]) -> list[str]:
+    """
+    Writes the BUILD files of BUILD packages with uncommitted changes, and formats every modified BUILD file.
+
+    :return: paths to the modified BUILD files
+    """
+
+    modified_build_file_paths: list[str] = []
+    for build_pkg in build_pkgs:
         if build_pkg.has_uncommitted_changes():
             build_pkg.write_to_build_file()
 
@@ -75,7 +303,32 @@ def run(build_pkg_dir_paths: list[str]):
         LOGGER.notice(f"📢 Modified BUILD files: {', '.join(modified_build_file_paths)}.")
     else:
         LOGGER.info(f"No BUILD files were modified. Your imports were 👌 already.")
-    return
+    return modified_build_file_paths
+
+
+def handle_server_request(request: dict[str, Any], state: ResolutionState) -> dict[str, Any]:
+    """
+    Runs a resolution for a request sent by a client to `pyllemi serve`. The results of plz queries, and the
+    resolution state, are kept between requests, unless they have gone stale.
+
+    :param state: built once when the server starts
+    """
+
+    clear_stale_caches()
+    state.clear_stale(get_build_file_names())
+
+    options = dict(request.get("options", {}))
+    if (srcs_to_resolve_by_build_pkg_dir_path := options.get("srcs_to_resolve_by_build_pkg_dir_path")) is not None:
+        # JSON has no sets.
+        options["srcs_to_resolve_by_build_pkg_dir_path"] = {
+            build_pkg_dir_path: None if srcs_to_resolve is None else set(srcs_to_resolve)
+            for build_pkg_dir_path, srcs_to_resolve in srcs_to_resolve_by_build_pkg_dir_path.items()
+        }
+    try:
+        return {"modified_build_files": run(request["build_pkg_dirs"], **options, state=state)}
+    finally:
+        # The server is long-lived, so don't let the Targets of every request pile up.
+        Target.clear_interned()
 
 
 def to_relative_path_from_reporoot(path: str) -> str:
@@ -89,35 +342,343 @@ def to_relative_path_from_reporoot(path: str) -> str:
     return without_reporoot_prefix.removeprefix(os.path.sep)
 
 
+def watch(build_pkg_dir_paths: list[str], run_options: dict[str, Any]) -> None:
+    """
+    Resolves dependencies for all targets in the BUILD packages, and then, until interrupted, for the targets affected
+    by every change to the files in them. The results of plz queries, the resolution state, and the dependency resolver
+    of each BUILD package are kept between resolutions, unless they have gone stale.
+
+    :param build_pkg_dir_paths: Relative to reporoot
+    :param run_options: keyword arguments for `run`. Only the options for finding imports, and for finding targets
+        from BUILD files, apply to the resolutions after changes, which only resolve a few targets each.
+    """
+
+    build_file_names = get_build_file_names()
+    state = ResolutionState(build_file_names)
+    run(build_pkg_dir_paths, **run_options, state=state)
+
+    config_file_paths: set[str] = set()
+    for build_pkg_dir_path in build_pkg_dir_paths:
+        dir_path = build_pkg_dir_path
+        while True:
+            config_file_paths.add(os.path.join(dir_path, config.CONFIG_FILE_NAME))
+            if dir_path == "":
+                break
+            dir_path = os.path.dirname(dir_path)
+
+    watcher = PollingFileWatcher(
+        build_pkg_dir_paths,
+        config_file_paths,
+        lambda file_name: file_name in build_file_names or file_name.endswith((*PYTHON_SRC_EXTS, PROTO_SRC_EXT)),
+        build_file_names,
+    )
+
+    nodes_collators = new_nodes_collators(
+        ImportNodesCache() if run_options.get("use_import_cache", True) else None,
+        run_options.get("scan_imports", False),
+    )
+
+    def whatinputs_from_build_files(paths: list[str]) -> WhatInputsResult:
+        # Not bound to the index itself, which is replaced if the BUILD file names change.
+        return state.build_file_srcs_index.whatinputs(paths)
+
+    whatinputs_fn: Callable[[list[str]], WhatInputsResult] = (
+        whatinputs_from_build_files if run_options.get("guess_targets_from_build_files", False) else get_whatinputs
+    )
+    import_resolution_cache = ImportResolutionCache()
+    dependency_resolvers_by_build_pkg_dir_path: dict[str, DependencyResolver] = {}
+
+    def resolve_changes(srcs_to_resolve_by_build_pkg_dir_path: dict[str, Optional[set[str]]]) -> list[str]:
+        python_moduledir = get_python_moduledir()
+        third_party_modules_targets = set(get_third_party_module_targets())
+
+        build_pkgs: list[BUILDPkg] = []
+        dependency_resolvers: list[DependencyResolver] = []
+        for build_pkg_dir_path, srcs_to_resolve in sorted(srcs_to_resolve_by_build_pkg_dir_path.items()):
+            build_pkg = BUILDPkg(
+                build_pkg_dir_path,
+                state.build_file_names,
+                state.config_hierarchy.get(build_pkg_dir_path),
+                srcs_to_resolve=srcs_to_resolve,
+            )
+            # The classification table is only the same if the config, python moduledir and third-party targets are.
+            dependency_resolver = dependency_resolvers_by_build_pkg_dir_path.get(build_pkg_dir_path)
+            if dependency_resolver is None or (
+                dependency_resolver.import_classification_table
+                is not state.get_import_classification_table(
+                    build_pkg.config.fingerprint(),
+                    build_pkg.config.known_namespaces,
+                    python_moduledir,
+                    third_party_modules_targets,
+                )
+            ):
+                dependency_resolver = dependency_resolvers_by_build_pkg_dir_path[build_pkg_dir_path] = (
+                    new_dependency_resolver(
+                        build_pkg,
+                        state,
+                        python_moduledir=python_moduledir,
+                        third_party_modules_targets=third_party_modules_targets,
+                        nodes_collators=nodes_collators,
+                        whatinputs_fn=whatinputs_fn,
+                        import_resolution_cache=import_resolution_cache,
+                    )
+                )
+            build_pkgs.append(build_pkg)
+            dependency_resolvers.append(dependency_resolver)
+
+        srcs_by_srcs_query_target = query_non_literal_srcs(build_pkgs)
+        for build_pkg, dependency_resolver in zip(build_pkgs, dependency_resolvers):
+            build_pkg.resolve_deps_for_targets(dependency_resolver.resolve_deps_for_srcs, srcs_by_srcs_query_target)
+        return write_build_files(build_pkgs)
+
+    def on_changes(changed_paths: set[str]) -> list[str]:
+        srcs_to_resolve_by_build_pkg_dir_path = find_watched_build_pkgs_to_resolve(
+            changed_paths,
+            build_file_names,
+            build_pkg_dir_paths,
+        )
+        if not srcs_to_resolve_by_build_pkg_dir_path:
+            return []
+
+        clear_stale_caches()
+        state.clear_stale(get_build_file_names())
+        # What imports resolve to depends on the files in the packages they import.
+        import_resolution_cache.clear()
+        try:
+            return resolve_changes(srcs_to_resolve_by_build_pkg_dir_path)
+        except Exception as e:
+            # E.g. a src with a syntax error, while it is being edited. Keep watching for the fix.
+            LOGGER.error(f"Failed to resolve dependencies after changes to {', '.join(sorted(changed_paths))}: {e}")
+            return []
+        finally:
+            # Watching is long-lived, so don't let the Targets of every resolution pile up.
+            Target.clear_interned()
+
+    # noinspection PyUnresolvedReferences
+    LOGGER.notice(f"Watching {', '.join(build_pkg_dir_paths)} for changes")
+    try:
+        watcher.watch(on_changes)
+    except KeyboardInterrupt:
+        LOGGER.info("Stopped watching")
+    return
+
+
+def add_run_option_args(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--use-build-graph",
+        action="store_true",
+        help="Look up custom module targets in the plz build graph (queried once) rather than per target",
+    )
+    parser.add_argument(
+        "--batch-whatinputs",
+        action="store_true",
+        help="Resolve custom module targets for all BUILD packages with a single `plz query whatinputs` call",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int_arg_type,
+        default=1,
+        help="Number of worker processes to resolve BUILD packages with",
+    )
+    parser.add_argument(
+        "--no-import-cache",
+        action="store_true",
+        help="Always parse srcs, rather than reusing the imports cached in plz-out from previous runs",
+    )
+    parser.add_argument(
+        "--no-third-party-targets-cache",
+        action="store_true",
+        help="Always query plz for third-party targets, rather than reusing the targets cached in plz-out",
+    )
+    parser.add_argument(
+        "--scan-imports",
+        action="store_true",
+        help="Find imports in srcs with a fast scan, only parsing srcs in full when the scan is ambiguous",
+    )
+    parser.add_argument(
+        "--fs-snapshot",
+        action="store_true",
+        help="Walk the reporoot once, and look up import paths in the snapshot rather than with a stat per import",
+    )
+    parser.add_argument(
+        "--guess-targets-from-build-files",
+        action="store_true",
+        help="Find custom module targets from literal srcs in BUILD files, and only query plz for the rest",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the dependencies resolved in previous runs for targets whose inputs have not changed",
+    )
+    return
+
+
+def get_run_options(args: Namespace) -> dict[str, Any]:
+    """
+    :param args: parsed from a parser with `add_run_option_args`
+    :return: keyword arguments for `run`
+    """
+
+    return dict(
+        use_build_graph=args.use_build_graph,
+        batch_whatinputs=args.batch_whatinputs,
+        jobs=args.jobs,
+        use_import_cache=not args.no_import_cache,
+        use_third_party_targets_cache=not args.no_third_party_targets_cache,
+        scan_imports=args.scan_imports,
+        use_fs_snapshot=args.fs_snapshot,
+        guess_targets_from_build_files=args.guess_targets_from_build_files,
+        incremental=args.incremental,
+    )
+
+
 if __name__ == "__main__":
     import time
     from common.logger.logger import setup_logger
     from common.logger.notice_level import add_notice_logging_level, NOTICE
 
+    if sys.argv[1:2] == ["serve"]:
+        serve_parser = ArgumentParser(
+            prog=f"{os.path.basename(sys.argv[0])} serve",
+            description="Resolve dependencies for requests from clients (run with --server), keeping plz query "
+            "results warm between requests",
+        )
+        serve_parser.add_argument("--verbose", "-v", action="count", default=0)
+        serve_args = serve_parser.parse_args(sys.argv[2:])
+        os.environ["PYLLEMI_LOG_LEVEL"] = str(max(0, NOTICE - (10 * serve_args.verbose)))
+
+        add_notice_logging_level()
+        LOGGER = setup_logger(__file__)
+
+        os.chdir(get_reporoot())
+        serve(functools.partial(handle_server_request, state=ResolutionState(get_build_file_names())))
+        sys.exit(0)
+
+    if sys.argv[1:2] == ["watch"]:
+        watch_parser = ArgumentParser(
+            prog=f"{os.path.basename(sys.argv[0])} watch",
+            description="Resolve dependencies for targets in BUILD packages whenever their files change",
+        )
+        watch_parser.add_argument(
+            "build_pkg_dir",
+            type=existing_dir_arg_type,
+            nargs="+",
+            help="BUILD package directories (relative to reporoot)",
+        )
+        watch_parser.add_argument("--verbose", "-v", action="count", default=0)
+        add_run_option_args(watch_parser)
+        watch_args = watch_parser.parse_args(sys.argv[2:])
+        os.environ["PYLLEMI_LOG_LEVEL"] = str(max(0, NOTICE - (10 * watch_args.verbose)))
+
+        add_notice_logging_level()
+        LOGGER = setup_logger(__file__)
+
+        build_pkg_dirs = sorted(set(map(to_relative_path_from_reporoot, watch_args.build_pkg_dir)))
+        os.chdir(get_reporoot())
+        watch(build_pkg_dirs, get_run_options(watch_args))
+        sys.exit(0)
+
     parser = ArgumentParser()
 
     parser.add_argument(
         "build_pkg_dir",
         type=existing_dir_arg_type,
-        nargs="+",
+        nargs="*",
         help="BUILD package directories (relative to reporoot)",
     )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Instead of BUILD package directories, resolve every directory with Python modules in the repo",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_arg_type,
+        metavar="i/N",
+        help="Only resolve the i-th of N shards of the BUILD packages, e.g. to split --all across CI nodes",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="GIT_REV",
+        help="Instead of BUILD package directories, only resolve targets with srcs changed since the git revision",
+    )
     parser.add_argument("--verbose", "-v", action="count", default=0)
+    add_run_option_args(parser)
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Send the request to a running `serve` process, and only resolve in this process if none is running",
+    )
 
     args = parser.parse_args()
+    if sum([bool(args.build_pkg_dir), args.all, args.since is not None]) != 1:
+        parser.error("expected either BUILD package directories, --all, or --since")
     os.environ["PYLLEMI_LOG_LEVEL"] = str(max(0, NOTICE - (10 * args.verbose)))
 
     add_notice_logging_level()
     LOGGER = setup_logger(__file__)
 
+    if not args.server:
+        # `run` needs the plz config too, so query it while querying the reporoot.
+        async_query.run_concurrently(
+            async_query.get_reporoot(),
+            async_query.get_python_moduledir(),
+            async_query.get_build_file_names(),
+        )
+
     # Input sanitisation and change dir to reporoot
     build_pkg_dirs = list(map(to_relative_path_from_reporoot, set(args.build_pkg_dir)))
     os.chdir(get_reporoot())
 
+    srcs_to_resolve_by_build_pkg_dir = None
+    if args.since is not None:
+        srcs_to_resolve_by_build_pkg_dir = find_changed_build_pkgs(
+            get_changed_paths(args.since),
+            get_build_file_names(),
+        )
+        build_pkg_dirs = sorted(srcs_to_resolve_by_build_pkg_dir)
+
     LOGGER.debug(f"resolving imports for {{{', '.join(build_pkg_dirs)}}}; cwd: {os.getcwd()}")
 
+    run_options = get_run_options(args) | {
+        "srcs_to_resolve_by_build_pkg_dir_path": srcs_to_resolve_by_build_pkg_dir,
+        "all_build_pkgs": args.all,
+        "shard": args.shard,
+    }
+
     start_time = time.time()
-    run(build_pkg_dirs)
+    response = None
+    if args.server:
+        response = send_request(
+            {
+                "build_pkg_dirs": build_pkg_dirs,
+                "options": run_options
+                | {
+                    "srcs_to_resolve_by_build_pkg_dir_path": (
+                        None
+                        if srcs_to_resolve_by_build_pkg_dir is None
+                        else {
+                            build_pkg_dir: None if srcs_to_resolve is None else sorted(srcs_to_resolve)
+                            for build_pkg_dir, srcs_to_resolve in srcs_to_resolve_by_build_pkg_dir.items()
+                        }
+                    ),
+                },
+            }
+        )
+        if response is None:
+            LOGGER.info("No server is running; resolving in this process instead")
+
+    if response is None:
+        run(build_pkg_dirs, **run_options)
+    elif "error" in response:
+        LOGGER.error(f"Server failed to resolve dependencies: {response['error']}")
+        sys.exit(1)
+    elif response["modified_build_files"]:
+        # noinspection PyUnresolvedReferences
+        LOGGER.notice(f"📢 Modified BUILD files: {', '.join(response['modified_build_files'])}.")
+    else:
+        LOGGER.info(f"No BUILD files were modified. Your imports were 👌 already.")
     duration = time.time() - start_time
 
     LOGGER.debug(f"Dependency target resolution for {{{', '.join(build_pkg_dirs)}}} took {duration} seconds.")
@@ -1,8 +1,9 @@
 import ast
 import os.path
 from dataclasses import dataclass
-from typing import Collection, Iterator
+from typing import Collection, Iterator, Optional
 
+from adapters.os.fs_snapshot import FileSystemSnapshot
 from domain.python_import import enriched as enriched_import
 from domain.python_import.common import AST_IMPORT_NODE_TYPE
 from service.python_import.enriched import resolve_import_type
@@ -16,6 +17,9 @@ class ToEnrichedImports:
     # Required when import path takes form of <python_moduledir>.module, e.g. `import third_party.python3.numpy`
     python_moduledir: str
 
+    # If set, used instead of the filesystem to determine import types.
+    fs_snapshot: Optional[FileSystemSnapshot] = None
+
     def convert(self, node: AST_IMPORT_NODE_TYPE, *, pyfile_path: str = "") -> Iterator[list[enriched_import.Import]]:
         if isinstance(node, ast.Import):
             yield self._import_node(node)
@@ -47,7 +51,7 @@ class ToEnrichedImports:
             # TODO: use self._resolve_import_from_import_path_candidate
             import_path = alias.name
 
-            import_type = resolve_import_type(alias.name, self.python_moduledir)
+            import_type = resolve_import_type(alias.name, self.python_moduledir, self.fs_snapshot)
             if import_type == enriched_import.Type.THIRD_PARTY_MODULE:
                 import_path = import_path.removeprefix(f"{self.python_moduledir}.").split(".", maxsplit=1)[0]
 
@@ -151,7 +155,7 @@ class ToEnrichedImports:
         ]
 
     def _resolve_import_from_import_path_candidate(self, import_path_candidate: str) -> enriched_import.Import:
-        import_type = resolve_import_type(import_path_candidate, self.python_moduledir)
+        import_type = resolve_import_type(import_path_candidate, self.python_moduledir, self.fs_snapshot)
 
         if import_type == enriched_import.Type.THIRD_PARTY_MODULE:
             return enriched_import.Import(
@@ -1,17 +1,92 @@
 import ast
-from typing import Optional
+from collections import namedtuple
+from typing import Mapping, Optional
 
-from adapters.plz_cli.query import get_print
+from adapters.os.plz_glob import glob
+from adapters.plz_cli.query import get_build_file_names, get_print, get_print_by_target
 from domain.plz.rule.python import Python, Library, Test, Binary
 from domain.plz.rule.rule import Types
 from domain.plz.target.target import Target
 
+GlobArgs = namedtuple("GlobArgs", ["include", "exclude", "hidden"])
 
-def convert(node: ast.Call, build_pkg_dir: str) -> Python:
+# Arguments of `glob` which do not change the files it matches in a BUILD package which exists.
+_IGNORED_GLOB_KWARGS = frozenset({"allow_empty"})
+
+
+def get_srcs_query_target(node: ast.Call, build_pkg_dir: str) -> Optional[str]:
+    """
+    :param build_pkg_dir: Relative path from reporoot
+    :return: the target to query plz for the srcs of the Python rule with, if its srcs are neither a literal list nor
+        a glob which can be evaluated without plz.
+    """
+
+    if not isinstance(node.func, ast.Name) or node.func.id not in (Types.PYTHON_LIBRARY.value, Types.PYTHON_TEST.value):
+        return None
+
+    for keyword in node.keywords:
+        if keyword.arg == "srcs" and not isinstance(keyword.value, ast.List):
+            if get_glob_args(keyword.value) is not None or (name := _get_name(node)) is None:
+                return None
+            return _srcs_query_target(node.func.id, build_pkg_dir, name)
+    return None
+
+
+def query_srcs(srcs_query_targets: list[str]) -> dict[str, list[str]]:
+    """
+    Queries plz for the srcs of many Python rules at once, to pass to `convert` for each of them.
+
+    :param srcs_query_targets: from `get_srcs_query_target`
+    """
+
+    return get_print_by_target(srcs_query_targets, "srcs")
+
+
+def get_glob_args(node: ast.expr) -> Optional[GlobArgs]:
+    """
+    :return: the arguments of a `glob` call, if it is one with only literal arguments, which can be evaluated without
+        plz.
+    """
+
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name) or node.func.id != "glob":
+        return None
+
+    args_by_name: dict[str, ast.expr] = dict(zip(("include", "exclude", "hidden"), node.args))
+    if len(node.args) > len(args_by_name):
+        return None
+    for keyword in node.keywords:
+        if keyword.arg in _IGNORED_GLOB_KWARGS:
+            continue
+        if keyword.arg is None or keyword.arg in args_by_name:
+            return None
+        args_by_name[keyword.arg] = keyword.value
+
+    include = _get_literal_strs(args_by_name.pop("include", None))
+    exclude = _get_literal_strs(args_by_name.pop("exclude", ast.List(elts=[])))
+    hidden = args_by_name.pop("hidden", ast.Constant(value=False))
+    if (
+        include is None
+        or exclude is None
+        or not isinstance(hidden, ast.Constant)
+        or not isinstance(hidden.value, bool)
+        or len(args_by_name) > 0
+    ):
+        return None
+    return GlobArgs(include=include, exclude=exclude, hidden=hidden.value)
+
+
+def convert(
+    node: ast.Call,
+    build_pkg_dir: str,
+    srcs_by_srcs_query_target: Optional[Mapping[str, list[str]]] = None,
+) -> Python:
     """
 
     :param node:
     :param build_pkg_dir: Relative path from reporoot
+    :param srcs_by_srcs_query_target: srcs already queried with `query_srcs`. If the srcs of the rule are not a
+        literal list, they are found by evaluating them if they are a glob, then from these, and otherwise by querying
+        plz.
     :return: Domain repr of Python Rule
     """
 
@@ -35,16 +110,7 @@ def convert(node: ast.Call, build_pkg_dir: str) -> Python:
     deps: set[str] = set()
 
     if node.func.id == Types.PYTHON_LIBRARY.value:
-        # Extract target name.
-        if len(node.args) > 0:
-            name_as_arg = node.args[0]
-            if isinstance(name_as_arg, ast.Constant):
-                name = name_as_arg.value
-        for keyword in node.keywords:
-            if name is None and keyword.arg == "name" and isinstance(keyword.value, ast.Constant):
-                name = keyword.value.value
-
-        if name is None:
+        if (name := _get_name(node)) is None:
             raise ValueError(f"could not compute name of target in {build_pkg_dir}")
 
         # Extract srcs and deps.
@@ -57,8 +123,7 @@ def convert(node: ast.Call, build_pkg_dir: str) -> Python:
                     srcs.add(elt.value)
 
             elif keyword.arg == "srcs":
-                build_target_path = Target(f"//{build_pkg_dir}:{name}")
-                srcs |= set(get_print(str(build_target_path), "srcs"))
+                srcs |= set(_get_srcs(node.func.id, build_pkg_dir, name, keyword.value, srcs_by_srcs_query_target))
 
             elif keyword.arg == "deps" and isinstance(keyword.value, ast.List):
                 for elt in keyword.value.elts:
@@ -70,16 +135,7 @@ def convert(node: ast.Call, build_pkg_dir: str) -> Python:
         return Library(name=name, deps=deps, srcs=srcs)
 
     if node.func.id == Types.PYTHON_TEST.value:
-        # Extract target name.
-        if len(node.args) > 0:
-            name_as_arg = node.args[0]
-            if isinstance(name_as_arg, ast.Constant):
-                name = name_as_arg.value
-        for keyword in node.keywords:
-            if name is None and keyword.arg == "name" and isinstance(keyword.value, ast.Constant):
-                name = keyword.value.value
-
-        if name is None:
+        if (name := _get_name(node)) is None:
             raise ValueError(f"could not compute name of target in {build_pkg_dir}")
 
         # Extract srcs and deps.
@@ -92,8 +148,7 @@ def convert(node: ast.Call, build_pkg_dir: str) -> Python:
                     srcs.add(elt.value)
 
             elif keyword.arg == "srcs":
-                build_target_path = Target(f"//{build_pkg_dir}:{name}")
-                srcs |= set(get_print(build_target_path.with_tag("lib"), "srcs"))
+                srcs |= set(_get_srcs(node.func.id, build_pkg_dir, name, keyword.value, srcs_by_srcs_query_target))
 
             elif keyword.arg == "deps" and isinstance(keyword.value, ast.List):
                 for elt in keyword.value.elts:
@@ -130,3 +185,53 @@ def convert(node: ast.Call, build_pkg_dir: str) -> Python:
                     deps.add(elt.value)
 
         return Binary(name=name, deps=deps, main=main)
+
+
+def _get_name(node: ast.Call) -> Optional[str]:
+    if len(node.args) > 0 and isinstance(node.args[0], ast.Constant):
+        return node.args[0].value
+    for keyword in node.keywords:
+        if keyword.arg == "name" and isinstance(keyword.value, ast.Constant):
+            return keyword.value.value
+    return None
+
+
+def _srcs_query_target(func_id: str, build_pkg_dir: str, name: str) -> str:
+    build_target_path = Target(f"//{build_pkg_dir}:{name}")
+    if func_id == Types.PYTHON_TEST.value:
+        return build_target_path.with_tag("lib")
+    return str(build_target_path)
+
+
+def _get_srcs(
+    func_id: str,
+    build_pkg_dir: str,
+    name: str,
+    srcs_node: ast.expr,
+    srcs_by_srcs_query_target: Optional[Mapping[str, list[str]]],
+) -> list[str]:
+    if (glob_args := get_glob_args(srcs_node)) is not None:
+        try:
+            return glob(
+                build_pkg_dir,
+                glob_args.include,
+                glob_args.exclude,
+                build_file_names=get_build_file_names(),
+                hidden=glob_args.hidden,
+            )
+        except OSError:
+            # Leave plz to report the error.
+            pass
+
+    srcs_query_target = _srcs_query_target(func_id, build_pkg_dir, name)
+    if srcs_by_srcs_query_target is not None and (srcs := srcs_by_srcs_query_target.get(srcs_query_target)) is not None:
+        return srcs
+    return get_print(srcs_query_target, "srcs")
+
+
+def _get_literal_strs(node: Optional[ast.expr]) -> Optional[list[str]]:
+    if not isinstance(node, ast.List):
+        return None
+    if not all(isinstance(elt, ast.Constant) and isinstance(elt.value, str) for elt in node.elts):
+        return None
+    return [elt.value for elt in node.elts]
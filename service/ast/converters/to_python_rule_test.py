@@ -2,7 +2,8 @@ import ast
 from unittest import TestCase, mock
 
 from domain.plz.rule.python import Library, Test, Binary
-from service.ast.converters.to_python_rule import convert
+from service.ast.converters.to_python_rule import convert, get_glob_args, get_srcs_query_target, GlobArgs
+from utils.mock_python_library_test_case import MockPythonLibraryTestCase
 
 
 class ToPythonRuleTest(TestCase):
@@ -33,7 +34,7 @@ class ToPythonRuleTest(TestCase):
     @mock.patch("service.ast.converters.to_python_rule.get_print")
     def test_fetches_srcs_via_plz_query_if_srcs_is_not_list(self, mock_plz_query_print: mock.MagicMock):
         with self.subTest("python_library"):
-            input_ast_node = ast.parse("python_library(name='target', srcs=glob(['*.py'], exclude=['*_test.py']))")
+            input_ast_node = ast.parse("python_library(name='target', srcs=SRCS)")
             mock_plz_query_print.return_value = ["__init__.py", "module.py"]
             self.assertEqual(
                 Library(name="target", srcs={"__init__.py", "module.py"}, deps=set()),
@@ -44,7 +45,7 @@ class ToPythonRuleTest(TestCase):
         mock_plz_query_print.reset_mock()
 
         with self.subTest("python_test"):
-            input_ast_node = ast.parse("python_test(name='test', srcs=glob(['*_test.py']))")
+            input_ast_node = ast.parse("python_test(name='test', srcs=glob(TEST_SRCS))")
             mock_plz_query_print.return_value = ["module_test.py"]
             self.assertEqual(
                 Test(name="test", srcs={"module_test.py"}, deps=set()),
@@ -53,6 +54,51 @@ class ToPythonRuleTest(TestCase):
             mock_plz_query_print.assert_called_once_with("//path/to:_test#lib", "srcs")
         return
 
+    @mock.patch("service.ast.converters.to_python_rule.get_print")
+    def test_uses_queried_srcs_if_srcs_is_not_list(self, mock_plz_query_print: mock.MagicMock):
+        input_ast_node = ast.parse("python_test(name='test', srcs=glob(TEST_SRCS))")
+        self.assertEqual(
+            Test(name="test", srcs={"module_test.py"}, deps=set()),
+            convert(input_ast_node.body[0].value, "path/to", {"//path/to:_test#lib": ["module_test.py"]}),
+        )
+        mock_plz_query_print.assert_not_called()
+        return
+
+    def test_get_srcs_query_target(self):
+        for code, expected_srcs_query_target in [
+            ("python_library(name='lib', srcs=SRCS)", "//path/to:lib"),
+            ("python_library('to', srcs=glob(['*.py']) + [':gen'])", "//path/to"),
+            ("python_test(name='test', srcs=glob(TEST_SRCS))", "//path/to:_test#lib"),
+            ("python_library(name='lib', srcs=glob(['*.py'], exclude=['*_test.py']))", None),
+            ("python_library(name='lib', srcs=['lib.py'])", None),
+            ("python_binary(name='bin', main='main.py')", None),
+            ("filegroup(name='files', srcs=glob(['*.py']))", None),
+        ]:
+            with self.subTest(code):
+                self.assertEqual(
+                    expected_srcs_query_target,
+                    get_srcs_query_target(ast.parse(code).body[0].value, "path/to"),
+                )
+        return
+
+    def test_get_glob_args(self):
+        for code, expected_glob_args in [
+            ("glob(['*.py'])", GlobArgs(include=["*.py"], exclude=[], hidden=False)),
+            ("glob(['*.py'], ['*_test.py'])", GlobArgs(include=["*.py"], exclude=["*_test.py"], hidden=False)),
+            (
+                "glob(include=['**/*.py'], exclude=['*_test.py'], hidden=True, allow_empty=True)",
+                GlobArgs(include=["**/*.py"], exclude=["*_test.py"], hidden=True),
+            ),
+            ("glob(SRCS)", None),
+            ("glob(['*.py'], exclude=EXCLUDE)", None),
+            ("glob(['*.py'], include_symlinks=False)", None),
+            ("glob(['*.py'], include=['*.pyi'])", None),
+            ("subinclude(['*.py'])", None),
+        ]:
+            with self.subTest(code):
+                self.assertEqual(expected_glob_args, get_glob_args(ast.parse(code).body[0].value))
+        return
+
     def test_errors_if_not_ast_call(self):
         self.assertRaisesRegex(
             TypeError,
@@ -72,3 +118,16 @@ class ToPythonRuleTest(TestCase):
             "//does/not:matter",
         )
         return
+
+
+class ToPythonRuleGlobTest(MockPythonLibraryTestCase):
+    @mock.patch("service.ast.converters.to_python_rule.get_build_file_names", mock.MagicMock(return_value=["BUILD"]))
+    @mock.patch("service.ast.converters.to_python_rule.get_print")
+    def test_evaluates_glob_srcs(self, mock_plz_query_print: mock.MagicMock):
+        input_ast_node = ast.parse("python_library(name='lib', srcs=glob(['**/*.py'], exclude=['*_test.py']))")
+        self.assertEqual(
+            Library(name="lib", srcs={"test_module_0.py"}, deps=set()),
+            convert(input_ast_node.body[0].value, self.test_dir, {f"//{self.test_dir}:lib": ["stale.py"]}),
+        )
+        mock_plz_query_print.assert_not_called()
+        return
@@ -0,0 +1,66 @@
+from typing import Callable, Optional
+
+from adapters.plz_cli.query import get_whatinputs_by_path, WhatInputsByPathResult
+from common.logger.logger import setup_logger
+from domain.plz.target.target import Target
+from service.dependency.resolver import PartiallyResolvedDeps
+
+
+class WhatInputsBatch:
+    """
+    Collects the partially resolved dependencies of targets across any number of BUILD packages, so that all of their
+    custom module dependencies can be resolved with a single, deduplicated `plz query whatinputs` call.
+
+    Usage::
+
+        batch = WhatInputsBatch()
+        for target, srcs in targets_to_resolve:
+            batch.add(target, dependency_resolver.collect_deps_for_srcs(target, srcs))
+        deps_by_target = batch.resolve()
+
+    """
+
+    def __init__(self, whatinputs_by_path_fn: Optional[Callable[[list[str]], WhatInputsByPathResult]] = None):
+        self._logger = setup_logger(__name__)
+        self._whatinputs_by_path_fn = whatinputs_by_path_fn
+        self._partially_resolved_deps_by_target: dict[Target, PartiallyResolvedDeps] = {}
+        return
+
+    def add(self, plz_target: Target, partially_resolved_deps: PartiallyResolvedDeps) -> None:
+        if plz_target in self._partially_resolved_deps_by_target:
+            raise ValueError(f"programming error: {plz_target} has already been added to the batch")
+        self._partially_resolved_deps_by_target[plz_target] = partially_resolved_deps
+        return
+
+    def resolve(self) -> dict[Target, set[Target]]:
+        whatinputs_inputs: set[str] = set()
+        for partially_resolved_deps in self._partially_resolved_deps_by_target.values():
+            whatinputs_inputs |= partially_resolved_deps.whatinputs_inputs
+
+        plz_targets_by_path: dict[str, set[str]] = {}
+        if len(whatinputs_inputs) > 0:
+            self._logger.debug(f"running whatinputs on {len(whatinputs_inputs)} inputs for the whole batch")
+            whatinputs_by_path_fn = (
+                get_whatinputs_by_path if self._whatinputs_by_path_fn is None else self._whatinputs_by_path_fn
+            )
+            # Sorted so that the query is deterministic across runs.
+            whatinputs_result = whatinputs_by_path_fn(sorted(whatinputs_inputs))
+            if len(whatinputs_result.targetless_paths) > 0:
+                self._logger.error(
+                    f"Could not find targets for imports: {', '.join(sorted(whatinputs_result.targetless_paths))}"
+                )
+            plz_targets_by_path = whatinputs_result.plz_targets_by_path
+
+        deps_by_target: dict[Target, set[Target]] = {}
+        for plz_target, partially_resolved_deps in self._partially_resolved_deps_by_target.items():
+            deps = set(partially_resolved_deps.plz_targets)
+            for whatinputs_input in partially_resolved_deps.whatinputs_inputs:
+                deps |= set(map(Target, plz_targets_by_path.get(whatinputs_input, set())))
+
+            # Remove "self-dependency" cycles.
+            deps.discard(plz_target)
+            deps_by_target[plz_target] = deps
+        return deps_by_target
+
+    def __len__(self) -> int:
+        return len(self._partially_resolved_deps_by_target)
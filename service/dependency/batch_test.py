@@ -0,0 +1,61 @@
+from unittest import mock, TestCase
+
+from adapters.plz_cli.query import WhatInputsByPathResult
+from domain.plz.target.target import Target
+from service.dependency.batch import WhatInputsBatch
+from service.dependency.resolver import PartiallyResolvedDeps
+
+
+class TestWhatInputsBatch(TestCase):
+    def test_resolves_all_targets_with_single_query(self):
+        mock_whatinputs_by_path = mock.MagicMock()
+        mock_whatinputs_by_path.return_value = WhatInputsByPathResult(
+            {
+                "custom/module.py": {"//custom:target"},
+                "pkg_a/module.py": {"//pkg_a:a"},
+            },
+            {"nowhere/module.py"},
+        )
+
+        batch = WhatInputsBatch(mock_whatinputs_by_path)
+        batch.add(
+            Target("//pkg_a:a"),
+            PartiallyResolvedDeps(
+                {Target("//third_party/python3:colorama")},
+                frozenset({"custom/module.py", "pkg_a/module.py"}),
+            ),
+        )
+        batch.add(
+            Target("//pkg_b:b"),
+            PartiallyResolvedDeps(set(), frozenset({"custom/module.py", "pkg_a/module.py", "nowhere/module.py"})),
+        )
+        batch.add(Target("//pkg_c:c"), PartiallyResolvedDeps({Target("//pkg_a:a")}, frozenset()))
+
+        self.assertEqual(3, len(batch))
+        self.assertEqual(
+            {
+                # Self-dependency is removed.
+                Target("//pkg_a:a"): {Target("//third_party/python3:colorama"), Target("//custom:target")},
+                Target("//pkg_b:b"): {Target("//custom:target"), Target("//pkg_a:a")},
+                Target("//pkg_c:c"): {Target("//pkg_a:a")},
+            },
+            batch.resolve(),
+        )
+        mock_whatinputs_by_path.assert_called_once_with(["custom/module.py", "nowhere/module.py", "pkg_a/module.py"])
+        return
+
+    def test_does_not_query_without_whatinputs_inputs(self):
+        mock_whatinputs_by_path = mock.MagicMock()
+
+        batch = WhatInputsBatch(mock_whatinputs_by_path)
+        batch.add(Target("//pkg_a:a"), PartiallyResolvedDeps({Target("//pkg_b:b")}, frozenset()))
+
+        self.assertEqual({Target("//pkg_a:a"): {Target("//pkg_b:b")}}, batch.resolve())
+        mock_whatinputs_by_path.assert_not_called()
+        return
+
+    def test_errors_when_target_added_twice(self):
+        batch = WhatInputsBatch(mock.MagicMock())
+        batch.add(Target("//pkg_a:a"), PartiallyResolvedDeps(set(), frozenset()))
+        self.assertRaises(ValueError, batch.add, Target("//pkg_a:a"), PartiallyResolvedDeps(set(), frozenset()))
+        return
@@ -0,0 +1,213 @@
+import ast
+import copy
+import os
+from typing import Callable, Collection, Optional
+
+import service.ast.converters.to_python_rule
+from adapters.plz_cli.query import (
+    get_whatinputs,
+    get_whatinputs_by_path,
+    WhatInputsByPathResult,
+    WhatInputsResult,
+)
+from common.logger.logger import setup_logger
+from domain.plz.target.target import Target
+from domain.targets.utils import is_ast_node_python_build_rule
+
+
+class BUILDFileSrcsIndex:
+    """
+    Finds the targets of srcs by reading the BUILD files of the packages they belong to, without invoking plz.
+
+    A src belongs to the BUILD package of its nearest ancestor directory with a BUILD file, and is resolved to any
+    Python target in that package which declares it literally in its `srcs` (or as its `main`). Srcs which are not
+    declared literally (e.g. those matched by a `glob`, or srcs of non-Python rules) are passed on to the fallback,
+    which by default is `plz query whatinputs`.
+    """
+
+    def __init__(
+        self,
+        build_file_names: Collection[str],
+        fallback: Callable[[list[str]], WhatInputsResult] = get_whatinputs,
+        fallback_by_path: Callable[[list[str]], WhatInputsByPathResult] = get_whatinputs_by_path,
+    ):
+        self._logger = setup_logger(__name__)
+        self._build_file_names = build_file_names
+        self._fallback = fallback
+        self._fallback_by_path = fallback_by_path
+
+        self._pkg_dir_by_dir_path: dict[str, Optional[str]] = {}
+        self._plz_targets_by_src_by_pkg_dir: dict[str, dict[str, set[str]]] = {}
+        # Of the BUILD files which have been indexed, to tell which have changed since.
+        self._build_file_stats_by_pkg_dir: dict[str, Optional[tuple[str, int]]] = {}
+        return
+
+    def with_fallback(
+        self,
+        fallback: Callable[[list[str]], WhatInputsResult],
+        fallback_by_path: Callable[[list[str]], WhatInputsByPathResult],
+    ) -> "BUILDFileSrcsIndex":
+        """
+        :return: an index which shares everything indexed so far with this one, but falls back to other functions.
+        """
+
+        index = copy.copy(self)
+        index._fallback = fallback
+        index._fallback_by_path = fallback_by_path
+        return index
+
+    def clear_stale(self) -> None:
+        """
+        For long-lived processes: forgets the srcs of BUILD packages whose BUILD files have been added, removed or
+        changed since they were read, and which BUILD package each directory belongs to, as BUILD files may have been
+        added or removed anywhere.
+        """
+
+        self._pkg_dir_by_dir_path.clear()
+        for pkg_dir, build_file_stat in list(self._build_file_stats_by_pkg_dir.items()):
+            if self._stat_build_file(pkg_dir) != build_file_stat:
+                self._logger.debug(f"The BUILD file in {pkg_dir or 'the reporoot'} has changed")
+                del self._plz_targets_by_src_by_pkg_dir[pkg_dir]
+                del self._build_file_stats_by_pkg_dir[pkg_dir]
+        return
+
+    def get(self, path: str) -> set[str]:
+        """
+        :param path: relative to reporoot
+        :return: plz targets with the path as a literal src; empty if there are none.
+        """
+
+        if (pkg_dir := self._find_pkg_dir(os.path.dirname(os.path.normpath(path)))) is None:
+            return set()
+
+        if (plz_targets_by_src := self._plz_targets_by_src_by_pkg_dir.get(pkg_dir)) is None:
+            plz_targets_by_src = self._index_literal_srcs(pkg_dir)
+            self._plz_targets_by_src_by_pkg_dir[pkg_dir] = plz_targets_by_src
+
+        src = os.path.relpath(path, pkg_dir) if pkg_dir else os.path.normpath(path)
+        return plz_targets_by_src.get(src, set())
+
+    def whatinputs(self, paths: Collection[str]) -> WhatInputsResult:
+        """
+        Drop-in replacement for `get_whatinputs`.
+        """
+
+        plz_targets: set[str] = set()
+        unresolved_paths: list[str] = []
+        for path in paths:
+            if not (plz_targets_for_path := self.get(path)):
+                unresolved_paths.append(path)
+                continue
+            plz_targets |= plz_targets_for_path
+
+        if len(unresolved_paths) == 0:
+            return WhatInputsResult(plz_targets, set())
+
+        self._logger.debug(f"Could not find {unresolved_paths} as literal srcs; falling back to plz whatinputs")
+        fallback_result = self._fallback(unresolved_paths)
+        return WhatInputsResult(plz_targets | fallback_result.plz_targets, fallback_result.targetless_paths)
+
+    def whatinputs_by_path(self, paths: Collection[str]) -> WhatInputsByPathResult:
+        """
+        Drop-in replacement for `get_whatinputs_by_path`.
+        """
+
+        plz_targets_by_path: dict[str, set[str]] = {}
+        unresolved_paths: list[str] = []
+        for path in paths:
+            if not (plz_targets_for_path := self.get(path)):
+                unresolved_paths.append(path)
+                continue
+            plz_targets_by_path[path] = set(plz_targets_for_path)
+
+        if len(unresolved_paths) == 0:
+            return WhatInputsByPathResult(plz_targets_by_path, set())
+
+        self._logger.debug(f"Could not find {unresolved_paths} as literal srcs; falling back to plz whatinputs")
+        fallback_result = self._fallback_by_path(unresolved_paths)
+        return WhatInputsByPathResult(
+            plz_targets_by_path | fallback_result.plz_targets_by_path,
+            fallback_result.targetless_paths,
+        )
+
+    def _find_pkg_dir(self, dir_path: str) -> Optional[str]:
+        dir_path = "" if dir_path == os.curdir else dir_path
+        visited_dir_paths: list[str] = []
+        pkg_dir: Optional[str] = None
+        while True:
+            if dir_path in self._pkg_dir_by_dir_path:
+                pkg_dir = self._pkg_dir_by_dir_path[dir_path]
+                break
+
+            visited_dir_paths.append(dir_path)
+            if self._find_build_file(dir_path) is not None:
+                pkg_dir = dir_path
+                break
+
+            if dir_path == "":
+                break
+            dir_path = os.path.dirname(dir_path)
+
+        for visited_dir_path in visited_dir_paths:
+            self._pkg_dir_by_dir_path[visited_dir_path] = pkg_dir
+        return pkg_dir
+
+    def _find_build_file(self, dir_path: str) -> Optional[str]:
+        for build_file_name in self._build_file_names:
+            if os.path.isfile(path := os.path.join(dir_path, build_file_name)):
+                return path
+        return None
+
+    def _stat_build_file(self, pkg_dir: str) -> Optional[tuple[str, int]]:
+        if (build_file_path := self._find_build_file(pkg_dir)) is None:
+            return None
+        try:
+            return build_file_path, os.stat(build_file_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _index_literal_srcs(self, pkg_dir: str) -> dict[str, set[str]]:
+        # Before reading, so that changes made while it is being read are picked up by `clear_stale`.
+        build_file_stat = self._build_file_stats_by_pkg_dir[pkg_dir] = self._stat_build_file(pkg_dir)
+        if build_file_stat is None:
+            return {}
+
+        build_file_path, _ = build_file_stat
+
+        try:
+            with open(build_file_path, "r") as build_file:
+                build_file_ast = ast.parse(build_file.read(), build_file_path)
+        except (OSError, SyntaxError) as e:
+            self._logger.debug(f"Could not parse {build_file_path}; its srcs will be resolved with plz: {e}")
+            return {}
+
+        plz_targets_by_src: dict[str, set[str]] = {}
+        # Not a BUILDFile, which logs for every BUILD file it is constructed for.
+        for node in ast.walk(build_file_ast):
+            if not is_ast_node_python_build_rule(node) or not _has_literal_srcs(node):
+                continue
+
+            try:
+                python_target = service.ast.converters.to_python_rule.convert(node, pkg_dir)
+            except ValueError as e:
+                self._logger.debug(f"Skipping Python target in {build_file_path}: {e}")
+                continue
+
+            if python_target["name"] is None:
+                continue
+
+            plz_target = Target(f"//{pkg_dir}:{python_target['name']}").canonicalise()
+            for src in python_target["srcs"] or [python_target["main"]]:
+                if not isinstance(src, str) or src.startswith(":") or src.startswith("//"):
+                    # Skip build labels; those are outputs of other targets.
+                    continue
+                plz_targets_by_src.setdefault(os.path.normpath(src), set()).add(plz_target)
+
+        return plz_targets_by_src
+
+
+def _has_literal_srcs(node: ast.Call) -> bool:
+    for keyword in node.keywords:
+        if keyword.arg == "srcs" and not isinstance(keyword.value, ast.List):
+            return False
+    return True
@@ -0,0 +1,114 @@
+import os
+from unittest import mock
+
+from adapters.plz_cli.query import WhatInputsByPathResult, WhatInputsResult
+from service.dependency.build_file_index import BUILDFileSrcsIndex
+from utils.mock_python_library_test_case import MockPythonLibraryTestCase
+
+
+class TestBUILDFileSrcsIndex(MockPythonLibraryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        with open(self.package_build_file, "w") as f:
+            f.write(
+                "\n".join(
+                    [
+                        'python_library(name="lib", srcs=["test_module_0.py", "nested/module.py", ":generated"])',
+                        'python_library(name="globbed", srcs=glob(["*.py"]))',
+                        'python_binary(name="bin", main="main.py")',
+                    ]
+                )
+            )
+        self.mock_fallback = mock.MagicMock(return_value=WhatInputsResult({"//fallback:target"}, set()))
+        self.mock_fallback_by_path = mock.MagicMock(
+            return_value=WhatInputsByPathResult({"does/not/matter.py": {"//fallback:target"}}, set()),
+        )
+        self.index = BUILDFileSrcsIndex(
+            {"BUILD"},
+            fallback=self.mock_fallback,
+            fallback_by_path=self.mock_fallback_by_path,
+        )
+        return
+
+    @mock.patch("service.ast.converters.to_python_rule.get_print")
+    def test_get(self, mock_get_print: mock.MagicMock):
+        with self.subTest("literal srcs"):
+            self.assertEqual({f"//{self.test_dir}:lib"}, self.index.get(self.package_module))
+        with self.subTest("literal srcs in subdirectory without BUILD file"):
+            self.assertEqual(
+                {f"//{self.test_dir}:lib"},
+                self.index.get(os.path.join(self.test_dir, "nested", "module.py")),
+            )
+        with self.subTest("python_binary main"):
+            self.assertEqual({f"//{self.test_dir}:bin"}, self.index.get(os.path.join(self.test_dir, "main.py")))
+        with self.subTest("python_test in subpackage"):
+            self.assertEqual(
+                {f"//{self.subpackage_dir}:test_subpackage"},
+                self.index.get(self.subpackage_module),
+            )
+        with self.subTest("src not declared literally"):
+            self.assertEqual(set(), self.index.get(os.path.join(self.test_dir, "globbed.py")))
+        with self.subTest("src in another BUILD package"):
+            self.assertEqual(set(), self.index.get(os.path.join(self.subpackage_dir, "nested", "module.py")))
+
+        # Globbed srcs must not be expanded with plz.
+        mock_get_print.assert_not_called()
+        return
+
+    def test_whatinputs(self):
+        self.assertEqual(
+            WhatInputsResult({f"//{self.test_dir}:lib", "//fallback:target"}, set()),
+            self.index.whatinputs([self.package_module, globbed := os.path.join(self.test_dir, "globbed.py")]),
+        )
+        self.mock_fallback.assert_called_once_with([globbed])
+        return
+
+    def test_whatinputs_without_fallback(self):
+        self.assertEqual(
+            WhatInputsResult({f"//{self.test_dir}:lib", f"//{self.subpackage_dir}:test_subpackage"}, set()),
+            self.index.whatinputs([self.package_module, self.subpackage_module]),
+        )
+        self.mock_fallback.assert_not_called()
+        return
+
+    def test_whatinputs_by_path(self):
+        self.assertEqual(
+            WhatInputsByPathResult(
+                {
+                    self.package_module: {f"//{self.test_dir}:lib"},
+                    "does/not/matter.py": {"//fallback:target"},
+                },
+                set(),
+            ),
+            self.index.whatinputs_by_path([self.package_module, "does/not/matter.py"]),
+        )
+        self.mock_fallback_by_path.assert_called_once_with(["does/not/matter.py"])
+        return
+
+    def test_clear_stale_reads_changed_build_files_again(self):
+        self.assertEqual({f"//{self.test_dir}:lib"}, self.index.get(self.package_module))
+        self.assertEqual({f"//{self.subpackage_dir}:test_subpackage"}, self.index.get(self.subpackage_module))
+
+        with open(self.package_build_file, "w") as f:
+            f.write('python_library(name="renamed", srcs=["test_module_0.py"])')
+        # Don't rely on the mtime resolution of the filesystem.
+        os.utime(self.package_build_file, ns=(0, 0))
+        self.index.clear_stale()
+
+        with mock.patch("service.dependency.build_file_index.open", wraps=open) as mock_open:
+            self.assertEqual({f"//{self.test_dir}:renamed"}, self.index.get(self.package_module))
+            self.assertEqual({f"//{self.subpackage_dir}:test_subpackage"}, self.index.get(self.subpackage_module))
+            mock_open.assert_called_once_with(self.package_build_file, "r")
+        return
+
+    def test_with_fallback_shares_index(self):
+        self.index.get(self.package_module)
+        mock_fallback = mock.MagicMock(return_value=WhatInputsResult(set(), set()))
+        index = self.index.with_fallback(mock_fallback, self.mock_fallback_by_path)
+
+        with mock.patch("service.dependency.build_file_index.open", wraps=open) as mock_open:
+            index.whatinputs([self.package_module, globbed := os.path.join(self.test_dir, "globbed.py")])
+            mock_open.assert_not_called()
+        mock_fallback.assert_called_once_with([globbed])
+        self.mock_fallback.assert_not_called()
+        return
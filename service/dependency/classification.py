@@ -0,0 +1,98 @@
+from collections import namedtuple
+from enum import IntEnum, unique
+from typing import Collection, Optional
+
+from common.logger.logger import setup_logger
+from domain.plz.target.target import Target
+
+LOGGER = setup_logger(__name__)
+
+
+@unique
+class ImportKind(IntEnum):
+    # Neither stdlib nor a known third-party or namespace package, so its target has to be queried.
+    LOCAL = 0
+    STDLIB = 1
+    THIRD_PARTY = 2
+    NAMESPACE = 3
+
+
+ImportClassification = namedtuple("ImportClassification", ["kind", "target", "prefix"])
+
+_LOCAL = ImportClassification(ImportKind.LOCAL, None, "")
+
+
+class _Entry:
+    __slots__ = ("classification", "children")
+
+    def __init__(self):
+        self.classification: Optional[ImportClassification] = None
+        self.children: dict[str, _Entry] = {}
+        return
+
+
+class ImportClassificationTable:
+    """
+    Maps import path prefixes to how imports under them are resolved, so that classifying an import takes a single
+    longest-prefix lookup. Only depends on the config, so should be shared between the dependency resolvers of BUILD
+    packages with the same config.
+
+    Stdlib and third-party modules are classified by their top-level module name, and take precedence over known
+    namespace packages beneath them.
+    """
+
+    def __init__(
+        self,
+        *,
+        python_moduledir: str,
+        std_lib_modules: Collection[str],
+        available_third_party_module_targets: Collection[str],
+        namespace_to_target: dict[str, Target],
+    ):
+        self._root = _Entry()
+
+        for namespace, target in namespace_to_target.items():
+            self._add(namespace, ImportKind.NAMESPACE, target)
+
+        third_party_target_prefix = f"//{python_moduledir}:".replace(".", "/")
+        for third_party_module_target in available_third_party_module_targets:
+            if third_party_module_target.startswith(third_party_target_prefix):
+                self._add_top_level(
+                    third_party_module_target.removeprefix(third_party_target_prefix),
+                    ImportKind.THIRD_PARTY,
+                    Target(third_party_module_target),
+                )
+
+        for std_lib_module in std_lib_modules:
+            self._add_top_level(std_lib_module, ImportKind.STDLIB, None)
+        return
+
+    def classify(self, import_path: str) -> ImportClassification:
+        classification = _LOCAL
+        entry = self._root
+        for module_name in import_path.split("."):
+            if (entry := entry.children.get(module_name)) is None:
+                break
+            if entry.classification is not None:
+                classification = entry.classification
+        return classification
+
+    def _add(self, import_path: str, kind: ImportKind, target: Optional[Target]) -> _Entry:
+        entry = self._root
+        for module_name in import_path.split("."):
+            if (child := entry.children.get(module_name)) is None:
+                child = entry.children[module_name] = _Entry()
+            entry = child
+        entry.classification = ImportClassification(kind, target, import_path)
+        return entry
+
+    def _add_top_level(self, module_name: str, kind: ImportKind, target: Optional[Target]) -> None:
+        if "." in module_name:
+            # Can never be the top-level module name of an import.
+            return
+
+        entry = self._add(module_name, kind, target)
+        if entry.children:
+            LOGGER.debug(f"Known namespace packages under {kind.name.lower()} module '{module_name}' will be ignored")
+            entry.children.clear()
+        return
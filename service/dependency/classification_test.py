@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from domain.plz.target.target import Target
+from service.dependency.classification import ImportClassification, ImportClassificationTable, ImportKind
+
+
+class TestImportClassificationTable(TestCase):
+    def setUp(self) -> None:
+        self.table = ImportClassificationTable(
+            python_moduledir="third_party.python3",
+            std_lib_modules={"os", "json"},
+            available_third_party_module_targets={
+                "//third_party/python3:colorama",
+                "//third_party/python3:google",
+                "//elsewhere:requests",
+            },
+            namespace_to_target={
+                "google.protobuf": Target("//third_party/python3:protobuf"),
+                "json.custom": Target("//json:custom"),
+                "company.lib": Target("//company:lib"),
+                "company.lib.sub": Target("//company/lib:sub"),
+            },
+        )
+        return
+
+    def test_classifies_stdlib_modules(self):
+        self.assertEqual(ImportClassification(ImportKind.STDLIB, None, "os"), self.table.classify("os.path"))
+        self.assertEqual(ImportKind.STDLIB, self.table.classify("json.custom").kind)
+        return
+
+    def test_classifies_third_party_modules(self):
+        self.assertEqual(
+            ImportClassification(ImportKind.THIRD_PARTY, Target("//third_party/python3:colorama"), "colorama"),
+            self.table.classify("colorama.ansi"),
+        )
+        # Third-party modules take precedence over namespace packages within them.
+        self.assertEqual(ImportKind.THIRD_PARTY, self.table.classify("google.protobuf").kind)
+        # Only targets in the moduledir are third-party modules.
+        self.assertEqual(ImportKind.LOCAL, self.table.classify("requests").kind)
+        return
+
+    def test_classifies_namespace_pkgs_by_longest_prefix(self):
+        self.assertEqual(
+            ImportClassification(ImportKind.NAMESPACE, Target("//company:lib"), "company.lib"),
+            self.table.classify("company.lib.module"),
+        )
+        self.assertEqual(Target("//company/lib:sub"), self.table.classify("company.lib.sub.module").target)
+        return
+
+    def test_classifies_other_modules_as_local(self):
+        self.assertEqual(ImportClassification(ImportKind.LOCAL, None, ""), self.table.classify("company.other"))
+        self.assertEqual(ImportKind.LOCAL, self.table.classify("company").kind)
+        return
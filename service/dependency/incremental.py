@@ -0,0 +1,107 @@
+import hashlib
+import os
+from typing import Callable, Collection, Optional
+
+from adapters.os.run_manifest import ManifestEntry, RunManifest
+from common.logger.logger import setup_logger
+from common.version import PYLLEMI_VERSION
+from domain.plz.target.target import Target
+
+
+def new_run_fingerprint(python_moduledir: str, third_party_module_targets: Collection[str]) -> str:
+    """
+    :return: hash of the inputs shared by the dependency resolution of every target in a run.
+    """
+
+    run_inputs = "\0".join([PYLLEMI_VERSION, python_moduledir, *sorted(third_party_module_targets)])
+    return hashlib.sha256(run_inputs.encode()).hexdigest()
+
+
+class IncrementalResolution:
+    """
+    Skips dependency resolution for targets whose inputs have not changed since they were last resolved, reusing the
+    dependencies recorded in the run manifest instead.
+
+    The inputs of a target are the contents of its srcs, its merged config, and the run fingerprint. Changes elsewhere
+    in the repo which do not touch any of these (e.g. moving a module imported by the target to a different BUILD
+    package) are not picked up until one of the inputs changes, or the manifest is deleted.
+    """
+
+    def __init__(self, manifest: RunManifest, run_fingerprint: str):
+        self._logger = setup_logger(__name__)
+        self._manifest = manifest
+        self._run_fingerprint = run_fingerprint
+        return
+
+    def get_deps(self, plz_target: Target, srcs: Collection[str], config_fingerprint: str) -> Optional[set[Target]]:
+        """
+        :return: the recorded dependencies of the target if none of its inputs have changed; otherwise None.
+        """
+
+        if (entry := self._manifest.get(plz_target.canonicalise())) is None:
+            return None
+
+        if entry.run_fingerprint != self._run_fingerprint or entry.config_fingerprint != config_fingerprint:
+            return None
+
+        if (src_hashes := _hash_srcs(plz_target, srcs)) is None or src_hashes != entry.src_hashes:
+            return None
+
+        self._logger.debug(f"Inputs of {plz_target} have not changed; reusing its recorded dependencies")
+        return set(map(Target, entry.deps))
+
+    def record_deps(
+        self,
+        plz_target: Target,
+        srcs: Collection[str],
+        config_fingerprint: str,
+        deps: set[Target],
+    ) -> None:
+        if (src_hashes := _hash_srcs(plz_target, srcs)) is None:
+            return
+
+        self._manifest.put(
+            plz_target.canonicalise(),
+            ManifestEntry(
+                run_fingerprint=self._run_fingerprint,
+                config_fingerprint=config_fingerprint,
+                src_hashes=src_hashes,
+                deps=sorted(dep.canonicalise() for dep in deps),
+            ),
+        )
+        return
+
+    def wrap(
+        self,
+        deps_resolver_fn: Callable[[Target, set[str]], set[Target]],
+        config_fingerprint: str,
+    ) -> Callable[[Target, set[str]], set[Target]]:
+        """
+        :return: a `deps_resolver_fn` which only calls the given one for targets whose inputs have changed.
+        """
+
+        def resolve_deps_for_srcs(plz_target: Target, srcs: set[str]) -> set[Target]:
+            if (deps := self.get_deps(plz_target, srcs, config_fingerprint)) is not None:
+                return deps
+
+            deps = deps_resolver_fn(plz_target, srcs)
+            self.record_deps(plz_target, srcs, config_fingerprint, deps)
+            return deps
+
+        return resolve_deps_for_srcs
+
+    def save(self) -> None:
+        self._manifest.save()
+        return
+
+
+def _hash_srcs(plz_target: Target, srcs: Collection[str]) -> Optional[dict[str, str]]:
+    src_hashes: dict[str, str] = {}
+    for src in srcs:
+        try:
+            with open(os.path.join(plz_target.build_pkg_dir, src), "rb") as src_file:
+                src_hashes[src] = hashlib.sha256(src_file.read()).hexdigest()
+        except OSError:
+            # Leave it to dependency resolution to deal with missing srcs.
+            return None
+    return src_hashes
@@ -0,0 +1,72 @@
+import os
+import shutil
+import uuid
+from unittest import mock, TestCase
+
+from adapters.os.run_manifest import RunManifest
+from domain.plz.target.target import Target
+from service.dependency.incremental import IncrementalResolution, new_run_fingerprint
+
+
+class TestIncrementalResolution(TestCase):
+    def setUp(self) -> None:
+        self.test_dir = f"test_incremental_{uuid.uuid4()}"
+        if os.path.exists(self.test_dir):
+            raise FileExistsError(f"cannot create {self.test_dir} for test setup: path already exists")
+        os.makedirs(self.test_dir)
+        with open(os.path.join(self.test_dir, "a.py"), "w") as src_file:
+            src_file.write("import colorama")
+
+        self.plz_target = Target(f"//{self.test_dir}:a")
+        self.deps = {Target("//third_party/python3:colorama")}
+        self.manifest_path = os.path.join(self.test_dir, "manifest.json")
+        self.run_fingerprint = new_run_fingerprint("third_party/python3", ["//third_party/python3:colorama"])
+        return
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        return
+
+    def resolve_in_new_run(self, run_fingerprint: str, config_fingerprint: str) -> mock.MagicMock:
+        deps_resolver_fn = mock.MagicMock(return_value=self.deps)
+        incremental_resolution = IncrementalResolution(RunManifest(self.manifest_path).load(), run_fingerprint)
+
+        self.assertEqual(
+            self.deps,
+            incremental_resolution.wrap(deps_resolver_fn, config_fingerprint)(self.plz_target, {"a.py"}),
+        )
+        incremental_resolution.save()
+        return deps_resolver_fn
+
+    def test_skips_resolution_when_inputs_unchanged(self):
+        self.resolve_in_new_run(self.run_fingerprint, "config").assert_called_once()
+        self.resolve_in_new_run(self.run_fingerprint, "config").assert_not_called()
+        return
+
+    def test_resolves_when_src_changed(self):
+        self.resolve_in_new_run(self.run_fingerprint, "config")
+        with open(os.path.join(self.test_dir, "a.py"), "w") as src_file:
+            src_file.write("import colorama\nimport os")
+
+        self.resolve_in_new_run(self.run_fingerprint, "config").assert_called_once()
+        return
+
+    def test_resolves_when_config_changed(self):
+        self.resolve_in_new_run(self.run_fingerprint, "config")
+        self.resolve_in_new_run(self.run_fingerprint, "other config").assert_called_once()
+        return
+
+    def test_resolves_when_run_fingerprint_changed(self):
+        self.resolve_in_new_run(self.run_fingerprint, "config")
+        self.resolve_in_new_run(new_run_fingerprint("third_party/python3", []), "config").assert_called_once()
+        return
+
+    def test_resolves_when_src_missing(self):
+        deps_resolver_fn = mock.MagicMock(return_value=set())
+        incremental_resolution = IncrementalResolution(RunManifest(self.manifest_path), self.run_fingerprint)
+        wrapped_deps_resolver_fn = incremental_resolution.wrap(deps_resolver_fn, "config")
+
+        wrapped_deps_resolver_fn(self.plz_target, {"does_not_exist.py"})
+        wrapped_deps_resolver_fn(self.plz_target, {"does_not_exist.py"})
+        self.assertEqual(2, deps_resolver_fn.call_count)
+        return
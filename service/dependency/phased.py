@@ -0,0 +1,161 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from adapters.plz_cli.query import WhatInputsByPathResult
+from common.logger.logger import setup_logger
+from domain.build_pkgs.build_pkg import BUILDPkg, query_non_literal_srcs, TargetToResolve
+from domain.plz.target.target import Target
+from service.dependency.batch import WhatInputsBatch
+from service.dependency.incremental import IncrementalResolution
+from service.dependency.resolver import DependencyResolver, PartiallyResolvedDeps
+
+LOGGER = setup_logger(__name__)
+
+# Set once per worker process by `_init_worker`, so that resolvers are not re-sent with every task.
+_worker_dependency_resolvers: list[DependencyResolver] = []
+
+
+def resolve_deps_in_phases(
+    build_pkgs: list[BUILDPkg],
+    dependency_resolvers: list[DependencyResolver],
+    *,
+    jobs: int = 1,
+    batch_whatinputs: bool = False,
+    whatinputs_by_path_fn: Optional[Callable[[list[str]], WhatInputsByPathResult]] = None,
+    incremental_resolution: Optional[IncrementalResolution] = None,
+) -> None:
+    """
+    Resolves dependencies for all targets of the given BUILD packages in 3 phases:
+
+    1. Parse the srcs of every target, and resolve all dependencies which do not require querying plz.
+       With `jobs > 1`, each BUILD package is handled by a separate worker process.
+    2. Resolve the custom module dependencies of every target with `plz query whatinputs` -- either per target,
+       or with a single query for all targets if `batch_whatinputs` is set.
+    3. Update each BUILD package with the resolved dependencies, in the order the BUILD packages were given.
+
+    :param dependency_resolvers: 1 per BUILD package, in the same order as `build_pkgs`.
+    :param incremental_resolution: if set, targets whose inputs have not changed since the last run skip phases 1 and 2.
+    """
+
+    if len(build_pkgs) != len(dependency_resolvers):
+        raise ValueError(
+            f"programming error: got {len(build_pkgs)} BUILD packages but {len(dependency_resolvers)} resolvers"
+        )
+
+    srcs_by_srcs_query_target = query_non_literal_srcs(build_pkgs)
+    all_targets_to_resolve_by_build_pkg: list[list[TargetToResolve]] = [
+        build_pkg.get_targets_to_resolve(srcs_by_srcs_query_target) for build_pkg in build_pkgs
+    ]
+
+    deps_by_target: dict[Target, set[Target]] = {}
+    config_fingerprints: list[str] = []
+    targets_to_resolve_by_build_pkg: list[list[TargetToResolve]] = all_targets_to_resolve_by_build_pkg
+    if incremental_resolution is not None:
+        config_fingerprints = [build_pkg.config.fingerprint() for build_pkg in build_pkgs]
+        targets_to_resolve_by_build_pkg = []
+        for config_fingerprint, all_targets_to_resolve in zip(config_fingerprints, all_targets_to_resolve_by_build_pkg):
+            targets_to_resolve: list[TargetToResolve] = []
+            for target_to_resolve in all_targets_to_resolve:
+                if (
+                    recorded_deps := incremental_resolution.get_deps(
+                        target_to_resolve.plz_target,
+                        target_to_resolve.srcs,
+                        config_fingerprint,
+                    )
+                ) is not None:
+                    deps_by_target[target_to_resolve.plz_target] = recorded_deps
+                    continue
+                targets_to_resolve.append(target_to_resolve)
+            targets_to_resolve_by_build_pkg.append(targets_to_resolve)
+
+    partially_resolved_deps_by_build_pkg = _collect_deps(dependency_resolvers, targets_to_resolve_by_build_pkg, jobs)
+
+    if batch_whatinputs:
+        batch = WhatInputsBatch(whatinputs_by_path_fn)
+        for targets_to_resolve, partially_resolved_deps_for_targets in zip(
+            targets_to_resolve_by_build_pkg,
+            partially_resolved_deps_by_build_pkg,
+        ):
+            for target_to_resolve, partially_resolved_deps in zip(
+                targets_to_resolve,
+                partially_resolved_deps_for_targets,
+            ):
+                batch.add(target_to_resolve.plz_target, partially_resolved_deps)
+        deps_by_target |= batch.resolve()
+
+    else:
+        for dependency_resolver, targets_to_resolve, partially_resolved_deps_for_targets in zip(
+            dependency_resolvers,
+            targets_to_resolve_by_build_pkg,
+            partially_resolved_deps_by_build_pkg,
+        ):
+            for target_to_resolve, partially_resolved_deps in zip(
+                targets_to_resolve,
+                partially_resolved_deps_for_targets,
+            ):
+                deps_by_target[target_to_resolve.plz_target] = dependency_resolver.complete_partially_resolved_deps(
+                    target_to_resolve.plz_target,
+                    partially_resolved_deps,
+                )
+
+    if incremental_resolution is not None:
+        for config_fingerprint, targets_to_resolve in zip(config_fingerprints, targets_to_resolve_by_build_pkg):
+            for target_to_resolve in targets_to_resolve:
+                incremental_resolution.record_deps(
+                    target_to_resolve.plz_target,
+                    target_to_resolve.srcs,
+                    config_fingerprint,
+                    deps_by_target[target_to_resolve.plz_target],
+                )
+
+    for build_pkg, targets_to_resolve in zip(build_pkgs, all_targets_to_resolve_by_build_pkg):
+        for target_to_resolve in targets_to_resolve:
+            build_pkg.update_deps_for_target(target_to_resolve, deps_by_target[target_to_resolve.plz_target])
+    return
+
+
+def _collect_deps(
+    dependency_resolvers: list[DependencyResolver],
+    targets_to_resolve_by_build_pkg: list[list[TargetToResolve]],
+    jobs: int,
+) -> list[list[PartiallyResolvedDeps]]:
+    # Only the Target and srcs are needed by the workers; the AST nodes stay in this process.
+    tasks = [
+        (i, [(target_to_resolve.plz_target, target_to_resolve.srcs) for target_to_resolve in targets_to_resolve])
+        for i, targets_to_resolve in enumerate(targets_to_resolve_by_build_pkg)
+    ]
+
+    if jobs <= 1 or len(tasks) <= 1:
+        return [_collect_deps_for_build_pkg(dependency_resolvers[i], srcs_by_target) for i, srcs_by_target in tasks]
+
+    LOGGER.debug(f"Collecting dependencies for {len(tasks)} BUILD packages with {jobs} worker processes")
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(tasks)),
+        initializer=_init_worker,
+        initargs=(dependency_resolvers,),
+    ) as executor:
+        # Executor.map yields results in the order of the tasks, regardless of the order they complete in.
+        return list(executor.map(_collect_deps_in_worker, tasks))
+
+
+def _init_worker(dependency_resolvers: list[DependencyResolver]) -> None:
+    _worker_dependency_resolvers[:] = dependency_resolvers
+    return
+
+
+def _collect_deps_in_worker(task: tuple[int, list[tuple[Target, set[str]]]]) -> list[PartiallyResolvedDeps]:
+    build_pkg_index, srcs_by_target = task
+    return _collect_deps_for_build_pkg(_worker_dependency_resolvers[build_pkg_index], srcs_by_target)
+
+
+def _collect_deps_for_build_pkg(
+    dependency_resolver: DependencyResolver,
+    srcs_by_target: list[tuple[Target, set[str]]],
+) -> list[PartiallyResolvedDeps]:
+    partially_resolved_deps: list[PartiallyResolvedDeps] = []
+    for plz_target, srcs in srcs_by_target:
+        if len(srcs) == 0:
+            partially_resolved_deps.append(PartiallyResolvedDeps(set(), frozenset()))
+            continue
+        partially_resolved_deps.append(dependency_resolver.collect_deps_for_srcs(plz_target, srcs))
+    return partially_resolved_deps
@@ -0,0 +1,141 @@
+from unittest import mock, TestCase
+
+from adapters.plz_cli.query import WhatInputsByPathResult
+from domain.build_pkgs.build_pkg import TargetToResolve
+from domain.plz.target.target import Target
+from service.dependency.phased import resolve_deps_in_phases
+from service.dependency.resolver import PartiallyResolvedDeps
+
+PLZ_TARGET_BY_WHATINPUTS_INPUT = {
+    "pkg_a/a.py": "//pkg_a:a",
+    "pkg_b/b.py": "//pkg_b:b",
+    "pkg_c/c.py": "//pkg_c:c",
+}
+
+
+class StubDependencyResolver:
+    """
+    Picklable stand-in for a DependencyResolver, so that it can be sent to worker processes.
+    """
+
+    def __init__(self, whatinputs_inputs_by_src: dict[str, str]):
+        self.whatinputs_inputs_by_src = whatinputs_inputs_by_src
+        return
+
+    def collect_deps_for_srcs(self, srcs_plz_target: Target, srcs: set[str]) -> PartiallyResolvedDeps:
+        return PartiallyResolvedDeps(
+            {Target("//third_party/python3:colorama")},
+            frozenset(self.whatinputs_inputs_by_src[src] for src in srcs),
+        )
+
+    def complete_partially_resolved_deps(
+        self,
+        srcs_plz_target: Target,
+        partially_resolved_deps: PartiallyResolvedDeps,
+    ) -> set[Target]:
+        deps = set(partially_resolved_deps.plz_targets)
+        for whatinputs_input in partially_resolved_deps.whatinputs_inputs:
+            deps.add(Target(PLZ_TARGET_BY_WHATINPUTS_INPUT[whatinputs_input]))
+        deps.discard(srcs_plz_target)
+        return deps
+
+
+class TestResolveDepsInPhases(TestCase):
+    def setUp(self) -> None:
+        self.build_pkgs = [mock.MagicMock(), mock.MagicMock(), mock.MagicMock()]
+        self.build_pkgs[0].get_targets_to_resolve.return_value = [
+            TargetToResolve(node=None, python_target=None, plz_target=Target("//pkg_a:a"), srcs={"a.py"}),
+            TargetToResolve(node=None, python_target=None, plz_target=Target("//pkg_a:a_test"), srcs={"a_test.py"}),
+        ]
+        self.build_pkgs[1].get_targets_to_resolve.return_value = [
+            TargetToResolve(node=None, python_target=None, plz_target=Target("//pkg_b:b"), srcs={"b.py"}),
+        ]
+        self.build_pkgs[2].get_targets_to_resolve.return_value = [
+            TargetToResolve(node=None, python_target=None, plz_target=Target("//pkg_c:c"), srcs=set()),
+        ]
+        self.dependency_resolvers = [
+            StubDependencyResolver({"a.py": "pkg_b/b.py", "a_test.py": "pkg_a/a.py"}),
+            StubDependencyResolver({"b.py": "pkg_c/c.py"}),
+            StubDependencyResolver({}),
+        ]
+        self.expected_deps_by_build_pkg = [
+            [
+                {Target("//third_party/python3:colorama"), Target("//pkg_b:b")},
+                {Target("//third_party/python3:colorama"), Target("//pkg_a:a")},
+            ],
+            [{Target("//third_party/python3:colorama"), Target("//pkg_c:c")}],
+            [set()],
+        ]
+        return
+
+    def assert_deps_updated(self):
+        for build_pkg, expected_deps_for_targets in zip(self.build_pkgs, self.expected_deps_by_build_pkg):
+            self.assertEqual(
+                [
+                    mock.call(target_to_resolve, expected_deps)
+                    for target_to_resolve, expected_deps in zip(
+                        build_pkg.get_targets_to_resolve.return_value,
+                        expected_deps_for_targets,
+                    )
+                ],
+                build_pkg.update_deps_for_target.call_args_list,
+            )
+        return
+
+    def test_serial(self):
+        resolve_deps_in_phases(self.build_pkgs, self.dependency_resolvers, jobs=1)
+        self.assert_deps_updated()
+        return
+
+    def test_parallel(self):
+        resolve_deps_in_phases(self.build_pkgs, self.dependency_resolvers, jobs=2)
+        self.assert_deps_updated()
+        return
+
+    def test_parallel_with_batched_whatinputs(self):
+        mock_whatinputs_by_path = mock.MagicMock()
+        mock_whatinputs_by_path.return_value = WhatInputsByPathResult(
+            {path: {plz_target} for path, plz_target in PLZ_TARGET_BY_WHATINPUTS_INPUT.items()},
+            set(),
+        )
+
+        resolve_deps_in_phases(
+            self.build_pkgs,
+            self.dependency_resolvers,
+            jobs=2,
+            batch_whatinputs=True,
+            whatinputs_by_path_fn=mock_whatinputs_by_path,
+        )
+        self.assert_deps_updated()
+        mock_whatinputs_by_path.assert_called_once_with(["pkg_a/a.py", "pkg_b/b.py", "pkg_c/c.py"])
+        return
+
+    def test_errors_with_mismatched_resolvers(self):
+        self.assertRaises(ValueError, resolve_deps_in_phases, self.build_pkgs, self.dependency_resolvers[:1])
+        return
+
+    def test_reuses_recorded_deps_for_unchanged_targets(self):
+        recorded_deps = self.expected_deps_by_build_pkg[0][0]
+        mock_incremental_resolution = mock.MagicMock()
+        mock_incremental_resolution.get_deps.side_effect = lambda plz_target, srcs, config_fingerprint: (
+            recorded_deps if plz_target == Target("//pkg_a:a") else None
+        )
+        # Only the recorded target could have been resolved to pkg_b/b.py.
+        self.dependency_resolvers[0].whatinputs_inputs_by_src.pop("a.py")
+
+        resolve_deps_in_phases(
+            self.build_pkgs,
+            self.dependency_resolvers,
+            jobs=1,
+            incremental_resolution=mock_incremental_resolution,
+        )
+        self.assert_deps_updated()
+        self.assertEqual(
+            [
+                Target("//pkg_a:a_test"),
+                Target("//pkg_b:b"),
+                Target("//pkg_c:c"),
+            ],
+            [call.args[0] for call in mock_incremental_resolution.record_deps.call_args_list],
+        )
+        return
@@ -0,0 +1,56 @@
+from collections import namedtuple, OrderedDict
+from typing import Optional
+
+from domain.python_import import enriched as enriched_import
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# What an import resolves to: the target, if it could be resolved without querying plz, and the inputs to
+# `plz query whatinputs` for the targets which could not.
+ResolvedImport = namedtuple("ResolvedImport", ["plz_target", "whatinputs_inputs"])
+
+
+class ImportResolutionCache:
+    """
+    In-memory, least-recently-used cache of what enriched imports resolve to, shared by every dependency resolver in
+    a run. How an import is resolved depends on the config of the BUILD package it is imported from, so entries are
+    also keyed by the config's fingerprint.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, enriched_import.Type, str], ResolvedImport] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        return
+
+    def get(self, import_: enriched_import.Import, config_fingerprint: str) -> Optional[ResolvedImport]:
+        key = (import_.import_, import_.type_, config_fingerprint)
+        if (resolved_import := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return resolved_import
+
+    def put(self, import_: enriched_import.Import, config_fingerprint: str, resolved_import: ResolvedImport) -> None:
+        key = (import_.import_, import_.type_, config_fingerprint)
+        self._entries[key] = resolved_import
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return
+
+    def clear(self) -> None:
+        """
+        For long-lived processes: forgets every resolved import, e.g. after files have been added or removed.
+        """
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        return
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from domain.plz.target.target import Target
+from domain.python_import import enriched as enriched_import
+from service.dependency.resolution_cache import ImportResolutionCache, ResolvedImport
+
+
+class TestImportResolutionCache(TestCase):
+    def setUp(self) -> None:
+        self.import_ = enriched_import.Import("company.lib", enriched_import.Type.PACKAGE)
+        self.resolved_import = ResolvedImport(Target("//company:lib"), frozenset({"company/lib/__init__.py"}))
+        return
+
+    def test_counts_hits_and_misses(self):
+        cache = ImportResolutionCache()
+        self.assertIsNone(cache.get(self.import_, "config"))
+        cache.put(self.import_, "config", self.resolved_import)
+        self.assertEqual(self.resolved_import, cache.get(self.import_, "config"))
+        self.assertEqual(self.resolved_import, cache.get(self.import_, "config"))
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+        return
+
+    def test_keys_by_import_type_and_config_fingerprint(self):
+        cache = ImportResolutionCache()
+        cache.put(self.import_, "config", self.resolved_import)
+        self.assertIsNone(cache.get(self.import_, "another config"))
+        self.assertIsNone(cache.get(enriched_import.Import("company.lib", enriched_import.Type.MODULE), "config"))
+        return
+
+    def test_evicts_least_recently_used(self):
+        cache = ImportResolutionCache(max_entries=2)
+        imports = [enriched_import.Import(f"module_{i}", enriched_import.Type.MODULE) for i in range(3)]
+        cache.put(imports[0], "config", self.resolved_import)
+        cache.put(imports[1], "config", self.resolved_import)
+        cache.get(imports[0], "config")
+        cache.put(imports[2], "config", self.resolved_import)
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(imports[1], "config"))
+        self.assertIsNotNone(cache.get(imports[0], "config"))
+        self.assertIsNotNone(cache.get(imports[2], "config"))
+        return
+
+    def test_clear(self):
+        cache = ImportResolutionCache()
+        cache.put(self.import_, "config", self.resolved_import)
+        cache.get(self.import_, "config")
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+        self.assertIsNone(cache.get(self.import_, "config"))
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        return
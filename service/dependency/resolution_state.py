@@ -0,0 +1,84 @@
+from typing import Collection, Optional
+
+from adapters.os.fs_snapshot import FileSystemSnapshot
+from adapters.os.package_files_index import PackageFilesIndex
+from config.hierarchy import ConfigHierarchy
+from domain.plz.target.target import Target
+from domain.python_import.stdlib.stdlib_modules import get_stdlib_module_names
+from service.dependency.build_file_index import BUILDFileSrcsIndex
+from service.dependency.classification import ImportClassificationTable
+
+
+class ResolutionState:
+    """
+    Everything dependency resolution reads which only depends on files that rarely change: the stdlib modules, the
+    config hierarchy, the index of importable files in packages, the literal srcs in BUILD files, and the import
+    classification table of each config.
+
+    A run builds its own, but long-lived processes (e.g. `pyllemi serve`) should build 1 up-front and reuse it for
+    every resolution, calling `clear_stale` before each of them so that only what has changed is read again.
+    """
+
+    def __init__(self, build_file_names: Collection[str], fs_snapshot: Optional[FileSystemSnapshot] = None):
+        """
+        :param fs_snapshot: if set, configs and importable files are looked up in the snapshot rather than the
+            filesystem. Only for states used in a single run, as they never go stale.
+        """
+
+        self.build_file_names = frozenset(build_file_names)
+        self.std_lib_modules = get_stdlib_module_names()
+        self.config_hierarchy = ConfigHierarchy() if fs_snapshot is None else ConfigHierarchy(fs_snapshot.isfile)
+        self.package_files_index = PackageFilesIndex(fs_snapshot)
+        self.build_file_srcs_index = BUILDFileSrcsIndex(self.build_file_names)
+
+        self._import_classification_tables: dict[str, ImportClassificationTable] = {}
+        self._import_classification_python_moduledir: Optional[str] = None
+        self._import_classification_third_party_module_targets: Collection[str] = frozenset()
+        return
+
+    def clear_stale(self, build_file_names: Collection[str]) -> None:
+        """
+        Forgets whatever has been read from files which have since changed.
+
+        :param build_file_names: as currently configured, which may have changed along with the plz config.
+        """
+
+        self.config_hierarchy.clear_stale()
+        self.package_files_index.clear_stale()
+        if (build_file_names := frozenset(build_file_names)) != self.build_file_names:
+            self.build_file_names = build_file_names
+            self.build_file_srcs_index = BUILDFileSrcsIndex(self.build_file_names)
+        else:
+            self.build_file_srcs_index.clear_stale()
+        return
+
+    def get_import_classification_table(
+        self,
+        config_fingerprint: str,
+        namespace_to_target: dict[str, Target],
+        python_moduledir: str,
+        third_party_module_targets: Collection[str],
+    ) -> ImportClassificationTable:
+        """
+        :param config_fingerprint: of the config the known namespaces are from.
+        :return: the import classification table for BUILD packages with the config, which is only built once for
+            every config fingerprint, until the python moduledir or third-party targets change.
+        """
+
+        # Runs pass the same third-party targets for every BUILD package, so they are only compared once per run.
+        if python_moduledir != self._import_classification_python_moduledir or (
+            third_party_module_targets is not self._import_classification_third_party_module_targets
+            and set(third_party_module_targets) != set(self._import_classification_third_party_module_targets)
+        ):
+            self._import_classification_tables.clear()
+        self._import_classification_python_moduledir = python_moduledir
+        self._import_classification_third_party_module_targets = third_party_module_targets
+
+        if config_fingerprint not in self._import_classification_tables:
+            self._import_classification_tables[config_fingerprint] = ImportClassificationTable(
+                python_moduledir=python_moduledir,
+                std_lib_modules=self.std_lib_modules,
+                available_third_party_module_targets=third_party_module_targets,
+                namespace_to_target=namespace_to_target,
+            )
+        return self._import_classification_tables[config_fingerprint]
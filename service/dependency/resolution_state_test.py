@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from domain.plz.target.target import Target
+from service.dependency.classification import ImportKind
+from service.dependency.resolution_state import ResolutionState
+
+
+class TestResolutionState(TestCase):
+    def setUp(self) -> None:
+        self.state = ResolutionState({"BUILD"})
+        self.third_party_module_targets = {"//third_party/python3:numpy"}
+        return
+
+    def get_import_classification_table(self, config_fingerprint: str, third_party_module_targets: set[str]):
+        return self.state.get_import_classification_table(
+            config_fingerprint,
+            {"company": Target("//company")},
+            "third_party.python3",
+            third_party_module_targets,
+        )
+
+    def test_reuses_import_classification_table_per_config(self):
+        table = self.get_import_classification_table("config", self.third_party_module_targets)
+        self.assertIs(table, self.get_import_classification_table("config", self.third_party_module_targets))
+        self.assertIs(table, self.get_import_classification_table("config", set(self.third_party_module_targets)))
+        self.assertIsNot(table, self.get_import_classification_table("other", self.third_party_module_targets))
+        return
+
+    def test_rebuilds_import_classification_tables_when_third_party_targets_change(self):
+        table = self.get_import_classification_table("config", self.third_party_module_targets)
+        self.assertEqual(ImportKind.LOCAL, table.classify("pandas").kind)
+
+        rebuilt_table = self.get_import_classification_table(
+            "config",
+            self.third_party_module_targets | {"//third_party/python3:pandas"},
+        )
+        self.assertIsNot(table, rebuilt_table)
+        self.assertEqual(ImportKind.THIRD_PARTY, rebuilt_table.classify("pandas").kind)
+        return
+
+    def test_clear_stale_with_new_build_file_names(self):
+        build_file_srcs_index = self.state.build_file_srcs_index
+        self.state.clear_stale({"BUILD"})
+        self.assertIs(build_file_srcs_index, self.state.build_file_srcs_index)
+
+        self.state.clear_stale({"BUILD", "BUILD.plz"})
+        self.assertIsNot(build_file_srcs_index, self.state.build_file_srcs_index)
+        self.assertEqual({"BUILD", "BUILD.plz"}, self.state.build_file_names)
+        return
@@ -1,15 +1,21 @@
 import os
-from typing import Collection, Optional
+from collections import namedtuple
+from typing import Callable, Collection, Optional
 
-from adapters.plz_cli.query import get_whatinputs
+from adapters.os.package_files_index import PackageFilesIndex
+from adapters.plz_cli.query import get_whatinputs, WhatInputsResult
 from common.logger.logger import setup_logger
-from common.trie import trie
 from domain.plz.target.target import Target
 from domain.python_import import enriched as enriched_import
 from service.ast.converters.to_enriched_imports import ToEnrichedImports
+from service.dependency.classification import ImportClassificationTable, ImportKind
+from service.dependency.resolution_cache import ImportResolutionCache, ResolvedImport
 from service.python_import.enriched import to_whatinputs_input
 from service.python_import.node_collector import NodeCollector
 
+# Dependencies which have been resolved to targets, and the inputs to `plz query whatinputs` for those which have not.
+PartiallyResolvedDeps = namedtuple("PartiallyResolvedDeps", ["plz_targets", "whatinputs_inputs"])
+
 
 def convert_os_path_to_import_path(os_path: str, abs_path_to_project_root: str = "") -> str:
     return (
@@ -35,18 +41,43 @@ class DependencyResolver:
         known_dependencies: dict[str, Collection[Target]],
         namespace_to_target: dict[str, Target],
         nodes_collator: NodeCollector,
+        whatinputs_fn: Optional[Callable[[list[str]], WhatInputsResult]] = None,
+        package_files_index: Optional[PackageFilesIndex] = None,
+        import_classification_table: Optional[ImportClassificationTable] = None,
+        import_resolution_cache: Optional[ImportResolutionCache] = None,
+        config_fingerprint: str = "",
     ):
+        """
+        :param whatinputs_fn: used to find the plz targets of custom module imports; defaults to `plz query whatinputs`.
+        :param package_files_index: used to find the files in imported packages; should be shared between resolvers.
+        :param import_classification_table: built from the stdlib, third-party and namespace modules if not given;
+            should be shared between resolvers with the same config.
+        :param import_resolution_cache: should be shared between all resolvers in a run.
+        :param config_fingerprint: of the config the stdlib, third-party and namespace modules are from, to key
+            entries of the import resolution cache by.
+        """
+
         self._logger = setup_logger(__name__)
 
         self.python_moduledir = python_moduledir
-        self.std_lib_modules = std_lib_modules
-        self.available_third_party_module_targets = frozenset(available_third_party_module_targets)
-        self.namespace_pkg_to_target = namespace_to_target
-        self.namespace_pkg_lookup: trie.Trie = trie.new_trie(self.namespace_pkg_to_target.keys())
+        self.import_classification_table = (
+            ImportClassificationTable(
+                python_moduledir=python_moduledir,
+                std_lib_modules=std_lib_modules,
+                available_third_party_module_targets=available_third_party_module_targets,
+                namespace_to_target=namespace_to_target,
+            )
+            if import_classification_table is None
+            else import_classification_table
+        )
+        self.import_resolution_cache = import_resolution_cache
+        self.config_fingerprint = config_fingerprint
         self.known_dependencies = known_dependencies
         self.enricher = enricher
 
         self.collator = nodes_collator
+        self.whatinputs_fn = whatinputs_fn
+        self.package_files_index = package_files_index
 
         self._whatinputs_inputs_for_this_target: set[str] = set()
         return
@@ -55,7 +86,20 @@ class DependencyResolver:
         if len(srcs) == 0:
             return set()
 
+        return self.complete_partially_resolved_deps(
+            srcs_plz_target,
+            self.collect_deps_for_srcs(srcs_plz_target, srcs),
+        )
+
+    def collect_deps_for_srcs(self, srcs_plz_target: Target, srcs: set[str]) -> PartiallyResolvedDeps:
+        """
+        Resolves all dependencies of the given srcs which can be resolved without querying plz.
+        The whatinputs inputs for custom module imports are returned alongside, so that the caller may batch them.
+        """
+
         import_targets: set[Target] = set()
+        # The srcs of a target often share imports, which only need resolving once.
+        resolved_imports: set[enriched_import.Import] = set()
         for src in srcs:
             self._logger.debug(
                 f"Starting to resolve dependencies for {os.path.join(srcs_plz_target.build_pkg_dir, src)}"
@@ -65,6 +109,10 @@ class DependencyResolver:
             for import_node in self.collator.collate(code=code, path=relative_path_to_src):
                 for enriched_imports in self.enricher.convert(import_node, pyfile_path=relative_path_to_src):
                     for enriched_import_ in enriched_imports:
+                        if enriched_import_ in resolved_imports:
+                            continue
+                        resolved_imports.add(enriched_import_)
+
                         dep = self._resolve_dependencies_for_enriched_import(enriched_import_)
                         if dep is None:
                             continue
@@ -79,9 +127,19 @@ class DependencyResolver:
                 )
                 import_targets |= set(known_deps_for_src)
 
-        # Make the call to `plz query whatinputs ...` to find all the custom module dep targets.
-        import_targets |= self._query_whatinputs_for_whatinputs_batch()
+        whatinputs_inputs = frozenset(self._whatinputs_inputs_for_this_target)
         self._whatinputs_inputs_for_this_target.clear()
+        return PartiallyResolvedDeps(import_targets, whatinputs_inputs)
+
+    def complete_partially_resolved_deps(
+        self,
+        srcs_plz_target: Target,
+        partially_resolved_deps: PartiallyResolvedDeps,
+    ) -> set[Target]:
+        import_targets = set(partially_resolved_deps.plz_targets)
+
+        # Make the call to `plz query whatinputs ...` to find all the custom module dep targets.
+        import_targets |= self._query_whatinputs_for_whatinputs_batch(partially_resolved_deps.whatinputs_inputs)
 
         # Remove "self-dependency" cycles.
         import_targets.discard(srcs_plz_target)
@@ -91,39 +149,49 @@ class DependencyResolver:
         self,
         import_: enriched_import.Import,
     ) -> Optional[Target]:
+        if self.import_resolution_cache is None:
+            resolved_import = self._resolve_enriched_import(import_)
+        elif (resolved_import := self.import_resolution_cache.get(import_, self.config_fingerprint)) is None:
+            resolved_import = self._resolve_enriched_import(import_)
+            self.import_resolution_cache.put(import_, self.config_fingerprint, resolved_import)
+
+        # Batch whatinputs calls for performance gains.
+        self._whatinputs_inputs_for_this_target |= resolved_import.whatinputs_inputs
+        return resolved_import.plz_target
+
+    def _resolve_enriched_import(self, import_: enriched_import.Import) -> ResolvedImport:
+        classification = self.import_classification_table.classify(import_.import_)
+
         # Filter out stdlib modules.
-        top_level_module_name = import_.get_top_level_module_name()
-        if top_level_module_name in self.std_lib_modules:
-            self._logger.debug(f"Found import of a standard lib module: {top_level_module_name}")
-            return None
+        if classification.kind == ImportKind.STDLIB:
+            self._logger.debug(f"Found import of a standard lib module: {classification.prefix}")
+            return ResolvedImport(None, frozenset())
 
         # Resolve 3rd-party library targets.
-        possible_third_party_module_target = f"//{self.python_moduledir}:{top_level_module_name}".replace(".", "/")
-        if possible_third_party_module_target in self.available_third_party_module_targets:
-            return Target(possible_third_party_module_target)
+        if classification.kind == ImportKind.THIRD_PARTY:
+            return ResolvedImport(classification.target, frozenset())
 
-        # TODO(#4): add ability to 'guess' target based on import path -- if it is not a target,
-        #  then revert to whatinputs.
-        if (whatinputs_input := to_whatinputs_input(import_)) is not None:
+        # Targets are found for these by the whatinputs_fn, which may 'guess' them from BUILD files
+        # (see BUILDFileSrcsIndex) before reverting to `plz query whatinputs`.
+        whatinputs_inputs: frozenset[str] = frozenset()
+        if (whatinputs_input := to_whatinputs_input(import_, self.package_files_index)) is not None:
             self._logger.debug(f"Found import of a custom lib module: {import_.import_}")
-            # Batch whatinputs calls for performance gains.
-            self._whatinputs_inputs_for_this_target |= set(whatinputs_input)
+            whatinputs_inputs = frozenset(whatinputs_input)
 
-        if (
-            namespace_pkg := trie.longest_existing_path_in_trie(self.namespace_pkg_lookup, import_.import_)
-        ) != "":
-            self._logger.debug(f"Found import of a known namespace package: {namespace_pkg}")
-            return self.namespace_pkg_to_target[namespace_pkg]
+        if classification.kind == ImportKind.NAMESPACE:
+            self._logger.debug(f"Found import of a known namespace package: {classification.prefix}")
+            return ResolvedImport(classification.target, whatinputs_inputs)
 
-        return None
+        return ResolvedImport(None, whatinputs_inputs)
 
-    def _query_whatinputs_for_whatinputs_batch(self) -> set[Target]:
-        if len(self._whatinputs_inputs_for_this_target) == 0:
+    def _query_whatinputs_for_whatinputs_batch(self, whatinputs_inputs: Collection[str]) -> set[Target]:
+        if len(whatinputs_inputs) == 0:
             return set()
 
-        self._logger.debug(f"running whatinputs on {self._whatinputs_inputs_for_this_target}")
+        self._logger.debug(f"running whatinputs on {whatinputs_inputs}")
 
-        whatinputs_result = get_whatinputs(list(self._whatinputs_inputs_for_this_target))
+        whatinputs_fn = get_whatinputs if self.whatinputs_fn is None else self.whatinputs_fn
+        whatinputs_result = whatinputs_fn(list(whatinputs_inputs))
         if len(whatinputs_result.targetless_paths) > 0:
             self._logger.error(f"Could not find targets for imports: {', '.join(whatinputs_result.targetless_paths)}")
         return set(map(Target, whatinputs_result.plz_targets))
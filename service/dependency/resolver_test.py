@@ -6,6 +6,8 @@ from unittest import mock, TestCase
 from adapters.plz_cli.query import WhatInputsResult
 from domain.plz.target.target import Target
 from domain.python_import import enriched as enriched_import
+from service.dependency.classification import ImportClassification, ImportKind
+from service.dependency.resolution_cache import ImportResolutionCache
 from service.dependency.resolver import DependencyResolver, convert_os_path_to_import_path
 
 
@@ -215,6 +217,104 @@ class TestDependencyResolver(TestCase):
         )
         return
 
+    @mock.patch("service.dependency.resolver.get_whatinputs")
+    @mock.patch("builtins.open", new_callable=mock.mock_open(read_data="import custom.module"))
+    def test_resolve_deps_for_srcs_with_custom_whatinputs_fn(
+        self,
+        mock_file_open: mock.MagicMock,
+        mock_get_whatinputs: mock.MagicMock,
+    ):
+        self.mock_nodes_collator.collate.return_value = [ast.Import(names=[ast.Name(name="custom.module")])]
+        mock_file_open.return_value.__enter__.return_value.read.return_value = "import custom.module"
+        self.mock_enricher.convert.return_value = [
+            [enriched_import.Import("custom.module", enriched_import.Type.MODULE)]
+        ]
+        mock_whatinputs_fn = mock.MagicMock(return_value=WhatInputsResult({"//custom:target"}, set()))
+
+        dep_resolver = DependencyResolver(
+            python_moduledir="third_party.python",
+            enricher=self.mock_enricher,
+            std_lib_modules=sys.stdlib_module_names,
+            available_third_party_module_targets=set(),
+            known_dependencies={},
+            namespace_to_target={},
+            nodes_collator=self.mock_nodes_collator,
+            whatinputs_fn=mock_whatinputs_fn,
+        )
+
+        deps = dep_resolver.resolve_deps_for_srcs(Target("//path/to:target"), srcs={"y.py"})
+        mock_whatinputs_fn.assert_called_once_with([os.path.join("custom", "module.py")])
+        mock_get_whatinputs.assert_not_called()
+        self.assertEqual({Target("//custom:target")}, deps)
+        return
+
+    @mock.patch("builtins.open", new_callable=mock.mock_open(read_data="import colorama"))
+    def test_resolves_imports_shared_by_srcs_once(self, _):
+        self.mock_nodes_collator.collate.return_value = [ast.Import(names=[ast.Name(name="colorama")])]
+        self.mock_enricher.convert.side_effect = lambda *_, **__: [
+            [enriched_import.Import("colorama", enriched_import.Type.THIRD_PARTY_MODULE)]
+        ]
+        mock_import_classification_table = mock.MagicMock()
+        mock_import_classification_table.classify.return_value = ImportClassification(
+            ImportKind.THIRD_PARTY,
+            Target("//third_party/python:colorama"),
+            "colorama",
+        )
+
+        dep_resolver = DependencyResolver(
+            python_moduledir="third_party.python",
+            enricher=self.mock_enricher,
+            std_lib_modules=sys.stdlib_module_names,
+            available_third_party_module_targets={"//third_party/python:colorama"},
+            known_dependencies={},
+            namespace_to_target={},
+            nodes_collator=self.mock_nodes_collator,
+            import_classification_table=mock_import_classification_table,
+        )
+
+        deps = dep_resolver.resolve_deps_for_srcs(Target("//path/to:target"), srcs={"x.py", "y.py", "z.py"})
+        self.assertEqual(3, self.mock_enricher.convert.call_count)
+        mock_import_classification_table.classify.assert_called_once_with("colorama")
+        self.assertEqual({Target("//third_party/python:colorama")}, deps)
+        return
+
+    @mock.patch("builtins.open", new_callable=mock.mock_open(read_data="import colorama"))
+    def test_shares_resolved_imports_between_resolvers_with_same_config(self, _):
+        self.mock_nodes_collator.collate.return_value = [ast.Import(names=[ast.Name(name="colorama")])]
+        self.mock_enricher.convert.side_effect = lambda *_, **__: [
+            [enriched_import.Import("colorama", enriched_import.Type.THIRD_PARTY_MODULE)]
+        ]
+        mock_import_classification_table = mock.MagicMock()
+        mock_import_classification_table.classify.return_value = ImportClassification(
+            ImportKind.THIRD_PARTY,
+            Target("//third_party/python:colorama"),
+            "colorama",
+        )
+        import_resolution_cache = ImportResolutionCache()
+
+        dep_resolvers = [
+            DependencyResolver(
+                python_moduledir="third_party.python",
+                enricher=self.mock_enricher,
+                std_lib_modules=sys.stdlib_module_names,
+                available_third_party_module_targets={"//third_party/python:colorama"},
+                known_dependencies={},
+                namespace_to_target={},
+                nodes_collator=self.mock_nodes_collator,
+                import_classification_table=mock_import_classification_table,
+                import_resolution_cache=import_resolution_cache,
+                config_fingerprint=config_fingerprint,
+            )
+            for config_fingerprint in ["config", "config", "another config"]
+        ]
+
+        for i, dep_resolver in enumerate(dep_resolvers):
+            deps = dep_resolver.resolve_deps_for_srcs(Target(f"//pkg_{i}:target"), srcs={"x.py"})
+            self.assertEqual({Target("//third_party/python:colorama")}, deps)
+        self.assertEqual(2, mock_import_classification_table.classify.call_count)
+        self.assertEqual((1, 2), (import_resolution_cache.hits, import_resolution_cache.misses))
+        return
+
     def test_returns_empty_with_no_srcs(self):
         dep_resolver = DependencyResolver(
             python_moduledir="third_party.python",
@@ -2,13 +2,19 @@ import os
 from glob import glob
 from typing import Optional
 
+from adapters.os.fs_snapshot import FileSystemSnapshot
+from adapters.os.package_files_index import PackageFilesIndex
 from common.logger.logger import setup_logger
 from domain.python_import import enriched as enriched_import
 
 LOGGER = setup_logger(__name__)
 
 
-def resolve_import_type(py_import_path: str, python_moduledir: str) -> enriched_import.Type:
+def resolve_import_type(
+    py_import_path: str,
+    python_moduledir: str,
+    fs_snapshot: Optional[FileSystemSnapshot] = None,
+) -> enriched_import.Type:
     """
     Given a Python import path (such as `x.y.z`), determine whether the import path
     leads to a module, or package, or a third party module, or if it is unknown (cannot be determined by
@@ -18,40 +24,51 @@ def resolve_import_type(py_import_path: str, python_moduledir: str) -> enriched_
     * Erroneous; or
     * Is a 3rd-party module import; or
     * Is a builtin module import.
+
+    If a snapshot of the filesystem (taken from the reporoot) is given, it is checked instead of the filesystem.
     """
 
     # Check if import path leads to Python moduledir as defined in Please config.
     if py_import_path.removeprefix(python_moduledir) != py_import_path:
         return enriched_import.Type.THIRD_PARTY_MODULE
 
-    abs_filepath_without_ext_or_dirpath = os.path.abspath(py_import_path.replace(".", os.path.sep))
+    if fs_snapshot is None:
+        isdir, isfile = os.path.isdir, os.path.isfile
+        filepath_without_ext_or_dirpath = os.path.abspath(py_import_path.replace(".", os.path.sep))
+    else:
+        isdir, isfile = fs_snapshot.isdir, fs_snapshot.isfile
+        filepath_without_ext_or_dirpath = py_import_path.replace(".", os.path.sep)
 
-    if os.path.isdir(abs_filepath_without_ext_or_dirpath):
+    if isdir(filepath_without_ext_or_dirpath):
         return enriched_import.Type.PACKAGE
 
     # If path is a file, then the import path leads to a module,
     # which should be a Python file, and has a .py (or .pyi) extension.
-    abs_filepath_without_ext = abs_filepath_without_ext_or_dirpath
-    if os.path.isfile(f"{abs_filepath_without_ext}.py"):
+    filepath_without_ext = filepath_without_ext_or_dirpath
+    if isfile(f"{filepath_without_ext}.py"):
         return enriched_import.Type.MODULE
-    if os.path.isfile(f"{abs_filepath_without_ext}.pyi"):
+    if isfile(f"{filepath_without_ext}.pyi"):
         return enriched_import.Type.STUB
 
     # Finally, check if the import can be of a protobuf-generated file.
     # In Python, all protobuf generated files must be of the form *_pb2.py or *_pb2_grpc.py
-    if abs_filepath_without_ext.endswith("_pb2") or abs_filepath_without_ext.endswith("_pb2_grpc"):
-        candidate_abs_proto_filepath = (
-            f"{abs_filepath_without_ext.removesuffix('_pb2').removesuffix('_pb2_grpc')}.proto"
-        )
-        if os.path.isfile(candidate_abs_proto_filepath):
+    if filepath_without_ext.endswith("_pb2") or filepath_without_ext.endswith("_pb2_grpc"):
+        candidate_proto_filepath = f"{filepath_without_ext.removesuffix('_pb2').removesuffix('_pb2_grpc')}.proto"
+        if isfile(candidate_proto_filepath):
             return enriched_import.Type.PROTOBUF_GEN
 
     return enriched_import.Type.UNKNOWN
 
 
-def to_whatinputs_input(import_: enriched_import.Import) -> Optional[list[str]]:
+def to_whatinputs_input(
+    import_: enriched_import.Import,
+    package_files_index: Optional[PackageFilesIndex] = None,
+) -> Optional[list[str]]:
     """
     Output depends on the Import's Type.
+
+    For packages, all importable files within the package are looked up in the given index if set, and otherwise
+    found by globbing the package directory.
     """
 
     os_path_from_reporoot = import_.import_.replace(".", os.path.sep)
@@ -63,11 +80,15 @@ def to_whatinputs_input(import_: enriched_import.Import) -> Optional[list[str]]:
         return [os_path_from_reporoot.removesuffix("_pb2").removesuffix("_pb2_grpc") + ".proto"]
 
     if import_.type_ == enriched_import.Type.PACKAGE:
-        all_paths: list[str] = [
-            *glob(os.path.join(os_path_from_reporoot, "**", "*.py"), recursive=True),
-            *glob(os.path.join(os_path_from_reporoot, "**", "*.pyi"), recursive=True),
-            *glob(os.path.join(os_path_from_reporoot, "**", "*.proto"), recursive=True),
-        ]
+        all_paths: list[str]
+        if package_files_index is not None:
+            all_paths = package_files_index.get(os_path_from_reporoot)
+        else:
+            all_paths = [
+                *glob(os.path.join(os_path_from_reporoot, "**", "*.py"), recursive=True),
+                *glob(os.path.join(os_path_from_reporoot, "**", "*.pyi"), recursive=True),
+                *glob(os.path.join(os_path_from_reporoot, "**", "*.proto"), recursive=True),
+            ]
 
         if not all_paths:
             LOGGER.warning(f"Could not find any importable modules in package '{import_.import_}'.")
@@ -1,5 +1,8 @@
 import os
+from unittest import mock
 
+from adapters.os.fs_snapshot import FileSystemSnapshot
+from adapters.os.package_files_index import PackageFilesIndex
 from domain.python_import import enriched as enriched_import
 from service.python_import.enriched import resolve_import_type, to_whatinputs_input
 from utils.mock_python_library_test_case import MockPythonLibraryTestCase
@@ -38,6 +41,47 @@ class TestResolveType(MockPythonLibraryTestCase):
         return
 
 
+class TestResolveTypeWithFileSystemSnapshot(MockPythonLibraryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        with open(stub := os.path.join(self.subpackage_dir, "test_stub.pyi"), "w") as f:
+            f.write("y: int")
+        with open(proto := os.path.join(self.subpackage_dir, "test.proto"), "w") as f:
+            f.write('syntax = "proto3";')
+        self.files_to_delete.extend([stub, proto])
+        self.fs_snapshot = FileSystemSnapshot.build()
+        return
+
+    def test_matches_filesystem(self):
+        for py_import in [
+            f"{self.test_dir}.test_module_0",
+            f"{self.test_dir}.test_subpackage",
+            f"{self.test_dir}.test_subpackage.test_stub",
+            f"{self.test_dir}.test_subpackage.test_pb2",
+            f"{self.test_dir}.test_subpackage.test_pb2_grpc",
+            f"{self.test_dir}.does_not_exist",
+            "third_party.python3.google.protobuf",
+            "os.path",
+        ]:
+            with self.subTest(py_import):
+                self.assertEqual(
+                    resolve_import_type(py_import, "third_party.python3"),
+                    resolve_import_type(py_import, "third_party.python3", self.fs_snapshot),
+                )
+        return
+
+    @mock.patch("service.python_import.enriched.os.path.isfile")
+    @mock.patch("service.python_import.enriched.os.path.isdir")
+    def test_does_not_stat(self, mock_isdir: mock.MagicMock, mock_isfile: mock.MagicMock):
+        self.assertEqual(
+            enriched_import.Type.MODULE,
+            resolve_import_type(f"{self.test_dir}.test_module_0", "third_party.python3", self.fs_snapshot),
+        )
+        mock_isdir.assert_not_called()
+        mock_isfile.assert_not_called()
+        return
+
+
 class TestToWhatInputsInput(MockPythonLibraryTestCase):
     def test_module(self):
         import_ = enriched_import.Import("test.module", enriched_import.Type.MODULE)
@@ -55,6 +99,14 @@ class TestToWhatInputsInput(MockPythonLibraryTestCase):
         )
         return
 
+    def test_package_with_package_files_index(self):
+        import_ = enriched_import.Import(self.subpackage_dir, enriched_import.Type.PACKAGE)
+        self.assertEqual(
+            [self.subpackage_module],
+            to_whatinputs_input(import_, PackageFilesIndex()),
+        )
+        return
+
     def test_unknown_import_type(self):
         import_ = enriched_import.Import("test", enriched_import.Type.UNKNOWN)
         self.assertIsNone(to_whatinputs_input(import_))
@@ -0,0 +1,90 @@
+import ast
+import re
+
+from domain.python_import.common import AST_IMPORT_NODE_TYPE
+
+# Everything which may contain the text of an import statement without being one (comments and strings), statements
+# beginning with `import` or `from`, and any other `import` keyword.
+_SCAN_PATTERN = re.compile(
+    r"""
+    (?P<comment>\#[^\r\n]*)
+    | (?P<string>
+        '''(?:[^'\\]|\\.|'(?!''))*'''
+        | \"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+        | '(?:[^'\\\r\n]|\\.)*'
+        | "(?:[^"\\\r\n]|\\.)*"
+    )
+    | (?P<unterminated_string>['"])
+    | (?P<statement>^[ \t]*(?:import|from)\b)
+    | (?P<keyword>\bimport\b)
+    """,
+    re.VERBOSE | re.MULTILINE | re.DOTALL,
+)
+
+# Tokens which determine where a logical line ends.
+_LOGICAL_LINE_TOKEN_PATTERN = re.compile(
+    r"""
+    \#[^\r\n]*
+    | '''(?:[^'\\]|\\.|'(?!''))*'''
+    | \"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+    | '(?:[^'\\\r\n]|\\.)*'
+    | "(?:[^"\\\r\n]|\\.)*"
+    | \\\r?\n
+    | (?P<open_bracket>[(\[{])
+    | (?P<close_bracket>[)\]}])
+    | (?P<newline>\r?\n)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class AmbiguousImportsError(ValueError):
+    pass
+
+
+def scan_import_nodes(code: str) -> list[AST_IMPORT_NODE_TYPE]:
+    """
+    Finds import statements without parsing the whole of the code. Only the logical lines beginning with `import` or
+    `from` are parsed; comments and strings are skipped over with a regex rather than tokenized.
+
+    Unlike `ast.parse`, syntax errors outside of import statements are not detected, and the nodes are in the order
+    they appear in the code, with no line numbers.
+
+    :raises AmbiguousImportsError: if the imports cannot be found without parsing the whole of the code, e.g. an
+        import statement on the same line as the start of a compound statement (`if x: import y`).
+    """
+
+    if "import" not in code:
+        return []
+
+    import_statements: list[str] = []
+    pos = 0
+    while (match := _SCAN_PATTERN.search(code, pos)) is not None:
+        if match.lastgroup == "statement":
+            start = match.start() + len(match.group()) - len(match.group().lstrip(" \t"))
+            pos = _find_end_of_logical_line(code, start)
+            import_statements.append(code[start:pos])
+            continue
+        if match.lastgroup in ("unterminated_string", "keyword"):
+            raise AmbiguousImportsError(f"found {match.group()!r} at {match.start()} outside of an import statement")
+        pos = match.end()
+
+    try:
+        root = ast.parse("\n".join(import_statements))
+    except SyntaxError as e:
+        raise AmbiguousImportsError("could not parse the import statements") from e
+
+    # Any other statements were on the same logical lines as imports, separated by semicolons.
+    return [node for node in root.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def _find_end_of_logical_line(code: str, start: int) -> int:
+    depth = 0
+    for match in _LOGICAL_LINE_TOKEN_PATTERN.finditer(code, start):
+        if match.lastgroup == "open_bracket":
+            depth += 1
+        elif match.lastgroup == "close_bracket":
+            depth -= 1
+        elif match.lastgroup == "newline" and depth <= 0:
+            return match.start()
+    return len(code)
@@ -0,0 +1,69 @@
+import ast
+from unittest import TestCase
+
+from service.python_import.import_scanner import AmbiguousImportsError, scan_import_nodes
+
+
+class TestScanImportNodes(TestCase):
+    def assertScansLikeParsing(self, code: str):
+        parsed_import_nodes = [
+            node for node in ast.walk(ast.parse(code)) if isinstance(node, (ast.Import, ast.ImportFrom))
+        ]
+        self.assertEqual(
+            sorted(map(ast.dump, parsed_import_nodes)),
+            sorted(map(ast.dump, scan_import_nodes(code))),
+        )
+        return
+
+    def test_finds_imports(self):
+        self.assertScansLikeParsing(
+            """
+import numpy as np, os.path
+from .. import module1, module2
+from ...pkg import module3 as m3
+
+def f():
+    from typing import (
+        Any,  # comment with ) in it
+        Optional,
+    )
+    import json; x = 1
+
+class C:
+    from \\
+        collections import namedtuple
+"""
+        )
+        return
+
+    def test_skips_strings_and_comments(self):
+        self.assertScansLikeParsing(
+            '''
+"""
+import not_imported
+from not_imported import x
+"""
+# import not_imported
+x = "import not_imported"
+y = \'\'\'
+from not_imported import y\'\'\'
+import imported
+'''
+        )
+        return
+
+    def test_returns_empty_without_imports(self):
+        self.assertEqual([], scan_import_nodes("x = 1\n"))
+        return
+
+    def test_raises_when_ambiguous(self):
+        for code in [
+            "if TYPE_CHECKING: import typing",
+            "try: import json\nexcept ImportError: pass",
+            "import os\nraise ValueError() \\\n    from e",
+            "from .. import invalid.relative.import",
+            "import os\nx = 'unterminated",
+        ]:
+            with self.subTest(code):
+                self.assertRaises(AmbiguousImportsError, scan_import_nodes, code)
+        return
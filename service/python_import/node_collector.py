@@ -1,8 +1,13 @@
 import ast
 from typing import Iterator, List
 
+from adapters.os.import_nodes_cache import ImportNodesCache
 from common.logger.logger import setup_logger
 from domain.python_import.common import AST_IMPORT_NODE_TYPE
+from service.python_import.import_scanner import AmbiguousImportsError, scan_import_nodes
+
+# Fields of statements (and of except handlers and match cases) which hold statements, in the order they appear in code.
+_STATEMENT_LIST_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
 
 
 class NodeCollector:
@@ -10,11 +15,27 @@ class NodeCollector:
     Collects AST nodes responsible for imports from the given path.
     """
 
-    def __init__(self):
+    def __init__(self, *, scan_imports: bool = False, statements_only: bool = False):
+        """
+        :param scan_imports: find import statements with a scan of the code (see `scan_import_nodes`) rather than
+            parsing all of it, falling back to parsing if the scan is ambiguous.
+        :param statements_only: only visit the statements of the parsed code, rather than every node. Imports are
+            statements, so the same imports are found, but far fewer nodes are visited.
+        """
+
         self._logger = setup_logger(name=__name__)
+        self._scan_imports = scan_imports
+        self._statements_only = statements_only
         return
 
     def collate(self, *, code: str, path: str = "") -> Iterator[AST_IMPORT_NODE_TYPE]:
+        if self._scan_imports:
+            try:
+                yield from scan_import_nodes(code)
+                return
+            except AmbiguousImportsError as e:
+                self._logger.debug(f"Parsing {path or 'code'} in full: {e}")
+
         try:
             root = ast.parse(code, path)
         except SyntaxError as e:
@@ -31,7 +52,7 @@ class NodeCollector:
             self._logger.fatal(f"Could not read src at {path}", exc_info=e)
             raise e
 
-        for node in ast.walk(root):
+        for node in walk_statements(root) if self._statements_only else ast.walk(root):
             if isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
                 yield node
             # TODO: parse __import__(...) function calls.
@@ -42,3 +63,39 @@ class NodeCollector:
             import_nodes.append(node)
 
         return import_nodes
+
+
+class CachingNodeCollector(NodeCollector):
+    """
+    Collects AST nodes responsible for imports, skipping parsing for any code whose imports are already cached.
+    """
+
+    def __init__(self, cache: ImportNodesCache, *, scan_imports: bool = False, statements_only: bool = False):
+        super().__init__(scan_imports=scan_imports, statements_only=statements_only)
+        self._cache = cache
+        return
+
+    def collate(self, *, code: str, path: str = "") -> Iterator[AST_IMPORT_NODE_TYPE]:
+        key = self._cache.key(code, scan_imports=self._scan_imports)
+        if (cached_import_nodes := self._cache.get(key)) is not None:
+            yield from cached_import_nodes
+            return
+
+        import_nodes = list(super().collate(code=code, path=path))
+        self._cache.put(key, import_nodes)
+        yield from import_nodes
+
+
+def walk_statements(root: ast.Module) -> Iterator[ast.AST]:
+    """
+    Yields every statement in the module in the order they appear in code, along with the except handlers and match
+    cases which hold statements, without visiting any expressions.
+    """
+
+    nodes: list[ast.AST] = list(reversed(root.body))
+    while nodes:
+        node = nodes.pop()
+        yield node
+        for field in reversed(_STATEMENT_LIST_FIELDS):
+            nodes.extend(reversed(getattr(node, field, ())))
+    return
@@ -0,0 +1,59 @@
+"""
+Benchmark of the ways `NodeCollector` can find import nodes, over the Python modules of the standard library (or the
+given directory).
+
+Usage::
+
+    python -m service.python_import.node_collector_benchmark [DIR]
+
+"""
+
+import ast
+import glob
+import os
+import sys
+import sysconfig
+import timeit
+
+from service.python_import.import_scanner import AmbiguousImportsError, scan_import_nodes
+from service.python_import.node_collector import NodeCollector
+
+
+def main(dir_path: str) -> None:
+    codes: list[str] = []
+    for path in glob.glob(os.path.join(dir_path, "**", "*.py"), recursive=True):
+        try:
+            with open(path, "r") as pyfile:
+                code = pyfile.read()
+            # Only benchmark code which can be parsed, as scanning does not detect all syntax errors.
+            ast.parse(code, path)
+        except (OSError, UnicodeDecodeError, SyntaxError, ValueError):
+            continue
+        codes.append(code)
+
+    num_ambiguous = 0
+    for code in codes:
+        try:
+            scan_import_nodes(code)
+        except AmbiguousImportsError:
+            num_ambiguous += 1
+
+    nodes_collators = {
+        "parse, all nodes": NodeCollector(),
+        "parse, statements": NodeCollector(statements_only=True),
+        "scan": NodeCollector(scan_imports=True),
+    }
+    timings = {
+        name: min(timeit.repeat(lambda: [nodes_collator.collate_all(code=code) for code in codes], number=1, repeat=3))
+        for name, nodes_collator in nodes_collators.items()
+    }
+
+    num_bytes = sum(map(len, codes))
+    print(f"{len(codes)} modules, {num_bytes / 1e6:.1f} MB, {num_ambiguous} ambiguous to scan")
+    for name, seconds in timings.items():
+        print(f"{name:<20}{seconds:>8.2f} s{num_bytes / 1e6 / seconds:>8.1f} MB/s")
+    return
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else sysconfig.get_paths()["stdlib"])
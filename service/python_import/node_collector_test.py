@@ -1,6 +1,6 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 
-from service.python_import.node_collector import NodeCollector
+from service.python_import.node_collector import CachingNodeCollector, NodeCollector
 
 
 class TestNodesCollator(TestCase):
@@ -65,3 +65,100 @@ from ...pkg import module3, module4
             self.collator.collate_all(code=code)
 
         return
+
+
+class TestStatementsOnlyNodesCollator(TestCase):
+    def test_finds_same_imports_as_visiting_all_nodes(self):
+        code = """
+import a
+if x:
+    import b
+elif y:
+    import c
+else:
+    import d
+try:
+    import e
+except ImportError:
+    import f
+else:
+    import g
+finally:
+    import h
+for _ in range(1):
+    import i
+while False:
+    import j
+with open("x") as f:
+    import k
+class C:
+    import l
+    def m(self):
+        import m
+        async def n():
+            import n
+match x:
+    case 1:
+        import o
+x = lambda: __import__("p")
+"""
+
+        import_nodes = NodeCollector(statements_only=True).collate_all(code=code)
+
+        self.assertEqual(
+            sorted(node.names[0].name for node in NodeCollector().collate_all(code=code)),
+            sorted(node.names[0].name for node in import_nodes),
+        )
+        self.assertEqual([chr(i) for i in range(ord("a"), ord("o") + 1)], [node.names[0].name for node in import_nodes])
+        return
+
+
+class TestScanningNodesCollator(TestCase):
+    def test_import_nodes(self):
+        import_nodes = NodeCollector(scan_imports=True).collate_all(code="import numpy as np\nfrom os import path\n")
+
+        self.assertEqual(["numpy"], [alias.name for alias in import_nodes[0].names])
+        self.assertEqual("os", import_nodes[1].module)
+        return
+
+    def test_parses_when_scan_is_ambiguous(self):
+        import_nodes = NodeCollector(scan_imports=True).collate_all(code="if True: import numpy\n")
+
+        self.assertEqual(1, len(import_nodes))
+        self.assertEqual("numpy", import_nodes[0].names[0].name)
+
+        with self.assertRaises(SyntaxError):
+            NodeCollector(scan_imports=True).collate_all(code="""from .. import invalid.relative.import""")
+        return
+
+
+class TestCachingNodesCollator(TestCase):
+    def test_parses_and_caches_on_miss(self):
+        mock_cache = mock.MagicMock()
+        mock_cache.key.return_value = "key"
+        mock_cache.get.return_value = None
+
+        import_nodes = CachingNodeCollector(mock_cache).collate_all(code="import numpy\nx = 1\nfrom os import path")
+
+        self.assertEqual(2, len(import_nodes))
+        mock_cache.key.assert_called_once_with("import numpy\nx = 1\nfrom os import path", scan_imports=False)
+        mock_cache.put.assert_called_once_with("key", import_nodes)
+        return
+
+    def test_keys_scanned_imports_separately(self):
+        mock_cache = mock.MagicMock()
+        mock_cache.get.return_value = None
+
+        CachingNodeCollector(mock_cache, scan_imports=True).collate_all(code="import numpy")
+        mock_cache.key.assert_called_once_with("import numpy", scan_imports=True)
+        return
+
+    @mock.patch("service.python_import.node_collector.ast.parse")
+    def test_does_not_parse_on_hit(self, mock_ast_parse: mock.MagicMock):
+        mock_cache = mock.MagicMock()
+        mock_cache.get.return_value = [cached_node := mock.MagicMock()]
+
+        self.assertEqual([cached_node], CachingNodeCollector(mock_cache).collate_all(code="import numpy"))
+        mock_ast_parse.assert_not_called()
+        mock_cache.put.assert_not_called()
+        return